@@ -25,26 +25,50 @@ except importlib.metadata.PackageNotFoundError:
 # -----------------------------------------------------------------------------
 # Top-Level API Facade
 # -----------------------------------------------------------------------------
+from .core.calc_cyc_vec import calc_cyc_vec
+from .core.calc_Q00_vec import calc_Q00_vec
+from .core.calc_Qme_mat import calc_Qme_mat
 from .core.calc_scl_vec import calc_scl_vec
 from .core.chck_bas import chck_bas
 from .core.chck_cpl import chck_cpl
 from .core.make_0bi_tbl import make_0bi_tbl
 from .core.make_CCC_mat import make_CCC_mat
+from .core.make_dwn_vec import make_dwn_vec
+from .core.make_hok_tbl import make_hok_tbl
+from .core.make_Krn_mat import make_Krn_mat
 from .core.make_Mus_mat import make_Mus_mat
 from .core.make_Net_mat import make_Net_mat
 from .core.make_Sel_mat import make_Sel_mat
+from .core.make_slb_tbl import make_slb_tbl
+from .core.make_stg_tbl import make_stg_tbl
+from .core.make_Ups_mat import make_Ups_mat
 from .core.make_Wdw_mat import make_Wdw_mat
 from .core.make_Wdx_mat import make_Wdx_mat
+from .core.prep_bdl_arw import prep_bdl_arw
+from .core.prep_grp_pqt import prep_grp_pqt
+from .core.prep_Qat_ncf import prep_Qat_ncf
 from .core.prep_Qex_ncf import prep_Qex_ncf
 from .core.prep_Qfi_ncf import prep_Qfi_ncf
 from .core.prep_Qou_ncf import prep_Qou_ncf
+from .core.prep_shd_jsn import prep_shd_jsn
 from .core.prep_skl_ncf import prep_skl_ncf
+from .core.prep_std_mmp import prep_std_mmp
+from .core.prep_std_zar import prep_std_zar
+from .core.read_bdl_vec import read_bdl_vec
 from .core.read_con_vec import read_con_vec
 from .core.read_cpl_vec import read_cpl_vec
 from .core.read_crd_vec import read_crd_vec
+from .core.read_fil_vec import read_fil_vec
+from .core.read_grp_vec import read_grp_vec
 from .core.read_kpr_vec import read_kpr_vec
+from .core.read_Mus_mat import read_Mus_mat
+from .core.read_Net_mat import read_Net_mat
 from .core.read_nml_tbl import read_nml_tbl
+from .core.read_reg_vec import read_reg_vec
 from .core.read_riv_vec import read_riv_vec
+from .core.read_shd_ncf import read_shd_ncf
+from .core.read_slb_mat import read_slb_mat
+from .core.read_std_mmp import read_std_mmp
 from .core.read_std_vec import read_std_vec
 from .core.read_xpr_vec import read_xpr_vec
 from .core.updt_Mus_Qou import updt_Mus_Qou
@@ -54,26 +78,50 @@ from .core.updt_Mus_Qou import updt_Mus_Qou
 # -----------------------------------------------------------------------------
 __all__ = [
     "__version__",
+    "calc_cyc_vec",
+    "calc_Q00_vec",
+    "calc_Qme_mat",
     "calc_scl_vec",
     "chck_bas",
     "chck_cpl",
     "make_0bi_tbl",
     "make_CCC_mat",
+    "make_dwn_vec",
+    "make_hok_tbl",
+    "make_Krn_mat",
     "make_Mus_mat",
     "make_Net_mat",
     "make_Sel_mat",
+    "make_slb_tbl",
+    "make_stg_tbl",
+    "make_Ups_mat",
     "make_Wdw_mat",
     "make_Wdx_mat",
+    "prep_bdl_arw",
+    "prep_grp_pqt",
+    "prep_Qat_ncf",
     "prep_Qex_ncf",
     "prep_Qfi_ncf",
     "prep_Qou_ncf",
+    "prep_shd_jsn",
     "prep_skl_ncf",
+    "prep_std_mmp",
+    "prep_std_zar",
+    "read_bdl_vec",
     "read_con_vec",
     "read_cpl_vec",
     "read_crd_vec",
+    "read_fil_vec",
+    "read_grp_vec",
     "read_kpr_vec",
+    "read_Mus_mat",
+    "read_Net_mat",
     "read_nml_tbl",
+    "read_reg_vec",
     "read_riv_vec",
+    "read_shd_ncf",
+    "read_slb_mat",
+    "read_std_mmp",
     "read_std_vec",
     "read_xpr_vec",
     "updt_Mus_Qou",
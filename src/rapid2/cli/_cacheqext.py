@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# *****************************************************************************
+# _cacheqext.py
+# *****************************************************************************
+
+# Author:
+# Cedric H. David, 2026-2026
+
+
+# *****************************************************************************
+# Import Python modules
+# *****************************************************************************
+import argparse
+import os
+import sys
+
+import netCDF4
+import numpy as np
+from tqdm import tqdm
+
+from rapid2 import (
+    __version__,
+    make_0bi_tbl,
+    make_slb_tbl,
+    prep_std_mmp,
+    read_riv_vec,
+    read_slb_mat,
+    read_std_mmp,
+    read_std_vec,
+)
+
+
+# *****************************************************************************
+# Main
+# *****************************************************************************
+def main() -> None:
+
+    # -------------------------------------------------------------------------
+    # Initialize the argument parser and add valid arguments
+    # -------------------------------------------------------------------------
+    parser = argparse.ArgumentParser(
+        description=(
+            "Create a memory-mapped cache of the external inflow of a basin, "
+            "read by rapid2 --qext_cache without decoding netCDF."
+        ),
+        epilog=(
+            "examples:\n"
+            "  cacheqext "
+            "--basin input/Sandbox/bas_Sandbox_ascend.parquet "
+            "--external_inflow "
+            "input/Sandbox/Qex_Sandbox_19700101_19700110_TR.nc4 "
+            "--cache "
+            "input/Sandbox/Qex_Sandbox_19700101_19700110_TR.mmp\n"
+            "\n"
+            "The cache holds the reaches of the basin in its order, as "
+            "float32 in one\ncontiguous file. When rapid2 chains basins with "
+            "Qup_ncf, give the same file\nwith --upstream_outflow."
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+
+    parser.add_argument(
+        "--version", action="version", version=f"rapid2 {__version__}"
+    )
+
+    parser.add_argument(
+        "-bas",
+        "--basin",
+        dest="bas",
+        metavar="BASIN",
+        type=str,
+        required=True,
+        help="specify the input bas_pqt file",
+    )
+
+    parser.add_argument(
+        "-Qex",
+        "--external_inflow",
+        dest="Qex",
+        metavar="EXTERNAL_INFLOW",
+        type=str,
+        required=True,
+        help="specify the input Qext file",
+    )
+
+    parser.add_argument(
+        "-Qup",
+        "--upstream_outflow",
+        dest="Qup",
+        metavar="UPSTREAM_OUTFLOW",
+        type=str,
+        default=None,
+        help="specify the Qou file of an upstream basin excluded from basin",
+    )
+
+    parser.add_argument(
+        "-mmp",
+        "--cache",
+        dest="mmp",
+        metavar="CACHE",
+        type=str,
+        required=True,
+        help="specify the output cache directory",
+    )
+
+    parser.add_argument(
+        "-blk",
+        "--block",
+        dest="blk",
+        metavar="BLOCK",
+        type=int,
+        default=100,
+        help="specify the number of time steps read at once (default: 100)",
+    )
+
+    # -------------------------------------------------------------------------
+    # Parse arguments and assign to variables
+    # -------------------------------------------------------------------------
+    args = parser.parse_args()
+
+    bas_pqt = args.bas
+    Qex_ncf = args.Qex
+    Qup_ncf = args.Qup
+    Qex_mmp = args.mmp
+    IS_blk = args.blk
+
+    print("Creating (from/to):")
+    print(f" - {bas_pqt}")
+    print(f" - {Qex_ncf}")
+    print(f" - {Qex_mmp}")
+
+    # -------------------------------------------------------------------------
+    # Skip if file already exists
+    # -------------------------------------------------------------------------
+    if os.path.exists(Qex_mmp):
+        print(f"WARNING - File already exists {Qex_mmp}. Skipping.")
+        sys.exit(0)
+
+    # -------------------------------------------------------------------------
+    # Execute main logic
+    # -------------------------------------------------------------------------
+    try:
+        if IS_blk < 1:
+            raise ValueError("The block size must be at least 1")
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Reaches of the basin, as routed by rapid2
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        (
+            IV_riv_tot,
+            ZV_lon_tot,
+            ZV_lat_tot,
+            IV_tim_all,
+            IM_tim_all,
+        ) = read_std_vec(Qex_ncf)
+
+        if IM_tim_all is None:
+            raise ValueError(f"time_bnds is missing in {Qex_ncf}")
+
+        IV_riv_bas = read_riv_vec(bas_pqt)
+        if Qup_ncf is not None:
+            IV_riv_ups, _, _, _, _ = read_std_vec(Qup_ncf)
+            IV_riv_bas = IV_riv_bas[~np.isin(IV_riv_bas, IV_riv_ups)]
+
+        if not np.isin(IV_riv_bas, IV_riv_tot).all():
+            raise ValueError(f"River IDs in {bas_pqt} missing in {Qex_ncf}")
+
+        _, _, IV_0bi_bas = make_0bi_tbl(IV_riv_tot, IV_riv_bas)
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Create cache, recording the file it comes from
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        f = netCDF4.Dataset(Qex_ncf, "r")
+        AT_sta = os.stat(Qex_ncf)
+
+        prep_std_mmp(
+            IV_riv_bas,
+            ZV_lon_tot[IV_0bi_bas],
+            ZV_lat_tot[IV_0bi_bas],
+            len(IV_tim_all),
+            Qex_mmp,
+            "float32",
+            "Qext",
+            {
+                "title": f.getncattr("title"),
+                "institution": f.getncattr("institution"),
+                "source_file": os.path.abspath(Qex_ncf),
+                "source_size": AT_sta.st_size,
+                "source_mtime_ns": AT_sta.st_mtime_ns,
+            },
+        )
+
+        AT_var, _ = read_std_mmp(Qex_mmp, "r+")
+
+        # Filtered chunks are decompressed whole, others are read in part
+        IS_cnk_Qex = 1
+        if f.variables["Qext"].chunking() != "contiguous" and any(
+            f.variables["Qext"].filters().values()
+        ):
+            IS_cnk_Qex = int(f.variables["Qext"].chunking()[1])
+
+        IM_slb_Qex, IV_0bi_slb = make_slb_tbl(
+            IV_0bi_bas, len(IV_riv_tot), IS_cnk_Qex, IS_blk
+        )
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Copy external inflows of the basin, in blocks of time steps
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        for JS_tim_blk in tqdm(
+            range(0, len(IV_tim_all), IS_blk), desc="Caching external inflow"
+        ):
+            JS_tim_tmp = min(JS_tim_blk + IS_blk, len(IV_tim_all))
+            AT_var["Qext"][JS_tim_blk:JS_tim_tmp, :] = read_slb_mat(
+                f.variables["Qext"],
+                JS_tim_blk,
+                JS_tim_tmp,
+                IM_slb_Qex,
+                IV_0bi_slb,
+            )
+
+        # time_bnds is written last, as it marks complete time steps
+        AT_var["Qext"].flush()
+        AT_var["time"][:] = IV_tim_all
+        AT_var["time_bnds"][:] = IM_tim_all
+        for ZV_var in AT_var.values():
+            ZV_var.flush()
+
+        f.close()
+
+    except (IOError, ValueError, KeyError) as e:
+        print(f"ERROR - {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+# *****************************************************************************
+# If executed as a script
+# *****************************************************************************
+if __name__ == "__main__":
+    main()
+
+
+# *****************************************************************************
+# End
+# *****************************************************************************
@@ -13,13 +13,13 @@
 import argparse
 import sys
 
-import netCDF4
 import numpy as np
 from numpy.ma import MaskedArray
 
 from rapid2 import (
     __version__,
     make_0bi_tbl,
+    read_shd_ncf,
     read_std_vec,
 )
 
@@ -68,7 +68,7 @@ def main() -> None:
         metavar="PREVIOUS",
         type=str,
         required=True,
-        help="specify the old netCDF file",
+        help="specify the old netCDF file or manifest of shards",
     )
 
     parser.add_argument(
@@ -78,7 +78,7 @@ def main() -> None:
         metavar="NOW",
         type=str,
         required=True,
-        help="specify the new netCDF file",
+        help="specify the new netCDF file or manifest of shards",
     )
 
     parser.add_argument(
@@ -213,8 +213,8 @@ def main() -> None:
         # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
         # Get main variable in netCDF files
         # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-        p = netCDF4.Dataset(prv_ncf, "r")
-        n = netCDF4.Dataset(now_ncf, "r")
+        p = read_shd_ncf(prv_ncf)
+        n = read_shd_ncf(now_ncf)
 
         if "Qext" in p.variables and "Qext" in n.variables:
             YS_val_tmp = "Qext"
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# *****************************************************************************
+# _cycleqinit.py
+# *****************************************************************************
+
+# Author:
+# Cedric H. David, 2026-2026
+
+
+# *****************************************************************************
+# Import Python modules
+# *****************************************************************************
+import argparse
+import glob
+import os
+import sys
+
+import netCDF4
+import numpy as np
+from tqdm import tqdm
+
+from rapid2 import (
+    __version__,
+    calc_cyc_vec,
+    prep_Qfi_ncf,
+    read_Mus_mat,
+    read_Net_mat,
+    read_nml_tbl,
+    read_std_vec,
+    updt_Mus_Qou,
+)
+
+
+# *****************************************************************************
+# Main
+# *****************************************************************************
+def main() -> None:
+
+    # -------------------------------------------------------------------------
+    # Initialize the argument parser and add valid arguments
+    # -------------------------------------------------------------------------
+    parser = argparse.ArgumentParser(
+        description=(
+            "Create an initial discharge file with the periodic state reached "
+            "when the external inflow of a namelist is repeated indefinitely."
+        ),
+        epilog=(
+            "examples:\n"
+            "  cycleqinit "
+            "--namelist input/Sandbox/nml_Sandbox_TR.yml "
+            "--initial_outflow "
+            "input/Sandbox/Q00_Sandbox_19700101_19700110_CY.nc4\n"
+            "\n"
+            "The Qex_ncf file of the namelist is one cycle of forcing, and "
+            "the Q00_ncf file\nof the namelist is not used."
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+
+    parser.add_argument(
+        "--version", action="version", version=f"rapid2 {__version__}"
+    )
+
+    parser.add_argument(
+        "-nml",
+        "--namelist",
+        dest="nml",
+        metavar="NAMELIST",
+        type=str,
+        required=True,
+        help="specify the namelist file",
+    )
+
+    parser.add_argument(
+        "-Q00",
+        "--initial_outflow",
+        dest="Q00",
+        metavar="INITIAL_OUTFLOW",
+        type=str,
+        required=True,
+        help="specify the output Qinit file",
+    )
+
+    parser.add_argument(
+        "-rtl",
+        "--relative_tolerance",
+        dest="rtl",
+        metavar="RELATIVE_TOLERANCE",
+        type=float,
+        default=1e-10,
+        help="specify the relative tolerance of the solver (default: 1e-10)",
+    )
+
+    # -------------------------------------------------------------------------
+    # Parse arguments and assign to variables
+    # -------------------------------------------------------------------------
+    args = parser.parse_args()
+
+    nml_yml = args.nml
+    Q00_ncf = args.Q00
+    ZS_rtl = args.rtl
+
+    print("Creating (from/to):")
+    print(f" - {nml_yml}")
+    print(f" - {Q00_ncf}")
+
+    # -------------------------------------------------------------------------
+    # Skip if file already exists
+    # -------------------------------------------------------------------------
+    if os.path.isfile(Q00_ncf):
+        print(f"WARNING - File already exists {Q00_ncf}. Skipping.")
+        sys.exit(0)
+
+    # -------------------------------------------------------------------------
+    # Execute main logic
+    # -------------------------------------------------------------------------
+    try:
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Read namelist into a dictionary and assign to local variables
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        AT_nml = read_nml_tbl(nml_yml)
+
+        Qex_ncf = AT_nml["Qex_ncf"]
+        # Consecutive files or patterns accepted by rapid2 are not supported
+        if not isinstance(Qex_ncf, str) or glob.has_magic(Qex_ncf):
+            raise ValueError("cycleqinit requires a single file in Qex_ncf")
+
+        con_pqt = AT_nml["con_pqt"]
+        kpr_pqt = AT_nml["kpr_pqt"]
+        xpr_pqt = AT_nml["xpr_pqt"]
+
+        bas_pqt = AT_nml["bas_pqt"]
+
+        IS_dtR = AT_nml["IS_dtR"]
+
+        if "Qup_ncf" in AT_nml:
+            raise ValueError("Qup_ncf is not supported by cycleqinit")
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # River network and model parameters
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        print("- Process river network and parameters")
+        IV_riv_tot, IV_riv_bas, IV_0bi_bas, ZM_Net = read_Net_mat(
+            con_pqt, bas_pqt
+        )
+        ZM_ICN, ZM_Qex, ZM_Qou = read_Mus_mat(
+            kpr_pqt, xpr_pqt, IV_riv_bas, IV_0bi_bas, ZM_Net, IS_dtR
+        )
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # External inflows
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        print("- Process external inflows")
+        (
+            IV_riv_tmp,
+            ZV_lon_tot,
+            ZV_lat_tot,
+            IV_tim_all,
+            IM_tim_all,
+        ) = read_std_vec(Qex_ncf)
+
+        if not np.array_equal(IV_riv_tot, IV_riv_tmp):
+            raise ValueError(f"River IDs in {Qex_ncf} must match {con_pqt}")
+
+        if IM_tim_all is None:
+            raise ValueError(f"time_bnds is missing in {Qex_ncf}")
+
+        IS_tim_all = len(IV_tim_all)
+        IS_dtE = IM_tim_all[0, 1] - IM_tim_all[0, 0]
+
+        if IS_dtE == 0:
+            raise ValueError("Values of time_bnds lead to IS_dtE = 0")
+
+        if IS_dtE % IS_dtR == 0:
+            IS_rat_Qex = IS_dtE // IS_dtR
+        else:
+            raise ValueError("IS_dtE is not a multiple of IS_dtR")
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Route one cycle from zero, streamed one time step at a time
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        f = netCDF4.Dataset(Qex_ncf, "r")
+
+        ZV_Qou_cyc = np.zeros(len(IV_riv_bas), dtype=np.float64)
+        for JS_tim_all in tqdm(range(IS_tim_all), desc="Routing one cycle"):
+            ZV_Qex_avg = f.variables["Qext"][JS_tim_all][IV_0bi_bas]
+            _, ZV_Qou_cyc = updt_Mus_Qou(
+                ZM_ICN, ZM_Qex, ZM_Qou, IS_rat_Qex, ZV_Qou_cyc, ZV_Qex_avg
+            )
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Compute periodic state
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        print("- Compute periodic state")
+        ZV_Q00_bas = calc_cyc_vec(
+            ZM_ICN,
+            ZM_Qex,
+            ZM_Qou,
+            IS_tim_all * IS_rat_Qex,
+            ZV_Qou_cyc,
+            ZS_rtl,
+        )
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Create Qinit file, valid at the start of the external inflow
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        prep_Qfi_ncf(IV_riv_tot, ZV_lon_tot, ZV_lat_tot, Q00_ncf)
+
+        e = netCDF4.Dataset(Q00_ncf, "a")
+
+        e.variables["time"][0] = IV_tim_all[0]
+        e.variables["Qout"][0, :] = 0
+        e.variables["Qout"][0, IV_0bi_bas] = ZV_Q00_bas[:]
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Copy some global attributes
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        e.setncattr("title", f.getncattr("title"))
+        e.setncattr("institution", f.getncattr("institution"))
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Close files
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        e.close()
+        f.close()
+
+        print("Done")
+
+    except (IOError, ValueError, KeyError) as e:
+        print(f"ERROR - {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+# *****************************************************************************
+# If executed as a script
+# *****************************************************************************
+if __name__ == "__main__":
+    main()
+
+
+# *****************************************************************************
+# End
+# *****************************************************************************
@@ -14,12 +14,11 @@ import argparse
 import os
 import sys
 
-import netCDF4
 import toyplot  # type: ignore[import-untyped]
 import toyplot.svg  # type: ignore[import-untyped]
 from tqdm import tqdm
 
-from rapid2 import __version__
+from rapid2 import __version__, read_shd_ncf
 
 
 # *****************************************************************************
@@ -58,7 +57,7 @@ def main() -> None:
         metavar="OBSERVATIONS",
         type=str,
         required=True,
-        help="specify the input Qob_ncf file",
+        help="specify the input Qob_ncf file or manifest of shards",
     )
 
     parser.add_argument(
@@ -68,7 +67,7 @@ def main() -> None:
         metavar="MODEL_EQUIVALENT",
         type=str,
         required=True,
-        help="specify the input Qme_ncf file",
+        help="specify the input Qme_ncf file or manifest of shards",
     )
 
     parser.add_argument(
@@ -118,8 +117,8 @@ def main() -> None:
         # Read netCDF files
         # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
         print("- Read netCDF files")
-        o = netCDF4.Dataset(Qob_ncf, "r")
-        m = netCDF4.Dataset(Qme_ncf, "r")
+        o = read_shd_ncf(Qob_ncf)
+        m = read_shd_ncf(Qme_ncf)
 
         # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
         # Extract metadata
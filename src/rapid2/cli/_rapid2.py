@@ -11,10 +11,22 @@
 # Import Python modules
 # *****************************************************************************
 import argparse
+import cProfile
+import json
+import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+from typing import Any, Callable, Iterable
 
 import netCDF4
 import numpy as np
+import numpy.typing as npt
+from scipy.sparse import (
+    csc_matrix,
+    issparse,
+)
 from tqdm import tqdm
 
 from rapid2 import (
@@ -22,19 +34,570 @@ from rapid2 import (
     chck_bas,
     make_0bi_tbl,
     make_CCC_mat,
+    make_hok_tbl,
     make_Mus_mat,
     make_Net_mat,
+    make_slb_tbl,
+    make_stg_tbl,
+    make_Ups_mat,
     prep_Qfi_ncf,
     prep_Qou_ncf,
+    prep_shd_jsn,
+    prep_std_mmp,
+    prep_std_zar,
     read_con_vec,
+    read_fil_vec,
     read_kpr_vec,
     read_nml_tbl,
     read_riv_vec,
+    read_slb_mat,
+    read_std_mmp,
     read_std_vec,
     read_xpr_vec,
     updt_Mus_Qou,
 )
 
+if sys.platform != "win32":
+    import resource
+
+
+# *****************************************************************************
+# Memory accounting
+# *****************************************************************************
+def _peak_rss() -> int:
+    """Return the peak resident set size of the process in bytes (0 if N/A)."""
+    if sys.platform == "win32":
+        return 0
+    # ru_maxrss keeps the peak of the parent process across fork and exec
+    if sys.platform.startswith("linux"):
+        with open("/proc/self/status") as status:
+            for YS_lin in status:
+                if YS_lin.startswith("VmHWM:"):
+                    return int(YS_lin.split()[1]) * 1024
+    IS_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kibibytes, macOS reports bytes
+    return int(IS_rss) if sys.platform == "darwin" else int(IS_rss) * 1024
+
+
+def _rset_rss() -> bool:
+    """Reset the peak resident set size of the process to the current one.
+
+    Return False where it cannot be reset, the peak then covers the whole run.
+    """
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+    except OSError:
+        return False
+    return True
+
+
+def _nbytes(obj: Any) -> int:
+    """Return the byte size of an array, a sparse matrix, or a dictionary."""
+    if issparse(obj):
+        return sum(
+            getattr(obj, att).nbytes
+            for att in ("data", "indices", "indptr", "row", "col")
+            if hasattr(obj, att)
+        )
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(
+            sys.getsizeof(key) + sys.getsizeof(val) for key, val in obj.items()
+        )
+    return int(getattr(obj, "nbytes", sys.getsizeof(obj)))
+
+
+def _curr_rss() -> int:
+    """Return the current resident set size of the process in bytes.
+
+    The peak resident set size is returned where the current one is unknown.
+    """
+    if sys.platform.startswith("linux"):
+        with open("/proc/self/statm") as statm:
+            IS_pag = int(statm.read().split()[1])
+        return IS_pag * os.sysconf("SC_PAGE_SIZE")
+    return _peak_rss()
+
+
+# *****************************************************************************
+# Metrics export
+# *****************************************************************************
+def _write_met(met_prm: str, YS_lab: str, AT_met: dict[str, Any]) -> None:
+    """Write metrics in the Prometheus text format, replacing met_prm at once.
+
+    AT_met maps each metric name to a (type, help, value) tuple. The file is
+    written next to met_prm then renamed, so that a textfile collector never
+    reads a partial file.
+    """
+    YS_met = ""
+    for YS_nam, (YS_typ, YS_hlp, ZS_val) in AT_met.items():
+        YS_met += f"# HELP rapid2_{YS_nam} {YS_hlp}\n"
+        YS_met += f"# TYPE rapid2_{YS_nam} {YS_typ}\n"
+        YS_met += f"rapid2_{YS_nam}{{{YS_lab}}} {ZS_val}\n"
+
+    tmp_prm = f"{met_prm}.{os.getpid()}.tmp"
+    with open(tmp_prm, "w") as prm:
+        prm.write(YS_met)
+    os.replace(tmp_prm, met_prm)
+
+
+# *****************************************************************************
+# Consecutive files of external inflow
+# *****************************************************************************
+class _QexFiles:
+    """Read blocks of time steps of a basin across consecutive Qext files.
+
+    AV_fil is made by read_fil_vec. Blocks may span two files, and only the
+    file last read is kept open, as blocks are read in time order.
+    """
+
+    def __init__(
+        self,
+        AV_fil: list[tuple[str, int, int, int]],
+        IM_slb: npt.NDArray[np.int64],
+        IV_0bi_slb: npt.NDArray[np.int64],
+    ) -> None:
+        self.AV_fil = AV_fil
+        self.IM_slb = IM_slb
+        self.IV_0bi_slb = IV_0bi_slb
+        self.Qex_ncf: str | None = None
+        self.f: Any = None
+
+    def read(self, JS_tim_beg: int, JS_tim_end: int) -> npt.NDArray[Any]:
+        ZV_Qex_blk = []
+        for Qex_ncf, JS_fil_beg, JS_fil_end, JS_fil_off in self.AV_fil:
+            JS_beg = max(JS_tim_beg, JS_fil_beg)
+            JS_end = min(JS_tim_end, JS_fil_end)
+            if JS_beg >= JS_end:
+                continue
+            if Qex_ncf != self.Qex_ncf:
+                self.close()
+                self.f = netCDF4.Dataset(Qex_ncf, "r")
+                self.Qex_ncf = Qex_ncf
+            ZV_Qex_blk.append(
+                read_slb_mat(
+                    self.f.variables["Qext"],
+                    JS_beg - JS_fil_beg + JS_fil_off,
+                    JS_end - JS_fil_beg + JS_fil_off,
+                    self.IM_slb,
+                    self.IV_0bi_slb,
+                )
+            )
+        if len(ZV_Qex_blk) == 1:
+            return ZV_Qex_blk[0]
+        return np.concatenate(ZV_Qex_blk)
+
+    def close(self) -> None:
+        if self.f is not None:
+            self.f.close()
+            self.f = None
+            self.Qex_ncf = None
+
+
+def _slb_Qex(
+    ZV_Qex_var: Any, IV_0bi_bas: npt.NDArray[np.int32], IS_riv_tot: int
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64], int, int]:
+    """Return the hyperslabs of Qext covering the basin and their block size.
+
+    Filtered chunks are decompressed whole, others are read in part. Blocks
+    of time steps hold at most 2**22 values of the hyperslabs, whose total
+    width is also returned.
+    """
+    IS_cnk_Qex = 1
+    if ZV_Qex_var.chunking() != "contiguous" and any(
+        ZV_Qex_var.filters().values()
+    ):
+        IS_cnk_Qex = int(ZV_Qex_var.chunking()[1])
+
+    IS_blk_Qex = 16
+    IM_slb_Qex, IV_0bi_slb = make_slb_tbl(
+        IV_0bi_bas, IS_riv_tot, IS_cnk_Qex, IS_blk_Qex
+    )
+    IS_slb_Qex = int(np.sum(IM_slb_Qex[:, 1] - IM_slb_Qex[:, 0]))
+    IS_blk_Qex = max(1, min(IS_blk_Qex, 2**22 // IS_slb_Qex))
+    return IM_slb_Qex, IV_0bi_slb, IS_blk_Qex, IS_slb_Qex
+
+
+def _Qou_spl(Qou_ncf: str, Qex_ncf: str) -> str:
+    """Return the path of the Qou file of one Qext file of a split run.
+
+    The file is next to Qou_ncf and named after Qex_ncf with its Qex prefix
+    replaced, e.g., Qex_Sandbox_197001.nc4 gives Qou_Sandbox_197001.nc4.
+    """
+    YS_nam = os.path.basename(Qex_ncf)
+    if YS_nam.startswith("Qex"):
+        YS_nam = "Qou" + YS_nam[3:]
+    else:
+        YS_nam = "Qou_" + YS_nam
+    return os.path.join(os.path.dirname(Qou_ncf), YS_nam)
+
+
+def _Qou_shd(
+    Qou_ncf: str, IM_tim_all: npt.NDArray[np.int32], YS_shd: str
+) -> list[tuple[str, int, int]]:
+    """Return the Qou file and time steps of each period of a sharded run.
+
+    Time steps are grouped by the UTC year, month, or day of their start, and
+    the files are named after Qou_ncf with the period appended, e.g.,
+    Qou_Sandbox.nc4 gives Qou_Sandbox_197001.nc4 for January 1970.
+    """
+    YS_unt = {"year": "Y", "month": "M", "day": "D"}[YS_shd]
+    YV_prd = [
+        str(prd).replace("-", "")
+        for prd in IM_tim_all[:, 0]
+        .astype("datetime64[s]")
+        .astype(f"datetime64[{YS_unt}]")
+    ]
+
+    YS_stm, YS_ext = os.path.splitext(Qou_ncf)
+    AV_Qou = []
+    JS_tim_beg = 0
+    for JS_tim_all in range(1, len(YV_prd) + 1):
+        if (
+            JS_tim_all == len(YV_prd)
+            or YV_prd[JS_tim_all] != YV_prd[JS_tim_beg]
+        ):
+            AV_Qou.append(
+                (
+                    f"{YS_stm}_{YV_prd[JS_tim_beg]}{YS_ext}",
+                    JS_tim_beg,
+                    JS_tim_all,
+                )
+            )
+            JS_tim_beg = JS_tim_all
+    return AV_Qou
+
+
+# *****************************************************************************
+# Output backends
+# *****************************************************************************
+IT_ext_bck = {"netcdf": "", "memmap": ".mmp", "zarr": ".zarr"}
+
+
+class _ZarrRows:
+    """Buffer the rows written one at a time to a Zarr array.
+
+    Rows are written together once they fill the time extent of a chunk, or
+    when flushed, instead of rewriting each of their chunks once per row.
+    Other selections are written directly, after the buffered rows.
+    """
+
+    def __init__(self, zar: Any) -> None:
+        self.zar = zar
+        self.dtype = zar.dtype
+        self.ZM_buf = np.empty((zar.chunks[0], *zar.shape[1:]), zar.dtype)
+        self.JS_beg = 0
+        self.IS_buf = 0
+
+    def __setitem__(self, key: Any, val: Any) -> None:
+        JS_row = key[0] if isinstance(key, tuple) else key
+        BS_row = isinstance(JS_row, (int, np.integer)) and (
+            not isinstance(key, tuple) or key[1:] == (slice(None),)
+        )
+        if not BS_row:
+            self.flush()
+            self.zar[key] = val
+            return
+
+        if self.IS_buf > 0 and JS_row != self.JS_beg + self.IS_buf:
+            self.flush()
+        if self.IS_buf == 0:
+            self.JS_beg = int(JS_row)
+        self.ZM_buf[self.IS_buf] = val
+        self.IS_buf += 1
+        if self.IS_buf == len(self.ZM_buf):
+            self.flush()
+
+    def flush(self) -> None:
+        if self.IS_buf > 0:
+            self.zar[self.JS_beg : self.JS_beg + self.IS_buf] = self.ZM_buf[
+                : self.IS_buf
+            ]
+            self.IS_buf = 0
+
+
+def _open_bck(YS_bck: str, sto_pth: str) -> Any:
+    """Open an output store for writing through the backend YS_bck.
+
+    Every backend offers the part of the netCDF4 Dataset interface used for
+    outputs: a variables table whose items accept slice assignment, as well
+    as setncattr(), sync(), and close(). The netcdf backend is the Dataset.
+    """
+    if YS_bck == "netcdf":
+        return netCDF4.Dataset(sto_pth, "a")
+
+    if YS_bck == "memmap":
+        AT_var, AT_att = read_std_mmp(sto_pth, "r+")
+        hdr_jsn = os.path.join(sto_pth, "header.json")
+
+        def setncattr(YS_att: str, YS_val: Any) -> None:
+            with open(hdr_jsn) as jsn:
+                AT_hdr = json.load(jsn)
+            AT_hdr["attributes"][YS_att] = YS_val
+            with open(f"{hdr_jsn}.tmp", "w") as jsn:
+                json.dump(AT_hdr, jsn, indent=2)
+            os.replace(f"{hdr_jsn}.tmp", hdr_jsn)
+
+        def sync() -> None:
+            for ZV_var in AT_var.values():
+                ZV_var.flush()
+
+        return SimpleNamespace(
+            variables=AT_var, setncattr=setncattr, sync=sync, close=sync
+        )
+
+    if YS_bck == "zarr":
+        import zarr
+
+        z = zarr.open_group(sto_pth, mode="r+")
+        # time_bnds is flushed last, so that it marks complete time steps
+        AT_zar = {
+            YS_var: _ZarrRows(z[YS_var])
+            for YS_var in ("Qout", "time", "time_bnds")
+        }
+
+        def flush() -> None:
+            for rows in AT_zar.values():
+                rows.flush()
+
+        return SimpleNamespace(
+            variables=AT_zar,
+            setncattr=z.attrs.__setitem__,
+            sync=flush,
+            close=flush,
+        )
+
+    raise ValueError(f"Unknown backend {YS_bck}")
+
+
+def _prep_out(
+    YS_bck: str,
+    AV_Qou: list[tuple[str, int, int]],
+    Qfi_sto: str,
+    IV_riv_tot: npt.NDArray[np.int32],
+    ZV_lon_tot: npt.NDArray[np.float64],
+    ZV_lat_tot: npt.NDArray[np.float64],
+    IV_0bi_bas: npt.NDArray[np.int32],
+    AT_stg: dict[str, dict[str, Any]],
+) -> None:
+    """Create the Qou stores of AV_Qou and the Qfi store through YS_bck.
+
+    Qou stores hold the basin and Qfi the whole domain. The storage layout
+    AT_stg made by make_stg_tbl applies to netcdf and zarr stores.
+    """
+    if YS_bck == "netcdf":
+        for Qou_tmp, _, _ in AV_Qou:
+            prep_Qou_ncf(
+                IV_riv_tot[IV_0bi_bas],
+                ZV_lon_tot[IV_0bi_bas],
+                ZV_lat_tot[IV_0bi_bas],
+                Qou_tmp,
+                AT_stg,
+            )
+        prep_Qfi_ncf(IV_riv_tot, ZV_lon_tot, ZV_lat_tot, Qfi_sto, AT_stg)
+    elif YS_bck == "memmap":
+        for Qou_tmp, JS_tim_beg, JS_tim_end in AV_Qou:
+            prep_std_mmp(
+                IV_riv_tot[IV_0bi_bas],
+                ZV_lon_tot[IV_0bi_bas],
+                ZV_lat_tot[IV_0bi_bas],
+                JS_tim_end - JS_tim_beg,
+                Qou_tmp,
+            )
+        prep_std_mmp(IV_riv_tot, ZV_lon_tot, ZV_lat_tot, 1, Qfi_sto, "float64")
+    else:
+        for Qou_tmp, JS_tim_beg, JS_tim_end in AV_Qou:
+            prep_std_zar(
+                IV_riv_tot[IV_0bi_bas],
+                ZV_lon_tot[IV_0bi_bas],
+                ZV_lat_tot[IV_0bi_bas],
+                JS_tim_end - JS_tim_beg,
+                Qou_tmp,
+                "float32",
+                AT_stg,
+            )
+        prep_std_zar(IV_riv_tot, ZV_lon_tot, ZV_lat_tot, 1, Qfi_sto, "float64")
+
+
+def _save_Qfi(
+    h: Any,
+    f: Any,
+    ZV_Qou_now: npt.NDArray[np.float64],
+    IV_0bi_bas: npt.NDArray[np.int32],
+    IS_riv_tot: int,
+    IS_tim_end: int,
+) -> None:
+    """Write the final state of the basin and the attributes of f into h.
+
+    Reaches outside of the basin are written as missing values.
+    """
+    ZV_Qfi = np.full(IS_riv_tot, 1e20, dtype=np.float64)
+    ZV_Qfi[IV_0bi_bas] = ZV_Qou_now[:]
+    h.variables["Qout"][0, :] = ZV_Qfi
+    h.variables["time"][0] = IS_tim_end
+
+    h.setncattr("title", f.getncattr("title"))
+    h.setncattr("institution", f.getncattr("institution"))
+
+
+# *****************************************************************************
+# Time loop
+# *****************************************************************************
+def _rout_tim(
+    Qex: _QexFiles | npt.NDArray[Any],
+    u: Any,
+    ZM_Ups: csc_matrix | None,
+    JS_tim_ups: int,
+    ZM_ICN: csc_matrix,
+    ZM_Qex: csc_matrix,
+    ZM_Qou: csc_matrix,
+    IS_blk_Qex: int,
+    IS_rat_Qex: int,
+    JS_tim_beg: int,
+    JS_tim_end: int,
+    ZV_Qou_prv: npt.NDArray[np.float64],
+    write: Callable[[int, npt.NDArray[np.float64]], None],
+    AT_hok: dict[str, Any] | None = None,
+    IM_tim_all: npt.NDArray[np.int32] | None = None,
+    ZM_clk_tim: npt.NDArray[np.float64] | None = None,
+    BS_cnc: Any = None,
+    YS_dsc: str | None = None,
+) -> npt.NDArray[np.float64]:
+    """Route time steps JS_tim_beg to JS_tim_end (exclusive) from ZV_Qou_prv.
+
+    External inflow is read from Qex in blocks of IS_blk_Qex time steps, or
+    indexed if Qex is an array, and the outflow of the upstream Dataset u is
+    added through ZM_Ups if given. The average outflow of each time step is
+    given to the hooks of AT_hok, then to write. The read, compute, and write
+    times of each step are stored in ZM_clk_tim if given, and a progress bar
+    is shown if YS_dsc is given. The loop stops early once the event BS_cnc
+    is set, and the instantaneous outflow of the last step is returned.
+    """
+    IV_tim: Iterable[int] = range(JS_tim_beg, JS_tim_end)
+    if YS_dsc is not None:
+        IV_tim = tqdm(IV_tim, desc=YS_dsc)
+
+    for JS_tim_all in IV_tim:
+        if BS_cnc is not None and BS_cnc.is_set():
+            break
+
+        ZS_clk_0 = time.perf_counter()
+
+        # Compute Qout
+        JS_tim_blk = (JS_tim_all - JS_tim_beg) % IS_blk_Qex
+        if not isinstance(Qex, _QexFiles):
+            ZV_Qex_avg = Qex[JS_tim_all]
+        else:
+            if JS_tim_blk == 0:
+                ZM_Qex_blk = Qex.read(
+                    JS_tim_all, min(JS_tim_all + IS_blk_Qex, JS_tim_end)
+                )
+            ZV_Qex_avg = ZM_Qex_blk[JS_tim_blk]
+        if ZM_Ups is not None:
+            ZV_Qup_avg = u.variables["Qout"][JS_tim_ups + JS_tim_all]
+            ZV_Qex_avg = ZV_Qex_avg + ZM_Ups @ ZV_Qup_avg
+
+        ZS_clk_1 = time.perf_counter()
+
+        ZV_Qou_avg, ZV_Qou_now = updt_Mus_Qou(
+            ZM_ICN, ZM_Qex, ZM_Qou, IS_rat_Qex, ZV_Qou_prv, ZV_Qex_avg
+        )
+        ZV_Qou_prv = ZV_Qou_now
+
+        if AT_hok and IM_tim_all is not None:
+            ZV_Qou_avg = ZV_Qou_avg.view()
+            ZV_Qou_avg.flags.writeable = False
+            ZV_Qou_now = ZV_Qou_now.view()
+            ZV_Qou_now.flags.writeable = False
+            IV_tim_now = IM_tim_all[JS_tim_all, :].view()
+            IV_tim_now.flags.writeable = False
+            for hook in AT_hok.values():
+                hook(JS_tim_all, IV_tim_now, ZV_Qou_avg, ZV_Qou_now)
+
+        ZS_clk_2 = time.perf_counter()
+
+        # Populate Qout, time, and time_bnds of the output of the step
+        write(JS_tim_all, ZV_Qou_avg)
+
+        if ZM_clk_tim is not None:
+            ZM_clk_tim[JS_tim_all, :] = [
+                ZS_clk_1 - ZS_clk_0,
+                ZS_clk_2 - ZS_clk_1,
+                time.perf_counter() - ZS_clk_2,
+            ]
+
+    return ZV_Qou_prv
+
+
+# *****************************************************************************
+# Time segment worker
+# *****************************************************************************
+def _rout_seg(
+    AV_fil: list[tuple[str, int, int, int]],
+    Qex_mmp: str | None,
+    Qup_ncf: str | None,
+    JS_tim_ups: int,
+    seg_npy: str,
+    ZM_ICN: csc_matrix,
+    ZM_Qex: csc_matrix,
+    ZM_Qou: csc_matrix,
+    ZM_Ups: csc_matrix | None,
+    IM_slb_Qex: npt.NDArray[np.int64],
+    IV_0bi_slb: npt.NDArray[np.int64],
+    IS_blk_Qex: int,
+    IS_rat_Qex: int,
+    JS_tim_beg: int,
+    JS_tim_end: int,
+    ZV_Qou_prv: npt.NDArray[np.float64],
+) -> npt.NDArray[np.float64]:
+    """Route one time segment and write its average outflow into seg_npy.
+
+    Each worker creates its own float32 array for time steps JS_tim_beg to
+    JS_tim_end and returns the instantaneous outflow at the end of its
+    segment.
+    """
+    Qex: _QexFiles | npt.NDArray[Any]
+    if Qex_mmp is not None:
+        Qex = read_std_mmp(Qex_mmp)[0]["Qext"][AV_fil[0][3] :]
+    else:
+        Qex = _QexFiles(AV_fil, IM_slb_Qex, IV_0bi_slb)
+    u = netCDF4.Dataset(Qup_ncf, "r") if Qup_ncf is not None else None
+    ZM_Qou_seg = np.lib.format.open_memmap(
+        seg_npy,
+        mode="w+",
+        dtype=np.float32,
+        shape=(int(JS_tim_end - JS_tim_beg), int(ZM_ICN.shape[0])),
+    )
+
+    def write(JS_tim_all: int, ZV_Qou_avg: npt.NDArray[np.float64]) -> None:
+        ZM_Qou_seg[JS_tim_all - JS_tim_beg, :] = ZV_Qou_avg
+
+    ZV_Qou_prv = _rout_tim(
+        Qex,
+        u,
+        ZM_Ups,
+        JS_tim_ups,
+        ZM_ICN,
+        ZM_Qex,
+        ZM_Qou,
+        IS_blk_Qex,
+        IS_rat_Qex,
+        JS_tim_beg,
+        JS_tim_end,
+        ZV_Qou_prv,
+        write,
+    )
+
+    ZM_Qou_seg.flush()
+    if isinstance(Qex, _QexFiles):
+        Qex.close()
+    if u is not None:
+        u.close()
+
+    return ZV_Qou_prv
+
 
 # *****************************************************************************
 # Main
@@ -70,15 +633,285 @@ def main() -> None:
         help="specify the namelist file",
     )
 
+    parser.add_argument(
+        "-app",
+        "--append",
+        dest="app",
+        action="store_true",
+        help=(
+            "append to existing Qou_ncf and start from existing Qfi_ncf, "
+            "which is then updated in place"
+        ),
+    )
+
+    parser.add_argument(
+        "-beg",
+        "--start",
+        dest="beg",
+        metavar="START",
+        type=int,
+        default=None,
+        help=(
+            "ignore time steps of Qex_ncf starting before START in epoch "
+            "seconds, overrides IS_tim_beg of the namelist, the time of "
+            "Q00_ncf must then be that of the first time step kept"
+        ),
+    )
+
+    parser.add_argument(
+        "-end",
+        "--end",
+        dest="end",
+        metavar="END",
+        type=int,
+        default=None,
+        help=(
+            "ignore time steps of Qex_ncf ending after END in epoch seconds, "
+            "overrides IS_tim_end of the namelist"
+        ),
+    )
+
+    parser.add_argument(
+        "-spl",
+        "--split_output",
+        dest="spl",
+        action="store_true",
+        help=(
+            "write one Qou file per file of Qex_ncf, named after it next to "
+            "Qou_ncf, instead of one Qou_ncf"
+        ),
+    )
+
+    parser.add_argument(
+        "-shd",
+        "--shard",
+        dest="shd",
+        choices=["year", "month", "day"],
+        default=None,
+        help=(
+            "write one Qou file per year, month, or day, named after Qou_ncf "
+            "with the period appended, listed in a JSON manifest replacing "
+            "the extension of Qou_ncf, overrides YS_shd"
+        ),
+    )
+
+    parser.add_argument(
+        "-tpl",
+        "--time-parallel",
+        dest="tpl",
+        metavar="K",
+        type=int,
+        default=1,
+        help=(
+            "split the time steps into K segments routed concurrently, then "
+            "correct each segment with the free response of its true initial "
+            "state until it decays below 1e-9 of that state, using scratch "
+            "files next to Qou_ncf of the size of an uncompressed float32 "
+            "Qout (default: 1)"
+        ),
+    )
+
+    parser.add_argument(
+        "-prf",
+        "--profile",
+        dest="prf",
+        metavar="PROFILE_JSON",
+        type=str,
+        default=None,
+        help=(
+            "write a JSON report of wall and CPU time per phase and of "
+            "percentiles of read, compute, and write time per time step"
+        ),
+    )
+
+    parser.add_argument(
+        "-cpr",
+        "--cprofile",
+        dest="cpr",
+        metavar="CPROFILE_PRF",
+        type=str,
+        default=None,
+        help=(
+            "write cProfile statistics (e.g., for snakeviz or flameprof) of "
+            "the whole run"
+        ),
+    )
+
+    parser.add_argument(
+        "-mem",
+        "--memory",
+        dest="mem",
+        action="store_true",
+        help=(
+            "print the peak resident memory during each phase, since the "
+            "start of the run where it cannot be reset, and the size of the "
+            "main arrays and matrices at the end of the run"
+        ),
+    )
+
+    parser.add_argument(
+        "-met",
+        "--metrics",
+        dest="met",
+        metavar="METRICS_PROM",
+        type=str,
+        default=None,
+        help=(
+            "maintain a metrics file in the Prometheus text format (e.g., for "
+            "a node_exporter textfile collector), replaced atomically"
+        ),
+    )
+
+    parser.add_argument(
+        "-mev",
+        "--metrics_every",
+        dest="mev",
+        metavar="N",
+        type=int,
+        default=100,
+        help="update the metrics file every N time steps (default: 100)",
+    )
+
+    parser.add_argument(
+        "-qxc",
+        "--qext_cache",
+        dest="qxc",
+        metavar="QEXT_CACHE",
+        type=str,
+        default=None,
+        help=(
+            "read external inflow from a cache made by cacheqext, overrides "
+            "Qex_mmp of the namelist"
+        ),
+    )
+
+    parser.add_argument(
+        "-bck",
+        "--backend",
+        dest="bck",
+        choices=list(IT_ext_bck),
+        default=None,
+        help=(
+            "write Qou_ncf and Qfi_ncf as netCDF files, as raw memory-mapped "
+            "stores (.mmp), or as Zarr stores (.zarr) next to them, overrides "
+            "YS_bck of the namelist (default: netcdf)"
+        ),
+    )
+
+    parser.add_argument(
+        "-cmp",
+        "--compression",
+        dest="cmp",
+        choices=["zlib", "zstd", "none"],
+        default=None,
+        help=(
+            "compress the variables of Qou_ncf and Qfi_ncf, overrides YS_cmp "
+            "of the namelist (default: zlib)"
+        ),
+    )
+
+    parser.add_argument(
+        "-lvl",
+        "--level",
+        dest="lvl",
+        metavar="LEVEL",
+        type=int,
+        default=None,
+        help="set the compression level, overrides IS_lvl (default: 1)",
+    )
+
+    parser.add_argument(
+        "-shf",
+        "--shuffle",
+        dest="shf",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="shuffle bytes before compression, overrides BS_shf (default)",
+    )
+
+    parser.add_argument(
+        "-lsd",
+        "--least_significant_digit",
+        dest="lsd",
+        metavar="DIGITS",
+        type=int,
+        default=None,
+        help=(
+            "quantize the discharge of Qou_ncf to DIGITS decimal digits, "
+            "overrides IS_lsd (default: none, lossless)"
+        ),
+    )
+
+    parser.add_argument(
+        "-cnk",
+        "--chunks",
+        dest="cnk",
+        metavar=("TIME", "RIVID"),
+        type=int,
+        nargs=2,
+        default=None,
+        help=(
+            "set the chunk shape of (time, rivid) variables of Qou_ncf, "
+            "overrides IV_cnk (default: tuned to the number of reaches)"
+        ),
+    )
+
     # -------------------------------------------------------------------------
     # Parse arguments and assign to variables
     # -------------------------------------------------------------------------
     args = parser.parse_args()
 
     nml_yml = args.nml
+    BS_app = args.app
+    IS_tim_beg = args.beg
+    IS_tim_end = args.end
+    BS_spl = args.spl
+    YS_shd = args.shd
+    IS_tpl = args.tpl
+    prf_jsn = args.prf
+    cpr_prf = args.cpr
+    BS_mem = args.mem
+    met_prm = args.met
+    IS_mev = args.mev
+    YS_bck = args.bck
+    Qex_mmp = args.qxc
+    AT_arg_stg = {
+        "YS_cmp": args.cmp,
+        "IS_lvl": args.lvl,
+        "BS_shf": args.shf,
+        "IS_lsd": args.lsd,
+        "IV_cnk": args.cnk,
+    }
 
     print(f"Namelist file: {nml_yml}")
 
+    # -------------------------------------------------------------------------
+    # Profiling of phases, only timestamps are taken unless requested
+    # -------------------------------------------------------------------------
+    BS_prf = prf_jsn is not None
+
+    if cpr_prf is not None:
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    AT_phs: list[dict[str, str | float | int]] = []
+    ZV_clk_prv = [time.perf_counter(), time.process_time()]
+    BS_rss_phs = _rset_rss()
+
+    def mark(YS_phs: str) -> None:
+        ZS_wal_now = time.perf_counter()
+        ZS_cpu_now = time.process_time()
+        AT_phs.append(
+            {
+                "phase": YS_phs,
+                "wall_s": ZS_wal_now - ZV_clk_prv[0],
+                "cpu_s": ZS_cpu_now - ZV_clk_prv[1],
+                "phase_peak_rss_B": _peak_rss(),
+            }
+        )
+        _rset_rss()
+        ZV_clk_prv[:] = [ZS_wal_now, ZS_cpu_now]
+
     # -------------------------------------------------------------------------
     # Execute main logic
     # -------------------------------------------------------------------------
@@ -102,30 +935,101 @@ def main() -> None:
         Qou_ncf = AT_nml["Qou_ncf"]
         Qfi_ncf = AT_nml["Qfi_ncf"]
 
+        Qup_ncf = AT_nml.get("Qup_ncf")
+
+        # Period and splitting of outputs, from the namelist unless options
+        if IS_tim_beg is None:
+            IS_tim_beg = AT_nml.get("IS_tim_beg")
+        if IS_tim_end is None:
+            IS_tim_end = AT_nml.get("IS_tim_end")
+        BS_spl = BS_spl or AT_nml.get("BS_spl", False)
+        if BS_spl and BS_app:
+            raise ValueError("--split_output is not supported with --append")
+        if YS_shd is None:
+            YS_shd = AT_nml.get("YS_shd")
+        if YS_shd is not None and (BS_spl or BS_app):
+            raise ValueError(
+                "--shard is not supported with --split_output or --append"
+            )
+
+        # Cache of external inflow, from the namelist unless given as option
+        if Qex_mmp is None:
+            Qex_mmp = AT_nml.get("Qex_mmp")
+
+        # Backend of outputs, from the namelist unless given as an option
+        if YS_bck is None:
+            YS_bck = AT_nml.get("YS_bck", "netcdf")
+        if YS_bck not in IT_ext_bck:
+            raise ValueError(f"Unknown backend {YS_bck}")
+        if YS_bck != "netcdf" and BS_app:
+            raise ValueError(
+                "--append is only supported by the netcdf backend"
+            )
+        if YS_bck != "netcdf" and YS_shd is not None:
+            raise ValueError("--shard is only supported by the netcdf backend")
+
+        Qou_sto = Qou_ncf
+        Qfi_sto = Qfi_ncf
+        if YS_bck != "netcdf":
+            Qou_sto = os.path.splitext(Qou_ncf)[0] + IT_ext_bck[YS_bck]
+            Qfi_sto = os.path.splitext(Qfi_ncf)[0] + IT_ext_bck[YS_bck]
+
+        # Storage layout of outputs, from the namelist unless given as options
+        AT_arg_stg = {
+            YS_arg: AT_nml[YS_arg] if AT_val is None else AT_val
+            for YS_arg, AT_val in AT_arg_stg.items()
+            if AT_val is not None or YS_arg in AT_nml
+        }
+
+        # Hooks called after each time step, none unless listed in namelist
+        AT_hok = make_hok_tbl(AT_nml.get("YV_hok", []))
+        if AT_hok and IS_tpl > 1:
+            raise ValueError("YV_hok is not supported with --time-parallel")
+
+        mark("read_nml_tbl")
+
         # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
         # River network
         # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
         IV_riv_tot, IV_dwn_tot = read_con_vec(con_pqt)
         IV_riv_bas = read_riv_vec(bas_pqt)
+
+        if Qup_ncf is not None:
+            # Reaches routed by the upstream basin are excluded from the basin
+            IV_riv_ups, _, _, _, IM_tim_ups = read_std_vec(Qup_ncf)
+            IV_riv_bas = IV_riv_bas[~np.isin(IV_riv_bas, IV_riv_ups)]
+
+        mark("read_con_riv")
+
         IT_0bi_tot, IT_0bi_bas, IV_0bi_bas = make_0bi_tbl(
             IV_riv_tot, IV_riv_bas
         )
+        mark("make_0bi_tbl")
+
         ZM_Net = make_Net_mat(IV_dwn_tot, IT_0bi_tot, IV_riv_bas, IT_0bi_bas)
 
+        if Qup_ncf is not None:
+            ZM_Ups = make_Ups_mat(
+                IV_riv_ups, IV_dwn_tot, IT_0bi_tot, IT_0bi_bas
+            )
+        mark("make_Net_mat")
+
         # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
         # Model parameters
         # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-        IV_riv_tmp, ZV_kpr_bas = read_kpr_vec(kpr_pqt, IV_0bi_bas)
+        IV_riv_tmp, ZV_kpr_bas = read_kpr_vec(kpr_pqt, IV_0bi_bas, IV_riv_bas)
         np.testing.assert_array_equal(IV_riv_bas, IV_riv_tmp)
 
-        IV_riv_tmp, ZV_xpr_bas = read_xpr_vec(xpr_pqt, IV_0bi_bas)
+        IV_riv_tmp, ZV_xpr_bas = read_xpr_vec(xpr_pqt, IV_0bi_bas, IV_riv_bas)
         np.testing.assert_array_equal(IV_riv_bas, IV_riv_tmp)
+        mark("read_kpr_xpr")
 
         ZM_C1p, ZM_C2p, ZM_C3p = make_CCC_mat(ZV_kpr_bas, ZV_xpr_bas, IS_dtR)
         ZM_ICN, ZM_Qex, ZM_Qou = make_Mus_mat(ZM_Net, ZM_C1p, ZM_C2p, ZM_C3p)
+        mark("make_Mus_mat")
 
         # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-        # Extract metadata of external inflow and check IDs
+        # Extract metadata of external inflow files, in time, and check IDs
         # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
         (
             IV_riv_tmp,
@@ -133,23 +1037,46 @@ def main() -> None:
             ZV_lat_tot,
             IV_tim_all,
             IM_tim_all,
-        ) = read_std_vec(Qex_ncf)
+            AV_fil,
+        ) = read_fil_vec(Qex_ncf, IS_tim_beg, IS_tim_end)
         np.testing.assert_array_equal(IV_riv_tot, IV_riv_tmp)
 
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # In append mode, the final state of the previous run is the initial
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        if BS_app and not os.path.isfile(Qou_ncf):
+            print(f"WARNING - File does not exist {Qou_ncf}. Creating it.")
+            BS_app = False
+
+        if BS_app:
+            if not os.path.isfile(Qfi_ncf):
+                raise IOError(f"Unable to append without {Qfi_ncf}")
+            Q00_ncf = Qfi_ncf
+
         # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
         # Extract metadata of initial value and check IDs and time
         # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
         IV_riv_tmp, _, _, IV_tim_tmp, _ = read_std_vec(Q00_ncf)
         np.testing.assert_array_equal(IV_riv_tot, IV_riv_tmp)
-        np.testing.assert_equal(IV_tim_all[0], IV_tim_tmp[0])
+
+        # Appending a cycle twice is a likely mistake, reported as such
+        if BS_app and IV_tim_tmp[0] > IV_tim_all[0]:
+            raise ValueError(
+                f"Time of {Qfi_ncf} ({IV_tim_tmp[0]}) is after the first "
+                f"time of {Qex_ncf} ({IV_tim_all[0]}), this period was "
+                f"already appended to {Qou_ncf}"
+            )
+        if IV_tim_tmp[0] != IV_tim_all[0]:
+            raise ValueError(
+                f"Time of {Q00_ncf} ({IV_tim_tmp[0]}) differs from the "
+                f"first time of {Qex_ncf} ({IV_tim_all[0]}) in the period"
+            )
 
         # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
         # Get time step correspondance
         # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
         IS_tim_all = len(IV_tim_all)
 
-        if IM_tim_all is None:
-            raise ValueError("read_std_vec returned None for IM_tim_all")
         # Use IM_tim_all instead of IV_tim_all which may have only one timestep
         IS_dtE = IM_tim_all[0, 1] - IM_tim_all[0, 0]
 
@@ -162,77 +1089,549 @@ def main() -> None:
             raise ValueError("IS_dtE is not a multiple of IS_dtR")
 
         # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-        # Check upstream to downstream topology
+        # Check time of upstream outflow
         # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-        chck_bas(IV_riv_bas, IT_0bi_bas, IV_riv_tot, IV_dwn_tot, IT_0bi_tot)
+        # Upstream outflow is read from the time step starting the period,
+        # so that it may cover more time than the period, e.g., when appending
+        JS_tim_ups = 0
+        if Qup_ncf is not None:
+            if IM_tim_ups is None:
+                raise ValueError(f"time_bnds is missing in {Qup_ncf}")
+            IV_tim_ups = np.flatnonzero(IM_tim_ups[:, 0] == IM_tim_all[0, 0])
+            if len(IV_tim_ups) > 0:
+                JS_tim_ups = int(IV_tim_ups[0])
+            if len(IV_tim_ups) == 0 or not np.array_equal(
+                IM_tim_ups[JS_tim_ups : JS_tim_ups + IS_tim_all], IM_tim_all
+            ):
+                raise ValueError(
+                    f"Values of time_bnds in {Qup_ncf} do not cover those "
+                    f"of {Qex_ncf} from {IM_tim_all[0, 0]} to "
+                    f"{IM_tim_all[-1, 1]}"
+                )
 
         # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-        # Populate metadata for discharge output files
+        # Check cache of external inflow against basin, time, and source file
         # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-        prep_Qou_ncf(
-            IV_riv_tot[IV_0bi_bas],
-            ZV_lon_tot[IV_0bi_bas],
-            ZV_lat_tot[IV_0bi_bas],
-            Qou_ncf,
-        )
-        prep_Qfi_ncf(
+        # The cache holds one file, its rows start at the first time step kept
+        if Qex_mmp is not None:
+            if len(AV_fil) > 1:
+                raise ValueError("Qex_mmp requires a single file in Qex_ncf")
+            Qex_fil, _, _, JS_tim_mmp = AV_fil[0]
+            AT_Qex_mmp, AT_att_mmp = read_std_mmp(Qex_mmp)
+            if "Qext" not in AT_Qex_mmp:
+                raise ValueError(f"Qext variable does not exist in {Qex_mmp}")
+            if not np.array_equal(AT_Qex_mmp["rivid"], IV_riv_bas):
+                raise ValueError(
+                    f"River IDs in {Qex_mmp} differ from the basin"
+                )
+            if not np.array_equal(
+                AT_Qex_mmp["time_bnds"][JS_tim_mmp : JS_tim_mmp + IS_tim_all],
+                IM_tim_all,
+            ):
+                raise ValueError(
+                    f"Values of time_bnds in {Qex_mmp} differ from {Qex_fil}"
+                )
+            AT_sta = os.stat(Qex_fil)
+            if (
+                AT_att_mmp.get("source_size") != AT_sta.st_size
+                or AT_att_mmp.get("source_mtime_ns") != AT_sta.st_mtime_ns
+            ):
+                raise ValueError(f"{Qex_fil} changed since {Qex_mmp} was made")
+            ZM_Qex_mmp = AT_Qex_mmp["Qext"][JS_tim_mmp:]
+
+        mark("read_std_vec")
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Check upstream to downstream topology
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        chck_bas(
+            IV_riv_bas,
+            IT_0bi_bas,
             IV_riv_tot,
-            ZV_lon_tot,
-            ZV_lat_tot,
-            Qfi_ncf,
+            IV_dwn_tot,
+            IT_0bi_tot,
+            IV_riv_ups if Qup_ncf is not None else None,
         )
+        mark("chck_bas")
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Populate metadata for discharge output files
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Each output holds time steps JS_tim_beg to JS_tim_end (exclusive)
+        AV_Qou = [(Qou_sto, 0, IS_tim_all)]
+        if BS_spl:
+            AV_Qou = [
+                (
+                    os.path.splitext(_Qou_spl(Qou_ncf, Qex_fil))[0]
+                    + os.path.splitext(Qou_sto)[1],
+                    JS_fil_beg,
+                    JS_fil_end,
+                )
+                for Qex_fil, JS_fil_beg, JS_fil_end, _ in AV_fil
+            ]
+        if YS_shd is not None:
+            AV_Qou = _Qou_shd(Qou_ncf, IM_tim_all, YS_shd)
+            shd_jsn = os.path.splitext(Qou_ncf)[0] + ".json"
+
+        if not BS_app:
+            AT_stg = make_stg_tbl(len(IV_riv_bas), **AT_arg_stg)
+            _prep_out(
+                YS_bck,
+                AV_Qou,
+                Qfi_sto,
+                IV_riv_tot,
+                ZV_lon_tot,
+                ZV_lat_tot,
+                IV_0bi_bas,
+                AT_stg,
+            )
+        mark("prep_Qou_Qfi")
 
         # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
         # Open files
         # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-        e = netCDF4.Dataset(Q00_ncf, "r")
-        f = netCDF4.Dataset(Qex_ncf, "r")
-        g = netCDF4.Dataset(Qou_ncf, "a")
-        h = netCDF4.Dataset(Qfi_ncf, "a")
+        if not BS_app:
+            e = netCDF4.Dataset(Q00_ncf, "r")
+        f = netCDF4.Dataset(AV_fil[0][0], "r")
+        g = _open_bck(YS_bck, AV_Qou[0][0])
+        h = _open_bck(YS_bck, Qfi_sto)
+        if Qup_ncf is not None:
+            u = netCDF4.Dataset(Qup_ncf, "r")
+
+        # The manifest lists the shards closed so far, in time order
+        def close_Qou(g: Any, JS_Qou: int) -> None:
+            g.setncattr("title", f.getncattr("title"))
+            g.setncattr("institution", f.getncattr("institution"))
+            g.close()
+            if YS_shd is not None:
+                prep_shd_jsn(
+                    [
+                        (
+                            Qou_tmp,
+                            JS_tim_end - JS_tim_beg,
+                            int(IM_tim_all[JS_tim_beg, 0]),
+                            int(IM_tim_all[JS_tim_end - 1, 1]),
+                        )
+                        for Qou_tmp, JS_tim_beg, JS_tim_end in AV_Qou[
+                            : JS_Qou + 1
+                        ]
+                    ],
+                    shd_jsn,
+                )
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Check continuity of existing discharge output when appending
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Only the last time bounds are read to keep cost independent of size
+        IS_tim_off = len(g.dimensions["time"]) if BS_app else 0
+
+        if BS_app:
+            np.testing.assert_array_equal(
+                IV_riv_tot[IV_0bi_bas], g.variables["rivid"][:]
+            )
+            if IS_tim_off == 0:
+                raise ValueError(f"No time step to append to in {Qou_ncf}")
+            IS_tim_prv = g.variables["time_bnds"][IS_tim_off - 1, 1]
+            if IS_tim_prv != IM_tim_all[0, 0]:
+                raise ValueError(
+                    f"Last time_bnds end in {Qou_ncf} ({IS_tim_prv}) differs "
+                    f"from first time_bnds start in {AV_fil[0][0]} "
+                    f"({IM_tim_all[0, 0]})"
+                )
 
         # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
         # Read initial discharge state
         # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-        ZV_Qou_prv = e.variables["Qout"][0, IV_0bi_bas]
+        if BS_app:
+            ZV_Qou_prv = h.variables["Qout"][0, IV_0bi_bas]
+        else:
+            ZV_Qou_prv = e.variables["Qout"][0, IV_0bi_bas]
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Hyperslabs of external inflow covering the basin, read in blocks
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        IM_slb_Qex, IV_0bi_slb, IS_blk_Qex, IS_slb_Qex = _slb_Qex(
+            f.variables["Qext"], IV_0bi_bas, len(IV_riv_tot)
+        )
+        q = _QexFiles(AV_fil, IM_slb_Qex, IV_0bi_slb)
 
         # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
         # Run simulations
         # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-        for JS_tim_all in tqdm(range(IS_tim_all), desc="Computing discharge"):
-            # Compute Qout
-            ZV_Qex_avg = f.variables["Qext"][JS_tim_all][IV_0bi_bas]
+        IS_seg = min(IS_tpl, IS_tim_all)
+        mark("open_files")
+
+        # Metrics are only gathered every IS_mev time steps when requested
+        BS_met = met_prm is not None
+        if BS_met:
+            if IS_mev < 1:
+                raise ValueError("The metrics interval must be at least 1")
 
-            ZV_Qou_avg, ZV_Qou_now = updt_Mus_Qou(
-                ZM_ICN, ZM_Qex, ZM_Qou, IS_rat_Qex, ZV_Qou_prv, ZV_Qex_avg
+            YS_nml = (
+                nml_yml.replace("\\", "\\\\")
+                .replace('"', '\\"')
+                .replace("\n", "\\n")
             )
-            ZV_Qou_prv = ZV_Qou_now
+            YS_lab = f'namelist="{YS_nml}",pid="{os.getpid()}"'
 
-            # Populate Qout, time, and time_bnds
-            g.variables["Qout"][JS_tim_all, :] = ZV_Qou_avg[:]
-            g.variables["time"][JS_tim_all] = IV_tim_all[JS_tim_all]
-            g.variables["time_bnds"][JS_tim_all, :] = IM_tim_all[JS_tim_all, :]
+            # Bytes read and written by netCDF4 for each time step
+            if Qex_mmp is not None:
+                IS_byt_red = ZM_Qex_mmp.dtype.itemsize * len(IV_riv_bas)
+            else:
+                IS_byt_red = f.variables["Qext"].dtype.itemsize * IS_slb_Qex
+            if Qup_ncf is not None:
+                IS_byt_red += (
+                    u.variables["Qout"].dtype.itemsize
+                    * u.variables["Qout"].shape[1]
+                )
+            IS_byt_wrt = (
+                g.variables["Qout"].dtype.itemsize * len(IV_riv_bas)
+                + g.variables["time"].dtype.itemsize
+                + g.variables["time_bnds"].dtype.itemsize * 2
+            )
 
-        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-        # Save final discharge state
-        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-        h.variables["Qout"][0, IV_0bi_bas] = ZV_Qou_now[:]
-        h.variables["time"][0] = IM_tim_all[-1, 1]
+            ZS_met_beg = time.perf_counter()
+            ZV_chk = [0.0]
+
+            def push_met(IS_tim_don: int) -> None:
+                ZS_ela = max(time.perf_counter() - ZS_met_beg, 1e-9)
+                _write_met(
+                    met_prm,
+                    YS_lab,
+                    {
+                        "timesteps_done": (
+                            "gauge",
+                            "Time steps routed.",
+                            IS_tim_don,
+                        ),
+                        "timesteps_remaining": (
+                            "gauge",
+                            "Time steps left to route.",
+                            IS_tim_all - IS_tim_don,
+                        ),
+                        "timesteps_per_second": (
+                            "gauge",
+                            "Time steps routed per second of routing.",
+                            IS_tim_don / ZS_ela,
+                        ),
+                        "reach_steps_per_second": (
+                            "gauge",
+                            "Reaches times time steps routed per second.",
+                            IS_tim_don * len(IV_riv_bas) / ZS_ela,
+                        ),
+                        "read_bytes_total": (
+                            "counter",
+                            "Bytes of inflow read from netCDF files.",
+                            IS_tim_don * IS_byt_red,
+                        ),
+                        "written_bytes_total": (
+                            "counter",
+                            "Bytes of outflow written to netCDF files.",
+                            IS_tim_don * IS_byt_wrt,
+                        ),
+                        "resident_memory_bytes": (
+                            "gauge",
+                            "Resident set size of the process.",
+                            _curr_rss(),
+                        ),
+                        "last_checkpoint_timestamp_seconds": (
+                            "gauge",
+                            "Unix time of the last flush of Qou_ncf to disk.",
+                            ZV_chk[0],
+                        ),
+                    },
+                )
+
+            push_met(0)
+
+        # Read, compute, and write times of each time step
+        if BS_prf:
+            ZM_clk_tim = np.zeros((IS_tim_all, 3), dtype=np.float64)
+
+        JS_Qou = 0
+        if IS_seg <= 1:
+
+            def write(
+                JS_tim_all: int, ZV_Qou_avg: npt.NDArray[np.float64]
+            ) -> None:
+                nonlocal g, JS_Qou
+                if JS_tim_all == AV_Qou[JS_Qou][2]:
+                    close_Qou(g, JS_Qou)
+                    JS_Qou += 1
+                    g = _open_bck(YS_bck, AV_Qou[JS_Qou][0])
+                JS_tim_Qou = IS_tim_off - AV_Qou[JS_Qou][1] + JS_tim_all
+                g.variables["Qout"][JS_tim_Qou, :] = ZV_Qou_avg[:]
+                g.variables["time"][JS_tim_Qou] = IV_tim_all[JS_tim_all]
+                g.variables["time_bnds"][JS_tim_Qou, :] = IM_tim_all[
+                    JS_tim_all, :
+                ]
+
+                if BS_met and (JS_tim_all + 1) % IS_mev == 0:
+                    g.sync()
+                    ZV_chk[0] = time.time()
+                    push_met(JS_tim_all + 1)
+
+            ZV_Qou_now = _rout_tim(
+                ZM_Qex_mmp if Qex_mmp is not None else q,
+                u if Qup_ncf is not None else None,
+                ZM_Ups if Qup_ncf is not None else None,
+                JS_tim_ups,
+                ZM_ICN,
+                ZM_Qex,
+                ZM_Qou,
+                IS_blk_Qex,
+                IS_rat_Qex,
+                0,
+                IS_tim_all,
+                ZV_Qou_prv,
+                write,
+                AT_hok,
+                IM_tim_all,
+                ZM_clk_tim if BS_prf else None,
+                YS_dsc="Computing discharge",
+            )
+
+        else:
+            # Routing is linear: each segment is routed concurrently from a
+            # zero state (except the first one), then corrected by adding the
+            # free response of its true initial state, obtained by chaining
+            # the final states of the segments.
+            IV_tim_seg = np.linspace(0, IS_tim_all, IS_seg + 1).astype(int)
+            IS_riv_bas = len(IV_riv_bas)
+            ZS_tol_fre = 1e-9
+
+            # Each segment is written to its own scratch file next to Qou_ncf,
+            # together the size of an uncompressed float32 Qout
+            AV_seg_npy = [
+                f"{Qou_ncf}.seg{JS_seg}.npy" for JS_seg in range(IS_seg)
+            ]
+
+            ZV_Qou_zer = np.zeros(IS_riv_bas, dtype=np.float64)
+            ZM_Ups_seg = ZM_Ups if Qup_ncf is not None else None
+
+            with ProcessPoolExecutor(max_workers=IS_seg) as executor:
+                futures = [
+                    executor.submit(
+                        _rout_seg,
+                        AV_fil,
+                        Qex_mmp,
+                        Qup_ncf,
+                        JS_tim_ups,
+                        AV_seg_npy[JS_seg],
+                        ZM_ICN,
+                        ZM_Qex,
+                        ZM_Qou,
+                        ZM_Ups_seg,
+                        IM_slb_Qex,
+                        IV_0bi_slb,
+                        IS_blk_Qex,
+                        IS_rat_Qex,
+                        IV_tim_seg[JS_seg],
+                        IV_tim_seg[JS_seg + 1],
+                        (
+                            np.asarray(ZV_Qou_prv, dtype=np.float64)
+                            if JS_seg == 0
+                            else ZV_Qou_zer
+                        ),
+                    )
+                    for JS_seg in range(IS_seg)
+                ]
+                ZV_Qou_end = []
+                for JS_seg, future in enumerate(
+                    tqdm(futures, desc="Computing segments")
+                ):
+                    ZV_Qou_end.append(future.result())
+                    if BS_met:
+                        push_met(int(IV_tim_seg[JS_seg + 1]))
+
+            # The free response is propagated until it decays below the
+            # tolerance of impulse-response kernels relative to the state it
+            # started from, so that only the first steps of a segment are
+            # corrected.
+            ZV_Qou_fre = ZV_Qou_zer
+            IS_tim_cor = 0
+            for JS_seg in tqdm(range(1, IS_seg), desc="Correcting segments"):
+                ZV_Qou_fre = ZV_Qou_end[JS_seg - 1] + ZV_Qou_fre
+                ZS_tol = ZS_tol_fre * np.max(np.abs(ZV_Qou_fre))
+                ZM_Qou_seg = np.load(AV_seg_npy[JS_seg], mmap_mode="r+")
+                for JS_tim_seg in range(len(ZM_Qou_seg)):
+                    if np.max(np.abs(ZV_Qou_fre)) <= ZS_tol:
+                        ZV_Qou_fre = ZV_Qou_zer
+                        break
+                    ZV_Qou_avg, ZV_Qou_fre = updt_Mus_Qou(
+                        ZM_ICN,
+                        ZM_Qex,
+                        ZM_Qou,
+                        IS_rat_Qex,
+                        ZV_Qou_fre,
+                        ZV_Qou_zer,
+                    )
+                    ZM_Qou_seg[JS_tim_seg, :] += ZV_Qou_avg
+                    IS_tim_cor += 1
+                ZM_Qou_seg.flush()
+                del ZM_Qou_seg
+
+            print(
+                f"  . Corrected {IS_tim_cor} of {IS_tim_all} time steps "
+                f"({100 * IS_tim_cor / IS_tim_all:.1f}%)"
+            )
+
+            ZV_Qou_now = ZV_Qou_end[-1] + ZV_Qou_fre
+
+            # Populate Qout, time, and time_bnds of each output, by segment
+            for JS_Qou, (Qou_tmp, JS_Qou_beg, JS_Qou_end) in enumerate(AV_Qou):
+                if JS_Qou > 0:
+                    close_Qou(g, JS_Qou - 1)
+                    g = _open_bck(YS_bck, Qou_tmp)
+                IS_Qou_off = IS_tim_off - JS_Qou_beg
+                for JS_seg in range(IS_seg):
+                    JS_tim_beg = max(IV_tim_seg[JS_seg], JS_Qou_beg)
+                    JS_tim_end = min(IV_tim_seg[JS_seg + 1], JS_Qou_end)
+                    if JS_tim_beg < JS_tim_end:
+                        ZM_Qou_seg = np.load(AV_seg_npy[JS_seg], mmap_mode="r")
+                        g.variables["Qout"][
+                            IS_Qou_off + JS_tim_beg : IS_Qou_off + JS_tim_end,
+                            :,
+                        ] = ZM_Qou_seg[
+                            JS_tim_beg - IV_tim_seg[JS_seg] : JS_tim_end
+                            - IV_tim_seg[JS_seg],
+                            :,
+                        ]
+                        del ZM_Qou_seg
+                g.variables["time"][
+                    IS_Qou_off + JS_Qou_beg : IS_Qou_off + JS_Qou_end
+                ] = IV_tim_all[JS_Qou_beg:JS_Qou_end]
+                g.variables["time_bnds"][
+                    IS_Qou_off + JS_Qou_beg : IS_Qou_off + JS_Qou_end, :
+                ] = IM_tim_all[JS_Qou_beg:JS_Qou_end]
+
+            for seg_npy in AV_seg_npy:
+                os.remove(seg_npy)
+
+        for hook in AT_hok.values():
+            close = getattr(hook, "close", None)
+            if callable(close):
+                close()
+
+        mark("routing")
 
         # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-        # Copy some global attributes
+        # Save final discharge state
         # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-        g.setncattr("title", f.getncattr("title"))
-        g.setncattr("institution", f.getncattr("institution"))
-        h.setncattr("title", f.getncattr("title"))
-        h.setncattr("institution", f.getncattr("institution"))
+        _save_Qfi(
+            h,
+            f,
+            ZV_Qou_now,
+            IV_0bi_bas,
+            len(IV_riv_tot),
+            int(IM_tim_all[-1, 1]),
+        )
 
         # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
         # Close files
         # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-        e.close()
+        if not BS_app:
+            e.close()
+        close_Qou(g, len(AV_Qou) - 1)
         f.close()
-        g.close()
+        q.close()
         h.close()
+        if Qup_ncf is not None:
+            u.close()
+        mark("close_files")
+
+        if BS_met:
+            ZV_chk[0] = time.time()
+            push_met(IS_tim_all)
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Profiling reports
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        if cpr_prf is not None:
+            profiler.disable()
+            profiler.dump_stats(cpr_prf)
+
+        if BS_prf:
+            AT_prf: dict[str, object] = {
+                "rapid2": __version__,
+                "namelist": nml_yml,
+                "IS_riv_bas": len(IV_riv_bas),
+                "IS_tim_all": IS_tim_all,
+                "IS_rat_Qex": int(IS_rat_Qex),
+                "time_parallel": IS_seg,
+                "phase_peak_rss_reset": BS_rss_phs,
+                "phases": AT_phs,
+                "total": {
+                    "wall_s": sum(float(AT["wall_s"]) for AT in AT_phs),
+                    "cpu_s": sum(float(AT["cpu_s"]) for AT in AT_phs),
+                },
+            }
+            if IS_seg > 1:
+                AT_prf["corrected_steps"] = IS_tim_cor
+            # Time steps are only timed individually in the serial loop
+            if IS_seg <= 1:
+                AT_prf["time_steps"] = {
+                    YS_cat: {
+                        "total_s": float(np.sum(ZM_clk_tim[:, JS_cat])),
+                        "p50_s": float(
+                            np.percentile(ZM_clk_tim[:, JS_cat], 50)
+                        ),
+                        "p90_s": float(
+                            np.percentile(ZM_clk_tim[:, JS_cat], 90)
+                        ),
+                        "p99_s": float(
+                            np.percentile(ZM_clk_tim[:, JS_cat], 99)
+                        ),
+                        "max_s": float(np.max(ZM_clk_tim[:, JS_cat])),
+                    }
+                    for JS_cat, YS_cat in enumerate(
+                        ["read", "compute", "write"]
+                    )
+                }
+            with open(prf_jsn, "w") as jsn:
+                json.dump(AT_prf, jsn, indent=2)
+            print(f"Profile written to {prf_jsn}")
+
+        if BS_mem:
+            AT_mem = {
+                "IV_riv_tot": IV_riv_tot,
+                "IV_dwn_tot": IV_dwn_tot,
+                "IV_riv_bas": IV_riv_bas,
+                "IT_0bi_tot": IT_0bi_tot,
+                "IT_0bi_bas": IT_0bi_bas,
+                "IV_0bi_bas": IV_0bi_bas,
+                "ZM_Net": ZM_Net,
+                "ZV_kpr_bas": ZV_kpr_bas,
+                "ZV_xpr_bas": ZV_xpr_bas,
+                "ZM_C1p": ZM_C1p,
+                "ZM_C2p": ZM_C2p,
+                "ZM_C3p": ZM_C3p,
+                "ZM_ICN": ZM_ICN,
+                "ZM_Qex": ZM_Qex,
+                "ZM_Qou": ZM_Qou,
+                "ZV_lon_tot": ZV_lon_tot,
+                "ZV_lat_tot": ZV_lat_tot,
+                "IV_tim_all": IV_tim_all,
+                "IM_tim_all": IM_tim_all,
+            }
+            if Qup_ncf is not None:
+                AT_mem["ZM_Ups"] = ZM_Ups
+
+            if BS_rss_phs:
+                print("Peak resident memory during each phase (MiB):")
+            else:
+                print(
+                    "Peak resident memory since start, after each phase (MiB):"
+                )
+            for AT in AT_phs:
+                ZS_rss = int(AT["phase_peak_rss_B"]) / 2**20
+                print(f" - {AT['phase']:<16}{ZS_rss:>12.1f}")
+            print("Size of main arrays and matrices (MiB):")
+            for YS_nam, IS_byt in sorted(
+                ((YS_nam, _nbytes(obj)) for YS_nam, obj in AT_mem.items()),
+                key=lambda AT: -AT[1],
+            ):
+                print(f" - {YS_nam:<16}{IS_byt / 2**20:>12.3f}")
 
         # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
         # Done
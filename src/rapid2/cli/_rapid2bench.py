@@ -0,0 +1,785 @@
+#!/usr/bin/env python3
+# *****************************************************************************
+# _rapid2bench.py
+# *****************************************************************************
+
+# Author:
+# Cedric H. David, 2026-2026
+
+
+# *****************************************************************************
+# Import Python modules
+# *****************************************************************************
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+from typing import Any, Callable
+
+import netCDF4
+import numpy as np
+import numpy.typing as npt
+import pyarrow as pa
+import pyarrow.parquet as pq
+import scipy
+import yaml
+from scipy.sparse import identity
+from scipy.sparse.linalg import spsolve_triangular
+from tqdm import tqdm
+
+from rapid2 import (
+    __version__,
+    calc_scl_vec,
+    chck_bas,
+    make_0bi_tbl,
+    make_CCC_mat,
+    make_dwn_vec,
+    make_Mus_mat,
+    make_Net_mat,
+    make_Sel_mat,
+    make_Wdw_mat,
+    prep_Qex_ncf,
+    prep_Qfi_ncf,
+    read_nml_tbl,
+    read_riv_vec,
+    updt_Mus_Qou,
+)
+
+# Maximum number of upstream reaches of each reach for each tree shape
+IT_brn_shp = {"chain": 1, "binary": 2, "bushy": 8}
+
+
+# *****************************************************************************
+# Timing
+# *****************************************************************************
+def _time_fun(fun: Callable[[], Any], IS_rep: int) -> dict[str, Any]:
+    """Time IS_rep batches of calls of fun, then trace the memory of one call.
+
+    One untimed call warms up caches first. Each batch holds the number of
+    calls that timeit.Timer.autorange finds to last at least 0.2 s, so that
+    the resolution of the clock and short interruptions are amortized, and
+    the time per call of each batch is kept. Garbage collection is paused
+    while memory is traced, so that the peak does not depend on when cycles
+    are collected. Only allocations made through Python and NumPy are traced,
+    which leaves out those of compiled solvers such as SuperLU.
+    """
+    fun()
+    timer = timeit.Timer(fun)
+    IS_num, _ = timer.autorange()
+    ZV_clk = np.array(timer.repeat(repeat=IS_rep, number=IS_num)) / IS_num
+
+    gc.collect()
+    gc.disable()
+    tracemalloc.start()
+    fun()
+    _, IS_byt = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    gc.enable()
+
+    return {
+        "number": IS_num,
+        "wall_s": ZV_clk.tolist(),
+        "median_s": float(np.median(ZV_clk)),
+        "peak_B": int(IS_byt),
+    }
+
+
+# *****************************************************************************
+# Core functions
+# *****************************************************************************
+def _make_fun_tbl(
+    IV_riv_tot: npt.NDArray[np.int32],
+    IV_dwn_tot: npt.NDArray[np.int32],
+    IS_wmx: int,
+) -> dict[str, Callable[[], Any]]:
+    """Prepare the inputs of each benchmarked core function for a network.
+
+    The basin is the whole domain, parameters are uniform, and ten gauges
+    observe a fifth more than the steady state of a unit external inflow.
+    """
+    IS_riv_tot = len(IV_riv_tot)
+    IV_riv_bas = IV_riv_tot
+    IT_0bi_tot, IT_0bi_bas, _ = make_0bi_tbl(IV_riv_tot, IV_riv_bas)
+    ZM_Net = make_Net_mat(IV_dwn_tot, IT_0bi_tot, IV_riv_bas, IT_0bi_bas)
+
+    ZV_kpr_bas = np.full(IS_riv_tot, 9000, dtype=np.float64)
+    ZV_xpr_bas = np.full(IS_riv_tot, 0.3, dtype=np.float64)
+    ZM_C1p, ZM_C2p, ZM_C3p = make_CCC_mat(
+        ZV_kpr_bas, ZV_xpr_bas, np.int32(900)
+    )
+    ZM_ICN, ZM_Qex, ZM_Qou = make_Mus_mat(ZM_Net, ZM_C1p, ZM_C2p, ZM_C3p)
+
+    ZV_Qex_avg = np.ones(IS_riv_tot, dtype=np.float64)
+    ZV_Qou_prv = np.zeros(IS_riv_tot, dtype=np.float64)
+
+    IV_riv_act = np.unique(
+        IV_riv_bas[np.linspace(0, IS_riv_tot - 1, 10).astype(int)]
+    )
+    ZM_Sel = make_Sel_mat(IV_riv_act, IT_0bi_bas)
+    ZM_ImN = identity(IS_riv_tot, format="csr") - ZM_Net.tocsr()
+    ZV_Qob_avg = 1.2 * (
+        ZM_Sel @ spsolve_triangular(ZM_ImN, ZV_Qex_avg, lower=True)
+    )
+
+    AT_fun: dict[str, Callable[[], Any]] = {
+        "make_0bi_tbl": lambda: make_0bi_tbl(IV_riv_tot, IV_riv_bas),
+        "make_Net_mat": lambda: make_Net_mat(
+            IV_dwn_tot, IT_0bi_tot, IV_riv_bas, IT_0bi_bas
+        ),
+        "make_Mus_mat": lambda: make_Mus_mat(ZM_Net, ZM_C1p, ZM_C2p, ZM_C3p),
+        "updt_Mus_Qou": lambda: updt_Mus_Qou(
+            ZM_ICN, ZM_Qex, ZM_Qou, 12, ZV_Qou_prv, ZV_Qex_avg
+        ),
+        "calc_scl_vec": lambda: calc_scl_vec(
+            ZM_Net, ZM_Sel, ZV_Qex_avg, ZV_Qob_avg
+        ),
+        "chck_bas": lambda: chck_bas(
+            IV_riv_bas, IT_0bi_bas, IV_riv_tot, IV_dwn_tot, IT_0bi_tot
+        ),
+    }
+    # make_Wdw_mat solves with sparse right-hand sides of the basin size
+    if IS_riv_tot <= IS_wmx:
+        AT_fun["make_Wdw_mat"] = lambda: make_Wdw_mat(
+            ZM_ICN, ZM_Qex, ZM_Qou, np.int32(8)
+        )
+
+    return AT_fun
+
+
+# *****************************************************************************
+# Synthetic input files
+# *****************************************************************************
+def _prep_syn_nml(
+    YS_dir: str,
+    IV_riv_tot: npt.NDArray[np.int32],
+    IV_dwn_tot: npt.NDArray[np.int32],
+    IS_tim_all: int,
+) -> str:
+    """Write the input files and namelist of a synthetic rapid2 run.
+
+    The basin is the whole domain, parameters are uniform, the initial
+    outflow is zero, and the external inflow is one everywhere.
+    """
+    IS_riv_tot = len(IV_riv_tot)
+    AT_nml: dict[str, Any] = {
+        "Q00_ncf": os.path.join(YS_dir, "Q00.nc4"),
+        "Qex_ncf": os.path.join(YS_dir, "Qex.nc4"),
+        "con_pqt": os.path.join(YS_dir, "con.parquet"),
+        "kpr_pqt": os.path.join(YS_dir, "kpr.parquet"),
+        "xpr_pqt": os.path.join(YS_dir, "xpr.parquet"),
+        "bas_pqt": os.path.join(YS_dir, "bas.parquet"),
+        "IS_dtR": 900,
+        "Qou_ncf": os.path.join(YS_dir, "Qou.nc4"),
+        "Qfi_ncf": os.path.join(YS_dir, "Qfi.nc4"),
+    }
+
+    # -------------------------------------------------------------------------
+    # Parquet files
+    # -------------------------------------------------------------------------
+    AT_pqt = {
+        "con_pqt": {"riv": IV_riv_tot, "dwn": IV_dwn_tot},
+        "bas_pqt": {"riv": IV_riv_tot},
+        "kpr_pqt": {
+            "riv": IV_riv_tot,
+            "kpr": np.full(IS_riv_tot, 9000, dtype=np.float64),
+        },
+        "xpr_pqt": {
+            "riv": IV_riv_tot,
+            "xpr": np.full(IS_riv_tot, 0.3, dtype=np.float64),
+        },
+    }
+    for YS_key, AT_col in AT_pqt.items():
+        table = pa.table(AT_col)
+        schema = pa.schema(
+            [field.with_nullable(False) for field in table.schema]
+        )
+        pq.write_table(table.cast(schema), AT_nml[YS_key])
+
+    # -------------------------------------------------------------------------
+    # NetCDF files
+    # -------------------------------------------------------------------------
+    ZV_lon_tot = np.zeros(IS_riv_tot, dtype=np.float64)
+    ZV_lat_tot = np.zeros(IS_riv_tot, dtype=np.float64)
+
+    prep_Qex_ncf(IV_riv_tot, ZV_lon_tot, ZV_lat_tot, AT_nml["Qex_ncf"])
+    f = netCDF4.Dataset(AT_nml["Qex_ncf"], "a")
+    IV_tim_all = np.arange(IS_tim_all, dtype=np.int32) * np.int32(10800)
+    f.variables["time"][:] = IV_tim_all
+    f.variables["time_bnds"][:, 0] = IV_tim_all
+    f.variables["time_bnds"][:, 1] = IV_tim_all + np.int32(10800)
+    ZV_Qex_avg = np.ones(IS_riv_tot, dtype=np.float32)
+    for JS_tim_all in range(IS_tim_all):
+        f.variables["Qext"][JS_tim_all, :] = ZV_Qex_avg
+    f.title = "Synthetic benchmark for RAPID2"
+    f.institution = "None"
+    f.close()
+
+    prep_Qfi_ncf(IV_riv_tot, ZV_lon_tot, ZV_lat_tot, AT_nml["Q00_ncf"])
+    e = netCDF4.Dataset(AT_nml["Q00_ncf"], "a")
+    e.variables["time"][0] = 0
+    e.variables["Qout"][0, :] = 0
+    e.close()
+
+    # -------------------------------------------------------------------------
+    # Namelist
+    # -------------------------------------------------------------------------
+    nml_yml = os.path.join(YS_dir, "nml.yml")
+    with open(nml_yml, "w") as yml:
+        for YS_key, val in AT_nml.items():
+            yml.write(f"{YS_key}: {val!r}\n")
+
+    return nml_yml
+
+
+# *****************************************************************************
+# Copy of an existing namelist
+# *****************************************************************************
+def _copy_nml(nml_yml: str, YS_dir: str) -> str:
+    """Write a copy of a namelist whose outputs are in YS_dir.
+
+    Inputs are left as they are, so relative paths still resolve from the
+    current directory, while Qou_ncf and Qfi_ncf are moved to YS_dir so that
+    the outputs of the namelist are not overwritten by the benchmark.
+    """
+    with open(nml_yml) as yml:
+        AT_nml: dict[str, Any] = yaml.safe_load(yml)
+
+    AT_nml["Qou_ncf"] = os.path.join(YS_dir, "Qou.nc4")
+    AT_nml["Qfi_ncf"] = os.path.join(YS_dir, "Qfi.nc4")
+
+    nml_tmp = os.path.join(YS_dir, "nml.yml")
+    with open(nml_tmp, "w") as yml:
+        yaml.safe_dump(AT_nml, yml)
+
+    return nml_tmp
+
+
+# *****************************************************************************
+# Full runs
+# *****************************************************************************
+def _time_nml(nml_yml: str, IS_rep: int, YS_tmp: str) -> dict[str, Any]:
+    """Time IS_rep full rapid2 runs of a namelist, each in a new process.
+
+    One untimed run warms up the file system cache first. The peak memory is
+    the largest one reported by rapid2 --profile, and the phases are those
+    of the last run.
+    """
+    prf_jsn = os.path.join(YS_tmp, "prf.json")
+    YV_cmd = [
+        sys.executable,
+        "-m",
+        "rapid2.cli._rapid2",
+        "-nml",
+        nml_yml,
+        "-prf",
+        prf_jsn,
+    ]
+    subprocess.run(YV_cmd, check=True, capture_output=True)
+
+    ZV_clk = np.zeros(IS_rep, dtype=np.float64)
+    IS_byt = 0
+    for JS_rep in tqdm(range(IS_rep), desc="Timing rapid2"):
+        ZS_clk = time.perf_counter()
+        subprocess.run(YV_cmd, check=True, capture_output=True)
+        ZV_clk[JS_rep] = time.perf_counter() - ZS_clk
+
+        with open(prf_jsn) as jsn:
+            AT_prf = json.load(jsn)
+        IS_byt = max(
+            IS_byt, max(AT["phase_peak_rss_B"] for AT in AT_prf["phases"])
+        )
+
+    return {
+        "IS_tim_all": AT_prf["IS_tim_all"],
+        "wall_s": ZV_clk.tolist(),
+        "median_s": float(np.median(ZV_clk)),
+        "peak_B": IS_byt,
+        "phases": AT_prf["phases"],
+    }
+
+
+# *****************************************************************************
+# Benchmark set
+# *****************************************************************************
+def _run_bch(AT_cfg: dict[str, Any], YS_dir: str | None) -> dict[str, Any]:
+    """Run the benchmark set described by AT_cfg and return its results."""
+    IS_rep = AT_cfg["repeats"]
+    if IS_rep < 1:
+        raise ValueError("The number of repeats must be at least 1")
+
+    AT_res: list[dict[str, Any]] = []
+
+    # -------------------------------------------------------------------------
+    # Synthetic river networks
+    # -------------------------------------------------------------------------
+    for YS_shp in AT_cfg["shapes"]:
+        for IS_riv_tot in AT_cfg["sizes"]:
+            AT_cas = {"shape": YS_shp, "IS_riv_tot": IS_riv_tot}
+            print(f"- Benchmark {YS_shp} of {IS_riv_tot} reaches")
+
+            IV_riv_tot, IV_dwn_tot = make_dwn_vec(
+                IS_riv_tot, IT_brn_shp[YS_shp]
+            )
+
+            AT_fun = _make_fun_tbl(
+                IV_riv_tot, IV_dwn_tot, AT_cfg["window_max"]
+            )
+            for YS_fun, fun in tqdm(
+                AT_fun.items(), desc="Timing core functions"
+            ):
+                AT_res.append(
+                    {"name": YS_fun, **AT_cas, **_time_fun(fun, IS_rep)}
+                )
+
+            if AT_cfg["kernels_only"]:
+                continue
+
+            with tempfile.TemporaryDirectory(dir=YS_dir) as YS_tmp:
+                nml_yml = _prep_syn_nml(
+                    YS_tmp, IV_riv_tot, IV_dwn_tot, AT_cfg["time_steps"]
+                )
+                AT_res.append(
+                    {
+                        "name": "rapid2",
+                        **AT_cas,
+                        **_time_nml(nml_yml, IS_rep, YS_tmp),
+                    }
+                )
+
+    # -------------------------------------------------------------------------
+    # Existing namelists, e.g., the Sandbox of TESTING.md
+    # -------------------------------------------------------------------------
+    for nml_yml in AT_cfg["namelists"]:
+        print(f"- Benchmark {nml_yml}")
+        AT_nml = read_nml_tbl(nml_yml)
+        IS_riv_bas = len(read_riv_vec(AT_nml["bas_pqt"]))
+        with tempfile.TemporaryDirectory(dir=YS_dir) as YS_tmp:
+            nml_tmp = _copy_nml(nml_yml, YS_tmp)
+            AT_res.append(
+                {
+                    "name": "rapid2",
+                    "shape": nml_yml,
+                    "IS_riv_tot": IS_riv_bas,
+                    **_time_nml(nml_tmp, IS_rep, YS_tmp),
+                }
+            )
+
+    # -------------------------------------------------------------------------
+    # Results along with what is needed to compare them
+    # -------------------------------------------------------------------------
+    try:
+        YS_cmt = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        YS_cmt = "unknown"
+
+    return {
+        "rapid2": __version__,
+        "commit": YS_cmt,
+        "date": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "machine": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "config": AT_cfg,
+        "results": AT_res,
+    }
+
+
+# *****************************************************************************
+# Comparison
+# *****************************************************************************
+def _comp_bch(
+    AT_bas: dict[str, Any],
+    AT_now: dict[str, Any],
+    ZS_thr: float,
+    ZS_mth: float,
+    ZS_cfd: float,
+    ZS_flr: float,
+) -> bool:
+    """Print a table comparing two benchmark sets and return if regressed.
+
+    For each case, the ratio of the medians of wall time is bracketed by a
+    bootstrap confidence interval over repeats. A case regresses if the lower
+    bound of the interval exceeds ZS_thr and its median grew by more than
+    ZS_flr seconds, so that noise alone is unlikely to flag it, or if its
+    ratio of peak memory exceeds ZS_mth and it grew by more than 1 MiB.
+    """
+    rng = np.random.default_rng(0)
+    IS_bot = 2000
+    ZS_alp = (1 - ZS_cfd) / 2
+
+    AT_cas_bas = {
+        (AT["name"], AT["shape"], AT["IS_riv_tot"]): AT
+        for AT in AT_bas["results"]
+    }
+
+    print(
+        f"{'case':<48}{'base_s':>10}{'now_s':>10}{'ratio':>8}"
+        f"{'interval':>16}{'mem':>7}  status"
+    )
+    BS_reg = False
+    for AT in AT_now["results"]:
+        YV_key = (AT["name"], AT["shape"], AT["IS_riv_tot"])
+        YS_cas = f"{AT['name']} {AT['shape']} {AT['IS_riv_tot']}"
+        if YV_key not in AT_cas_bas:
+            print(f"{YS_cas:<48}{'':>10}{AT['median_s']:>10.4f}  new")
+            continue
+
+        ZV_bas = np.array(AT_cas_bas[YV_key]["wall_s"])
+        ZV_now = np.array(AT["wall_s"])
+        ZS_rat = AT["median_s"] / AT_cas_bas[YV_key]["median_s"]
+
+        ZV_rat_bot = np.median(
+            rng.choice(ZV_now, (IS_bot, len(ZV_now))), axis=1
+        ) / np.median(rng.choice(ZV_bas, (IS_bot, len(ZV_bas))), axis=1)
+        ZS_rat_low, ZS_rat_upp = np.quantile(ZV_rat_bot, [ZS_alp, 1 - ZS_alp])
+
+        ZS_mem = AT["peak_B"] / max(AT_cas_bas[YV_key]["peak_B"], 1)
+
+        YS_sta = "ok"
+        ZS_dif = AT["median_s"] - AT_cas_bas[YV_key]["median_s"]
+        if ZS_rat_low > ZS_thr and ZS_dif > ZS_flr:
+            YS_sta = "SLOWER"
+        IS_mem_dif = AT["peak_B"] - AT_cas_bas[YV_key]["peak_B"]
+        if ZS_mem > ZS_mth and IS_mem_dif > 2**20:
+            YS_sta = "MEMORY" if YS_sta == "ok" else f"{YS_sta}+MEMORY"
+        if YS_sta != "ok":
+            BS_reg = True
+
+        YS_itv = f"[{ZS_rat_low:.2f}, {ZS_rat_upp:.2f}]"
+        print(
+            f"{YS_cas:<48}{AT_cas_bas[YV_key]['median_s']:>10.4f}"
+            f"{AT['median_s']:>10.4f}{ZS_rat:>8.2f}{YS_itv:>16}"
+            f"{ZS_mem:>7.2f}  {YS_sta}"
+        )
+
+    return BS_reg
+
+
+# *****************************************************************************
+# Main
+# *****************************************************************************
+def main() -> None:
+    # -------------------------------------------------------------------------
+    # Initialize the argument parser and add valid arguments
+    # -------------------------------------------------------------------------
+    parser = argparse.ArgumentParser(
+        description=(
+            "Benchmark the core functions and full runs of RAPID2 on "
+            "synthetic river networks of several sizes and shapes, and "
+            "compare against a baseline."
+        ),
+        epilog=(
+            "examples:\n"
+            "  rapid2bench run --output bench.json\n"
+            "  rapid2bench run --sizes 1e3 1e5 1e7 --shapes chain bushy "
+            "--namelists input/Sandbox/nml_Sandbox_TR.yml "
+            "--output bench.json\n"
+            "  rapid2bench compare --baseline bench.json --threshold 1.5\n"
+            "\n"
+            "shapes: chain (1 upstream reach), binary (2), and bushy (8).\n"
+            "compare reruns the benchmark set of the baseline and exits with "
+            "status 1 if any\ncase regressed."
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+
+    parser.add_argument(
+        "--version", action="version", version=f"rapid2 {__version__}"
+    )
+
+    subparsers = parser.add_subparsers(dest="cmd", required=True)
+
+    # -------------------------------------------------------------------------
+    # Run subcommand
+    # -------------------------------------------------------------------------
+    run_parser = subparsers.add_parser(
+        "run", help="run the benchmarks and write the results as JSON"
+    )
+    run_parser.add_argument(
+        "-siz",
+        "--sizes",
+        dest="siz",
+        metavar="SIZE",
+        type=lambda YS_siz: int(float(YS_siz)),
+        nargs="+",
+        default=[1000, 10000, 100000],
+        help="specify the numbers of reaches (default: 1e3 1e4 1e5)",
+    )
+
+    run_parser.add_argument(
+        "-shp",
+        "--shapes",
+        dest="shp",
+        metavar="SHAPE",
+        type=str,
+        nargs="+",
+        choices=list(IT_brn_shp),
+        default=["chain", "bushy"],
+        help="specify the tree shapes (default: chain bushy)",
+    )
+
+    run_parser.add_argument(
+        "-rep",
+        "--repeats",
+        dest="rep",
+        metavar="REPEATS",
+        type=int,
+        default=5,
+        help="specify the number of timed repeats (default: 5)",
+    )
+
+    run_parser.add_argument(
+        "-tim",
+        "--time_steps",
+        dest="tim",
+        metavar="TIME_STEPS",
+        type=int,
+        default=8,
+        help="specify the number of 3-hourly steps of full runs (default: 8)",
+    )
+
+    run_parser.add_argument(
+        "-wmx",
+        "--window_max",
+        dest="wmx",
+        metavar="WINDOW_MAX",
+        type=lambda YS_siz: int(float(YS_siz)),
+        default=1000,
+        help=(
+            "specify the largest size for make_Wdw_mat, which solves with "
+            "sparse right-hand sides of the size of the basin (default: 1e3)"
+        ),
+    )
+
+    run_parser.add_argument(
+        "-krn",
+        "--kernels_only",
+        dest="krn",
+        action="store_true",
+        help="skip the full rapid2 runs",
+    )
+
+    run_parser.add_argument(
+        "-nml",
+        "--namelists",
+        dest="nml",
+        metavar="NAMELIST",
+        type=str,
+        nargs="+",
+        default=[],
+        help="specify namelists of full runs to time as well",
+    )
+
+    # -------------------------------------------------------------------------
+    # Compare subcommand
+    # -------------------------------------------------------------------------
+    cmp_parser = subparsers.add_parser(
+        "compare",
+        help="rerun the benchmarks of a baseline and compare the results",
+    )
+
+    cmp_parser.add_argument(
+        "-bas",
+        "--baseline",
+        dest="bas",
+        metavar="BASELINE",
+        type=str,
+        required=True,
+        help="specify the baseline JSON file written by rapid2bench run",
+    )
+
+    cmp_parser.add_argument(
+        "-rep",
+        "--repeats",
+        dest="rep",
+        metavar="REPEATS",
+        type=int,
+        default=None,
+        help="specify the number of timed repeats (default: as baseline)",
+    )
+
+    cmp_parser.add_argument(
+        "-thr",
+        "--threshold",
+        dest="thr",
+        metavar="THRESHOLD",
+        type=float,
+        default=1.5,
+        help=(
+            "specify the ratio of wall time that the lower bound of its "
+            "confidence interval must exceed to fail (default: 1.5)"
+        ),
+    )
+
+    cmp_parser.add_argument(
+        "-mth",
+        "--memory_threshold",
+        dest="mth",
+        metavar="MEMORY_THRESHOLD",
+        type=float,
+        default=1.5,
+        help="specify the ratio of peak memory to fail (default: 1.5)",
+    )
+
+    cmp_parser.add_argument(
+        "-cfd",
+        "--confidence",
+        dest="cfd",
+        metavar="CONFIDENCE",
+        type=float,
+        default=0.95,
+        help="specify the level of confidence intervals (default: 0.95)",
+    )
+
+    cmp_parser.add_argument(
+        "-flr",
+        "--noise_floor",
+        dest="flr",
+        metavar="NOISE_FLOOR",
+        type=float,
+        default=1e-3,
+        help=(
+            "specify the increase of median wall time in seconds below which "
+            "a case is not slower (default: 1e-3)"
+        ),
+    )
+
+    cmp_parser.add_argument(
+        "-rmn",
+        "--min_repeats",
+        dest="rmn",
+        metavar="MIN_REPEATS",
+        type=int,
+        default=5,
+        help=(
+            "specify the number of repeats that both the baseline and the "
+            "rerun need for a comparison (default: 5)"
+        ),
+    )
+
+    for sub_parser in (run_parser, cmp_parser):
+        sub_parser.add_argument(
+            "-dir",
+            "--directory",
+            dest="dir",
+            metavar="DIRECTORY",
+            type=str,
+            default=None,
+            help="specify where to write temporary inputs of full runs",
+        )
+
+        sub_parser.add_argument(
+            "-out",
+            "--output",
+            dest="out",
+            metavar="OUTPUT",
+            type=str,
+            required=sub_parser is run_parser,
+            help="specify the output JSON file",
+        )
+
+    # -------------------------------------------------------------------------
+    # Parse arguments and assign to variables
+    # -------------------------------------------------------------------------
+    args = parser.parse_args()
+
+    YS_cmd = args.cmd
+    YS_dir = args.dir
+    out_jsn = args.out
+
+    print("Creating (from/to):")
+    if YS_cmd == "compare":
+        print(f" - {args.bas}")
+    else:
+        print(f" - sizes {args.siz}, shapes {args.shp}")
+    print(f" - {out_jsn}")
+
+    # -------------------------------------------------------------------------
+    # Skip if file already exists
+    # -------------------------------------------------------------------------
+    if out_jsn is not None and os.path.isfile(out_jsn):
+        print(f"WARNING - File already exists {out_jsn}. Skipping.")
+        sys.exit(0)
+
+    # -------------------------------------------------------------------------
+    # Execute main logic
+    # -------------------------------------------------------------------------
+    try:
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Benchmark set, from arguments or from the baseline
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        if YS_cmd == "compare":
+            with open(args.bas) as jsn:
+                AT_bas = json.load(jsn)
+            AT_cfg = dict(AT_bas["config"])
+            if args.rep is not None:
+                AT_cfg["repeats"] = args.rep
+            # Bootstrap intervals over fewer repeats do not bound the noise
+            IS_rep_min = min(AT_bas["config"]["repeats"], AT_cfg["repeats"])
+            if IS_rep_min < args.rmn:
+                raise ValueError(
+                    f"Comparisons need at least {args.rmn} repeats, got "
+                    f"{IS_rep_min}"
+                )
+        else:
+            AT_cfg = {
+                "sizes": args.siz,
+                "shapes": args.shp,
+                "repeats": args.rep,
+                "time_steps": args.tim,
+                "window_max": args.wmx,
+                "kernels_only": args.krn,
+                "namelists": args.nml,
+            }
+
+        AT_bch = _run_bch(AT_cfg, YS_dir)
+
+        if out_jsn is not None:
+            with open(out_jsn, "w") as jsn:
+                json.dump(AT_bch, jsn, indent=2)
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Comparison with the baseline
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        if YS_cmd == "compare":
+            print(f"Baseline commit {AT_bas['commit']}")
+            print(f"Current commit  {AT_bch['commit']}")
+            if _comp_bch(
+                AT_bas, AT_bch, args.thr, args.mth, args.cfd, args.flr
+            ):
+                print("ERROR - Performance regressed", file=sys.stderr)
+                sys.exit(1)
+
+        print("Done")
+
+    except (IOError, ValueError, KeyError, subprocess.CalledProcessError) as e:
+        print(f"ERROR - {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+# *****************************************************************************
+# If executed as a script
+# *****************************************************************************
+if __name__ == "__main__":
+    main()
+
+
+# *****************************************************************************
+# End
+# *****************************************************************************
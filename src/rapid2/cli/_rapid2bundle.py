@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# *****************************************************************************
+# _rapid2bundle.py
+# *****************************************************************************
+
+# Author:
+# Cedric H. David, 2026-2026
+
+
+# *****************************************************************************
+# Import Python modules
+# *****************************************************************************
+import argparse
+import os
+import sys
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from rapid2 import (
+    __version__,
+    make_0bi_tbl,
+    prep_bdl_arw,
+    read_con_vec,
+    read_cpl_vec,
+    read_crd_vec,
+    read_kpr_vec,
+    read_riv_vec,
+    read_xpr_vec,
+)
+
+
+# *****************************************************************************
+# Main
+# *****************************************************************************
+def main() -> None:
+
+    # -------------------------------------------------------------------------
+    # Initialize the argument parser and add valid arguments
+    # -------------------------------------------------------------------------
+    parser = argparse.ArgumentParser(
+        description=(
+            "Bundle the network files of a domain into one memory-mappable "
+            "Arrow IPC file"
+        ),
+        epilog=(
+            "examples:\n"
+            "  rapid2bundle "
+            "--connectivity input/Sandbox/con_Sandbox.parquet "
+            "--basin input/Sandbox/bas_Sandbox_ascend.parquet "
+            "--k_parameter input/Sandbox/kpr_Sandbox.parquet "
+            "--x_parameter input/Sandbox/xpr_Sandbox.parquet "
+            "--bundle input/Sandbox/bdl_Sandbox.arrow\n"
+            "\n"
+            "The bundle can replace con_pqt, bas_pqt, kpr_pqt, xpr_pqt, "
+            "crd_pqt, and cpl_pqt\nin namelists, for the files it was made "
+            "from."
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+
+    parser.add_argument(
+        "--version", action="version", version=f"rapid2 {__version__}"
+    )
+
+    parser.add_argument(
+        "-con",
+        "--connectivity",
+        dest="con",
+        metavar="CONNECTIVITY",
+        type=str,
+        required=True,
+        help="specify the input con_pqt file",
+    )
+
+    parser.add_argument(
+        "-bas",
+        "--basin",
+        dest="bas",
+        metavar="BASIN",
+        type=str,
+        required=False,
+        help="specify the input bas_pqt file",
+    )
+
+    parser.add_argument(
+        "-kpr",
+        "--k_parameter",
+        dest="kpr",
+        metavar="K_PARAMETER",
+        type=str,
+        required=False,
+        help="specify the input kpr_pqt file",
+    )
+
+    parser.add_argument(
+        "-xpr",
+        "--x_parameter",
+        dest="xpr",
+        metavar="X_PARAMETER",
+        type=str,
+        required=False,
+        help="specify the input xpr_pqt file",
+    )
+
+    parser.add_argument(
+        "-crd",
+        "--coordinates",
+        dest="crd",
+        metavar="COORDINATES",
+        type=str,
+        required=False,
+        help="specify the input crd_pqt file",
+    )
+
+    parser.add_argument(
+        "-cpl",
+        "--coupling",
+        dest="cpl",
+        metavar="COUPLING",
+        type=str,
+        required=False,
+        help="specify the input cpl_pqt file",
+    )
+
+    parser.add_argument(
+        "-bdl",
+        "--bundle",
+        dest="bdl",
+        metavar="BUNDLE",
+        type=str,
+        required=True,
+        help="specify the output bdl_arw file",
+    )
+
+    # -------------------------------------------------------------------------
+    # Parse arguments and assign to variables
+    # -------------------------------------------------------------------------
+    args = parser.parse_args()
+
+    con_pqt = args.con
+    bas_pqt = args.bas
+    kpr_pqt = args.kpr
+    xpr_pqt = args.xpr
+    crd_pqt = args.crd
+    cpl_pqt = args.cpl
+    bdl_arw = args.bdl
+
+    print("Bundling (from/to):")
+    for pqt in (con_pqt, bas_pqt, kpr_pqt, xpr_pqt, crd_pqt, cpl_pqt):
+        if pqt is not None:
+            print(f" - {pqt}")
+    print(f" - {bdl_arw}")
+
+    # -------------------------------------------------------------------------
+    # Skip if file already exists
+    # -------------------------------------------------------------------------
+    if os.path.isfile(bdl_arw):
+        print(f"WARNING - File already exists {bdl_arw}. Skipping.")
+        sys.exit(0)
+
+    # -------------------------------------------------------------------------
+    # Execute main logic
+    # -------------------------------------------------------------------------
+    try:
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Connectivity (mandatory), its river IDs order all columns
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        IV_riv_tot, IV_dwn_tot = read_con_vec(con_pqt)
+        IV_0bi_tot = np.arange(len(IV_riv_tot), dtype=np.int32)
+
+        AT_col: dict[str, npt.NDArray[Any]] = {
+            "riv": IV_riv_tot,
+            "dwn": IV_dwn_tot,
+        }
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Basin (optional), as the index of each river ID in basin or -1
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        if bas_pqt is not None:
+            IV_riv_bas = read_riv_vec(bas_pqt)
+            if not np.isin(IV_riv_bas, IV_riv_tot).all():
+                raise ValueError(
+                    f"River IDs in {bas_pqt} missing in {con_pqt}"
+                )
+            _, _, IV_0bi_bas = make_0bi_tbl(IV_riv_tot, IV_riv_bas)
+            IV_bas_tot = np.full(len(IV_riv_tot), -1, dtype=np.int32)
+            IV_bas_tot[IV_0bi_bas] = np.arange(len(IV_riv_bas))
+            AT_col["bas"] = IV_bas_tot
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Parameters (optional), read by river ID in the order of con
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        if kpr_pqt is not None:
+            IV_riv_tmp, AT_col["kpr"] = read_kpr_vec(
+                kpr_pqt, IV_0bi_tot, IV_riv_tot
+            )
+            if not np.array_equal(IV_riv_tmp, IV_riv_tot):
+                raise ValueError(f"River IDs in {kpr_pqt} differ from con")
+
+        if xpr_pqt is not None:
+            IV_riv_tmp, AT_col["xpr"] = read_xpr_vec(
+                xpr_pqt, IV_0bi_tot, IV_riv_tot
+            )
+            if not np.array_equal(IV_riv_tmp, IV_riv_tot):
+                raise ValueError(f"River IDs in {xpr_pqt} differ from con")
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Coordinates and coupling (optional), aligned with con
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        if crd_pqt is not None:
+            IV_riv_tmp, AT_col["lon"], AT_col["lat"] = read_crd_vec(crd_pqt)
+            if not np.array_equal(IV_riv_tmp, IV_riv_tot):
+                raise ValueError(f"River IDs in {crd_pqt} differ from con")
+
+        if cpl_pqt is not None:
+            (
+                IV_riv_tmp,
+                AT_col["skm"],
+                AT_col["1bi"],
+                AT_col["1bj"],
+            ) = read_cpl_vec(cpl_pqt)
+            if not np.array_equal(IV_riv_tmp, IV_riv_tot):
+                raise ValueError(f"River IDs in {cpl_pqt} differ from con")
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Write bundle
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        prep_bdl_arw(AT_col, bdl_arw)
+        print(
+            f"  . Bundled {len(AT_col)} columns of {len(IV_riv_tot)} reaches"
+        )
+
+    except (IOError, ValueError, KeyError) as e:
+        print(f"ERROR - {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+# *****************************************************************************
+# If executed as a script
+# *****************************************************************************
+if __name__ == "__main__":
+    main()
+
+
+# *****************************************************************************
+# End
+# *****************************************************************************
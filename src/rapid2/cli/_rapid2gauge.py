@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+# *****************************************************************************
+# _rapid2gauge.py
+# *****************************************************************************
+
+# Author:
+# Cedric H. David, 2026-2026
+
+
+# *****************************************************************************
+# Import Python modules
+# *****************************************************************************
+import argparse
+import glob
+import hashlib
+import os
+import sys
+
+import netCDF4
+import numpy as np
+from tqdm import tqdm
+
+from rapid2 import (
+    __version__,
+    calc_Qme_mat,
+    make_0bi_tbl,
+    make_Krn_mat,
+    make_slb_tbl,
+    prep_Qou_ncf,
+    read_Mus_mat,
+    read_Net_mat,
+    read_nml_tbl,
+    read_riv_vec,
+    read_slb_mat,
+    read_std_vec,
+)
+
+
+# *****************************************************************************
+# Main
+# *****************************************************************************
+def main() -> None:
+
+    # -------------------------------------------------------------------------
+    # Initialize the argument parser and add valid arguments
+    # -------------------------------------------------------------------------
+    parser = argparse.ArgumentParser(
+        description=(
+            "Compute the outflow at gauges only, by convolution of the "
+            "external inflow with impulse-response kernels cached on disk."
+        ),
+        epilog=(
+            "examples:\n"
+            "  rapid2gauge "
+            "--namelist input/Sandbox/nml_Sandbox_TR.yml "
+            "--observations input/Sandbox/obs_Sandbox.parquet "
+            "--kernels output/Sandbox/krn_Sandbox.npz "
+            "--model_equivalent "
+            "output/Sandbox/Qme_Sandbox_19700101_19700110_KR.nc4\n"
+            "\n"
+            "The kernels depend on the network, the parameters, IS_dtR, the "
+            "time step of Qex_ncf\nand the gauges. They are computed and "
+            "saved when the kernel file is missing or\nwas made for other "
+            "inputs, and reused otherwise."
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+
+    parser.add_argument(
+        "--version", action="version", version=f"rapid2 {__version__}"
+    )
+
+    parser.add_argument(
+        "-nml",
+        "--namelist",
+        dest="nml",
+        metavar="NAMELIST",
+        type=str,
+        required=True,
+        help="specify the namelist file",
+    )
+
+    parser.add_argument(
+        "-obs",
+        "--observations",
+        dest="obs",
+        metavar="OBSERVATIONS",
+        type=str,
+        required=True,
+        help="specify the input obs_pqt file containing river IDs for gauges",
+    )
+
+    parser.add_argument(
+        "-krn",
+        "--kernels",
+        dest="krn",
+        metavar="KERNELS",
+        type=str,
+        required=True,
+        help="specify the kernel file (.npz) read if valid, written otherwise",
+    )
+
+    parser.add_argument(
+        "-Qme",
+        "--model_equivalent",
+        dest="Qme",
+        metavar="MODEL_EQUIVALENT",
+        type=str,
+        required=True,
+        help="specify the output Qme_ncf file",
+    )
+
+    parser.add_argument(
+        "-tol",
+        "--tolerance",
+        dest="tol",
+        metavar="TOLERANCE",
+        type=float,
+        default=1e-9,
+        help="specify the kernel truncation threshold (default: 1e-9)",
+    )
+
+    parser.add_argument(
+        "-lag",
+        "--max_lag",
+        dest="lag",
+        metavar="MAX_LAG",
+        type=int,
+        default=10000,
+        help="specify the maximum kernel length in steps (default: 10000)",
+    )
+
+    parser.add_argument(
+        "-blk",
+        "--block",
+        dest="blk",
+        metavar="BLOCK",
+        type=int,
+        default=100,
+        help=(
+            "specify the number of time steps read and convolved at once, "
+            "raised to the kernel length if shorter (default: 100)"
+        ),
+    )
+
+    # -------------------------------------------------------------------------
+    # Parse arguments and assign to variables
+    # -------------------------------------------------------------------------
+    args = parser.parse_args()
+
+    nml_yml = args.nml
+    obs_pqt = args.obs
+    krn_npz = args.krn
+    Qme_ncf = args.Qme
+    ZS_tol = args.tol
+    IS_lag_max = args.lag
+    IS_blk = args.blk
+
+    print(f"Namelist file: {nml_yml}")
+
+    # -------------------------------------------------------------------------
+    # Skip if file already exists
+    # -------------------------------------------------------------------------
+    if os.path.isfile(Qme_ncf):
+        print(f"WARNING - File already exists {Qme_ncf}. Skipping.")
+        sys.exit(0)
+
+    # -------------------------------------------------------------------------
+    # Execute main logic
+    # -------------------------------------------------------------------------
+    try:
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Read namelist into a dictionary and assign to local variables
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        AT_nml = read_nml_tbl(nml_yml)
+
+        Q00_ncf = AT_nml["Q00_ncf"]
+        Qex_ncf = AT_nml["Qex_ncf"]
+        # Consecutive files or patterns accepted by rapid2 are not supported
+        if not isinstance(Qex_ncf, str) or glob.has_magic(Qex_ncf):
+            raise ValueError("rapid2gauge requires a single file in Qex_ncf")
+
+        con_pqt = AT_nml["con_pqt"]
+        kpr_pqt = AT_nml["kpr_pqt"]
+        xpr_pqt = AT_nml["xpr_pqt"]
+
+        bas_pqt = AT_nml["bas_pqt"]
+
+        IS_dtR = AT_nml["IS_dtR"]
+
+        if "Qup_ncf" in AT_nml:
+            raise ValueError("Qup_ncf is not supported by rapid2gauge")
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # River network, model parameters, and gauges
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        print("- Process river network, parameters, and gauges")
+        IV_riv_tot, IV_riv_bas, IV_0bi_bas, ZM_Net = read_Net_mat(
+            con_pqt, bas_pqt
+        )
+        ZM_ICN, ZM_Qex, ZM_Qou = read_Mus_mat(
+            kpr_pqt, xpr_pqt, IV_riv_bas, IV_0bi_bas, ZM_Net, IS_dtR
+        )
+
+        IV_riv_gau = read_riv_vec(obs_pqt)
+        _, _, IV_0bi_gau = make_0bi_tbl(IV_riv_bas, IV_riv_gau)
+        print(f"  . Found {len(IV_riv_gau)} gauges")
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # External inflow metadata
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        (
+            IV_riv_tmp,
+            ZV_lon_tot,
+            ZV_lat_tot,
+            IV_tim_all,
+            IM_tim_all,
+        ) = read_std_vec(Qex_ncf)
+        np.testing.assert_array_equal(IV_riv_tot, IV_riv_tmp)
+
+        if IM_tim_all is None:
+            raise ValueError(f"time_bnds is missing in {Qex_ncf}")
+
+        IS_tim_all = len(IV_tim_all)
+        IS_dtE = IM_tim_all[0, 1] - IM_tim_all[0, 0]
+
+        if IS_dtE == 0:
+            raise ValueError("Values of time_bnds lead to IS_dtE = 0")
+
+        if IS_dtE % IS_dtR == 0:
+            IS_rat_Qex = int(IS_dtE // IS_dtR)
+        else:
+            raise ValueError("IS_dtE is not a multiple of IS_dtR")
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Kernels, reused when made from the same inputs
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        hsh = hashlib.sha256()
+        for ZM_tmp in (ZM_ICN, ZM_Qex, ZM_Qou):
+            hsh.update(ZM_tmp.indptr.tobytes())
+            hsh.update(ZM_tmp.indices.tobytes())
+            hsh.update(ZM_tmp.data.tobytes())
+        hsh.update(np.asarray(IV_0bi_gau, dtype=np.int64).tobytes())
+        # Only kernels that fell below the tolerance are made and saved
+        hsh.update(f"{IS_rat_Qex} {ZS_tol} {IS_lag_max} converged".encode())
+        YS_key = hsh.hexdigest()
+
+        BS_krn = False
+        if os.path.isfile(krn_npz):
+            with np.load(krn_npz) as AT_krn:
+                if str(AT_krn["YS_key"]) == YS_key:
+                    IV_0bi_ctb = AT_krn["IV_0bi_ctb"]
+                    IV_ptr_gau = AT_krn["IV_ptr_gau"]
+                    ZM_Krn_Qex = AT_krn["ZM_Krn_Qex"]
+                    ZM_Krn_Q00 = AT_krn["ZM_Krn_Q00"]
+                    BS_krn = True
+            if not BS_krn:
+                print(f"WARNING - Kernels in {krn_npz} are for other inputs")
+
+        if BS_krn:
+            print(f"- Reuse kernels from {krn_npz}")
+        else:
+            print("- Compute kernels")
+            IV_0bi_ctb, IV_ptr_gau, ZM_Krn_Qex, ZM_Krn_Q00 = make_Krn_mat(
+                ZM_ICN,
+                ZM_Qex,
+                ZM_Qou,
+                IS_rat_Qex,
+                IV_0bi_gau,
+                ZS_tol,
+                IS_lag_max,
+            )
+            np.savez(
+                krn_npz,
+                YS_key=YS_key,
+                IV_0bi_ctb=IV_0bi_ctb,
+                IV_ptr_gau=IV_ptr_gau,
+                ZM_Krn_Qex=ZM_Krn_Qex,
+                ZM_Krn_Q00=ZM_Krn_Q00,
+            )
+        print(f"  . Kernels span {len(ZM_Krn_Qex)} time steps")
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Initial outflow and external inflow
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        IV_riv_tmp, _, _, IV_tim_tmp, _ = read_std_vec(Q00_ncf)
+        np.testing.assert_array_equal(IV_riv_tot, IV_riv_tmp)
+        np.testing.assert_equal(IV_tim_all[0], IV_tim_tmp[0])
+
+        e = netCDF4.Dataset(Q00_ncf, "r")
+        ZV_Q00_bas = e.variables["Qout"][0, IV_0bi_bas].filled()
+        e.close()
+
+        # Only the reaches upstream of gauges are read, in the order of the
+        # basin, and the kernels are indexed among them
+        IV_0bi_uni = np.unique(IV_0bi_ctb)
+        IV_0bi_krn = np.searchsorted(IV_0bi_uni, IV_0bi_ctb).astype(np.int32)
+        ZV_Q00_uni = ZV_Q00_bas[IV_0bi_uni]
+        ZV_Q00_zer = np.zeros(len(IV_0bi_uni), dtype=np.float64)
+
+        f = netCDF4.Dataset(Qex_ncf, "r")
+
+        # Filtered chunks are decompressed whole, others are read in part
+        IS_cnk_Qex = 1
+        if f.variables["Qext"].chunking() != "contiguous" and any(
+            f.variables["Qext"].filters().values()
+        ):
+            IS_cnk_Qex = int(f.variables["Qext"].chunking()[1])
+
+        # Blocks span at least the kernels, for the overlap-add to be cheap
+        IS_lag = len(ZM_Krn_Qex)
+        IS_blk = max(IS_blk, IS_lag)
+        IM_slb_Qex, IV_0bi_slb = make_slb_tbl(
+            IV_0bi_bas[IV_0bi_uni], len(IV_riv_tot), IS_cnk_Qex, IS_blk
+        )
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Convolve, one block of time steps at a time
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Each block is padded with zeros so that its convolution includes the
+        # tail spilling over the next blocks, which is added there
+        ZM_Qme_avg = np.zeros((IS_tim_all, len(IV_riv_gau)), dtype=np.float64)
+        for JS_tim_blk in tqdm(
+            range(0, IS_tim_all, IS_blk), desc="Convolving external inflow"
+        ):
+            JS_tim_tmp = min(JS_tim_blk + IS_blk, IS_tim_all)
+            IS_tim_blk = JS_tim_tmp - JS_tim_blk
+            IS_tim_cnv = min(IS_tim_blk + IS_lag - 1, IS_tim_all - JS_tim_blk)
+
+            ZM_Qex_cnv = np.zeros(
+                (IS_tim_cnv, len(IV_0bi_uni)), dtype=np.float64
+            )
+            ZM_Qex_cnv[:IS_tim_blk] = read_slb_mat(
+                f.variables["Qext"],
+                JS_tim_blk,
+                JS_tim_tmp,
+                IM_slb_Qex,
+                IV_0bi_slb,
+            )
+
+            ZM_Qme_avg[JS_tim_blk : JS_tim_blk + IS_tim_cnv] += calc_Qme_mat(
+                IV_0bi_krn,
+                IV_ptr_gau,
+                ZM_Krn_Qex,
+                ZM_Krn_Q00,
+                ZM_Qex_cnv,
+                ZV_Q00_uni if JS_tim_blk == 0 else ZV_Q00_zer,
+            )
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Create Qme file
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        IV_0bi_tmp = IV_0bi_bas[IV_0bi_gau]
+        prep_Qou_ncf(
+            IV_riv_gau,
+            ZV_lon_tot[IV_0bi_tmp],
+            ZV_lat_tot[IV_0bi_tmp],
+            Qme_ncf,
+        )
+
+        m = netCDF4.Dataset(Qme_ncf, "a")
+        m.variables["Qout"][0:IS_tim_all, :] = ZM_Qme_avg
+        m.variables["time"][0:IS_tim_all] = IV_tim_all
+        m.variables["time_bnds"][0:IS_tim_all, :] = IM_tim_all
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Copy some global attributes
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        m.setncattr("title", f.getncattr("title"))
+        m.setncattr("institution", f.getncattr("institution"))
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Close files
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        f.close()
+        m.close()
+
+        print("Done")
+
+    except (IOError, ValueError, KeyError) as e:
+        print(f"ERROR - {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+# *****************************************************************************
+# If executed as a script
+# *****************************************************************************
+if __name__ == "__main__":
+    main()
+
+
+# *****************************************************************************
+# End
+# *****************************************************************************
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+# *****************************************************************************
+# _rapid2nowcast.py
+# *****************************************************************************
+
+# Author:
+# Cedric H. David, 2026-2026
+
+
+# *****************************************************************************
+# Import Python modules
+# *****************************************************************************
+import argparse
+import os
+import sys
+import time
+
+import netCDF4
+import numpy as np
+
+from rapid2 import (
+    __version__,
+    prep_Qfi_ncf,
+    prep_Qou_ncf,
+    read_Mus_mat,
+    read_Net_mat,
+    read_nml_tbl,
+    read_std_vec,
+    updt_Mus_Qou,
+)
+
+
+# *****************************************************************************
+# Main
+# *****************************************************************************
+def main() -> None:
+    # -------------------------------------------------------------------------
+    # Initialize the argument parser and add valid arguments
+    # -------------------------------------------------------------------------
+    parser = argparse.ArgumentParser(
+        description=(
+            "Route external inflow increments as they arrive in a directory, "
+            "keeping the routing matrices and discharge state in memory."
+        ),
+        epilog=(
+            "examples:\n"
+            "  rapid2nowcast "
+            "--namelist input/Sandbox/nml_Sandbox_TR.yml "
+            "--increments input/Sandbox/incoming "
+            "--output output/Sandbox/nowcast\n"
+            "\n"
+            "Increments are Qext files with the rivid of the domain. They are "
+            "processed in\nname order and should be moved into the watched "
+            "directory atomically. Those\nstarting after the current state, "
+            "or unreadable, are retried at the next poll.\nFor each "
+            "increment, a Qou file with the same name is published in the "
+            "output\ndirectory and Qfi_ncf from the namelist is replaced "
+            "with the updated state."
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+
+    parser.add_argument(
+        "--version", action="version", version=f"rapid2 {__version__}"
+    )
+
+    parser.add_argument(
+        "-nml",
+        "--namelist",
+        dest="nml",
+        metavar="NAMELIST",
+        type=str,
+        required=True,
+        help="specify the namelist file",
+    )
+
+    parser.add_argument(
+        "-inc",
+        "--increments",
+        dest="inc",
+        metavar="INCREMENTS",
+        type=str,
+        required=True,
+        help="specify the directory watched for incoming Qext files",
+    )
+
+    parser.add_argument(
+        "-out",
+        "--output",
+        dest="out",
+        metavar="OUTPUT",
+        type=str,
+        required=True,
+        help="specify the directory where Qou increments are published",
+    )
+
+    parser.add_argument(
+        "-pol",
+        "--poll",
+        dest="pol",
+        metavar="POLL",
+        type=float,
+        default=1.0,
+        help="specify the polling interval in seconds (default: 1.0)",
+    )
+
+    # -------------------------------------------------------------------------
+    # Parse arguments and assign to variables
+    # -------------------------------------------------------------------------
+    args = parser.parse_args()
+
+    nml_yml = args.nml
+    inc_dir = args.inc
+    out_dir = args.out
+    ZS_pol = args.pol
+
+    print(f"Namelist file: {nml_yml}")
+    print(f"Watching: {inc_dir}")
+    print(f"Publishing: {out_dir}")
+
+    # -------------------------------------------------------------------------
+    # Execute main logic
+    # -------------------------------------------------------------------------
+    try:
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Read namelist into a dictionary and assign to local variables
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        AT_nml = read_nml_tbl(nml_yml)
+
+        Q00_ncf = AT_nml["Q00_ncf"]
+
+        con_pqt = AT_nml["con_pqt"]
+        kpr_pqt = AT_nml["kpr_pqt"]
+        xpr_pqt = AT_nml["xpr_pqt"]
+
+        bas_pqt = AT_nml["bas_pqt"]
+
+        IS_dtR = AT_nml["IS_dtR"]
+
+        Qfi_ncf = AT_nml["Qfi_ncf"]
+
+        if "Qup_ncf" in AT_nml:
+            raise ValueError("Qup_ncf is not supported by rapid2nowcast")
+
+        if not os.path.isdir(inc_dir):
+            raise IOError(f"Directory does not exist {inc_dir}")
+
+        os.makedirs(out_dir, exist_ok=True)
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # River network and model parameters, built once
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        IV_riv_tot, IV_riv_bas, IV_0bi_bas, ZM_Net = read_Net_mat(
+            con_pqt, bas_pqt
+        )
+        ZM_ICN, ZM_Qex, ZM_Qou = read_Mus_mat(
+            kpr_pqt, xpr_pqt, IV_riv_bas, IV_0bi_bas, ZM_Net, IS_dtR
+        )
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Initial discharge state
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        (
+            IV_riv_tmp,
+            ZV_lon_tot,
+            ZV_lat_tot,
+            IV_tim_tmp,
+            _,
+        ) = read_std_vec(Q00_ncf)
+        np.testing.assert_array_equal(IV_riv_tot, IV_riv_tmp)
+
+        e = netCDF4.Dataset(Q00_ncf, "r")
+        ZV_Qou_prv = e.variables["Qout"][0, IV_0bi_bas].filled()
+        e.close()
+
+        # Time at which the next increment must start
+        IS_tim_now = IV_tim_tmp[0]
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Watch directory and route increments
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Increments routed or rejected, kept while they remain in directory,
+        # and those already reported as unreadable or waiting on a gap
+        YV_inc_prv: set[str] = set()
+        YV_err_prv: set[str] = set()
+        YV_gap_prv: set[str] = set()
+        print(f"Ready, waiting for increments starting at {IS_tim_now}")
+
+        while True:
+            YV_dir = {
+                name
+                for name in os.listdir(inc_dir)
+                if name.endswith((".nc", ".nc4"))
+            }
+            YV_inc_prv &= YV_dir
+            YV_err_prv &= YV_dir
+            YV_gap_prv &= YV_dir
+            YV_inc = sorted(YV_dir - YV_inc_prv)
+
+            # Increments that do not continue the state yet are retried
+            BS_rtd = False
+            for name in YV_inc:
+                Qex_ncf = os.path.join(inc_dir, name)
+
+                # Read the increment, retried later if incomplete or corrupt,
+                # and only read Qext once it continues the current state
+                try:
+                    # Latency is measured from the arrival of the increment,
+                    # its change time is also updated when it is moved in
+                    ZS_arv = os.path.getctime(Qex_ncf)
+                    with netCDF4.Dataset(Qex_ncf, "r") as f:
+                        IM_tim_all = f.variables["time_bnds"][:].filled()
+
+                        if IM_tim_all[0, 0] > IS_tim_now:
+                            if name not in YV_gap_prv:
+                                print(
+                                    f"- {name} starts at {IM_tim_all[0, 0]} "
+                                    f"after {IS_tim_now}, waiting for the gap "
+                                    "to be filled"
+                                )
+                                YV_gap_prv.add(name)
+                            continue
+
+                        YV_inc_prv.add(name)
+
+                        if IM_tim_all[0, 0] < IS_tim_now:
+                            print(
+                                f"WARNING - {name} starts at "
+                                f"{IM_tim_all[0, 0]} before {IS_tim_now}. "
+                                "Skipping."
+                            )
+                            continue
+
+                        IS_dtE = IM_tim_all[0, 1] - IM_tim_all[0, 0]
+                        if IS_dtE == 0 or IS_dtE % IS_dtR != 0:
+                            print(
+                                f"WARNING - Bad time_bnds in {name}. Skipping."
+                            )
+                            continue
+                        IS_rat_Qex = IS_dtE // IS_dtR
+
+                        IV_riv_tmp = f.variables["rivid"][:]
+                        if not np.array_equal(IV_riv_tot, IV_riv_tmp):
+                            print(
+                                f"WARNING - River IDs differ in {name}. "
+                                "Skipping."
+                            )
+                            continue
+
+                        IV_tim_all = f.variables["time"][:].filled()
+                        ZM_Qex_all = f.variables["Qext"][
+                            :, IV_0bi_bas
+                        ].filled()
+                except (IOError, KeyError, RuntimeError) as e:
+                    YV_inc_prv.discard(name)
+                    if name not in YV_err_prv:
+                        print(
+                            f"WARNING - Unable to read {name} ({e}). "
+                            "Retrying later."
+                        )
+                        YV_err_prv.add(name)
+                    continue
+
+                # Route from the in-memory state
+                IS_tim_all = len(IV_tim_all)
+                ZM_Qou_avg = np.zeros((IS_tim_all, len(IV_riv_bas)))
+                for JS_tim_all in range(IS_tim_all):
+                    ZM_Qou_avg[JS_tim_all], ZV_Qou_prv = updt_Mus_Qou(
+                        ZM_ICN,
+                        ZM_Qex,
+                        ZM_Qou,
+                        IS_rat_Qex,
+                        ZV_Qou_prv,
+                        ZM_Qex_all[JS_tim_all],
+                    )
+                IS_tim_now = IM_tim_all[-1, 1]
+                BS_rtd = True
+
+                # Publish the Qou increment under a temporary name, then rename
+                Qou_ncf = os.path.join(out_dir, name)
+                Qou_tmp = Qou_ncf + ".tmp"
+                prep_Qou_ncf(
+                    IV_riv_bas,
+                    ZV_lon_tot[IV_0bi_bas],
+                    ZV_lat_tot[IV_0bi_bas],
+                    Qou_tmp,
+                )
+                g = netCDF4.Dataset(Qou_tmp, "a")
+                g.variables["Qout"][0:IS_tim_all, :] = ZM_Qou_avg
+                g.variables["time"][0:IS_tim_all] = IV_tim_all
+                g.variables["time_bnds"][0:IS_tim_all, :] = IM_tim_all
+                g.close()
+                os.replace(Qou_tmp, Qou_ncf)
+
+                # Publish the updated state the same way
+                Qfi_tmp = Qfi_ncf + ".tmp"
+                prep_Qfi_ncf(IV_riv_tot, ZV_lon_tot, ZV_lat_tot, Qfi_tmp)
+                h = netCDF4.Dataset(Qfi_tmp, "a")
+                h.variables["Qout"][0, IV_0bi_bas] = ZV_Qou_prv[:]
+                h.variables["time"][0] = IS_tim_now
+                h.close()
+                os.replace(Qfi_tmp, Qfi_ncf)
+
+                ZS_lat = max(0.0, time.time() - ZS_arv)
+                print(
+                    f"- {name}: {IS_tim_all} time step(s) routed and "
+                    f"published {ZS_lat * 1000:.1f} ms after arrival"
+                )
+
+            if not BS_rtd:
+                time.sleep(ZS_pol)
+
+    except KeyboardInterrupt:
+        print("Done")
+
+    except (IOError, ValueError, KeyError) as e:
+        print(f"ERROR - {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+# *****************************************************************************
+# If executed as a script
+# *****************************************************************************
+if __name__ == "__main__":
+    main()
+
+
+# *****************************************************************************
+# End
+# *****************************************************************************
@@ -0,0 +1,621 @@
+#!/usr/bin/env python3
+# *****************************************************************************
+# _rapid2serve.py
+# *****************************************************************************
+
+# Author:
+# Cedric H. David, 2026-2026
+
+
+# *****************************************************************************
+# Import Python modules
+# *****************************************************************************
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+import netCDF4
+import numpy as np
+import numpy.typing as npt
+
+from rapid2 import (
+    __version__,
+    make_stg_tbl,
+    read_fil_vec,
+    read_Mus_mat,
+    read_Net_mat,
+    read_nml_tbl,
+    read_std_vec,
+)
+from rapid2.cli._rapid2 import (
+    IT_ext_bck,
+    _open_bck,
+    _prep_out,
+    _QexFiles,
+    _rout_tim,
+    _save_Qfi,
+    _slb_Qex,
+)
+
+# *****************************************************************************
+# Keys of jobs
+# *****************************************************************************
+# Namelist entries that jobs may override, the others being preloaded
+YV_job_nml = [
+    "Q00_ncf",
+    "Qex_ncf",
+    "Qou_ncf",
+    "Qfi_ncf",
+    "kpr_pqt",
+    "xpr_pqt",
+    "IS_dtR",
+]
+YV_job_key = ["id", "nml", "cancel", "IS_dtE", "ZM_Qex_avg", "ZV_Qou_prv"]
+
+# Namelist entries of rapid2 that rapid2serve does not support
+YV_nml_uns = ["Qup_ncf", "Qex_mmp", "BS_spl", "YS_shd", "YV_hok"]
+
+
+# *****************************************************************************
+# Networks and routing matrices
+# *****************************************************************************
+# Filled by main before the worker processes start, which inherit it
+AT_net_all: dict[str, dict[str, Any]] = {}
+
+
+def _init_wrk(AT_net_tmp: dict[str, dict[str, Any]]) -> None:
+    """Fill the networks of a worker process with those of main.
+
+    Interrupts are left to main, which cancels the running jobs.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    AT_net_all.update(AT_net_tmp)
+
+
+def _make_net_tbl(AT_nml: dict[str, Any]) -> dict[str, Any]:
+    """Read the network of a namelist into a hash table."""
+    IV_riv_tot, IV_riv_bas, IV_0bi_bas, ZM_Net = read_Net_mat(
+        AT_nml["con_pqt"], AT_nml["bas_pqt"]
+    )
+
+    return {
+        "AT_nml": AT_nml,
+        "IV_riv_tot": IV_riv_tot,
+        "IV_riv_bas": IV_riv_bas,
+        "IV_0bi_bas": IV_0bi_bas,
+        "ZM_Net": ZM_Net,
+    }
+
+
+def _make_Mus_tbl(
+    AT_net: dict[str, Any], kpr_pqt: str, xpr_pqt: str, IS_dtR: int
+) -> dict[str, Any]:
+    """Build the Muskingum matrices of a network into a hash table."""
+    ZM_ICN, ZM_Qex, ZM_Qou = read_Mus_mat(
+        kpr_pqt,
+        xpr_pqt,
+        AT_net["IV_riv_bas"],
+        AT_net["IV_0bi_bas"],
+        AT_net["ZM_Net"],
+        IS_dtR,
+    )
+
+    return {"ZM_ICN": ZM_ICN, "ZM_Qex": ZM_Qex, "ZM_Qou": ZM_Qou}
+
+
+# *****************************************************************************
+# Job worker
+# *****************************************************************************
+def _run_job(
+    YS_nml: str, AT_job: dict[str, Any], BS_cnc: Any
+) -> dict[str, Any]:
+    """Run one job in a worker process and return the body of its reply.
+
+    The time loop of rapid2 checks the event BS_cnc at each time step.
+    """
+    if YS_nml not in AT_net_all:
+        raise ValueError(f"Network {YS_nml} is not preloaded")
+
+    AT_net = AT_net_all[YS_nml]
+    AT_nml = {**AT_net["AT_nml"], **AT_job}
+    IS_dtR = int(AT_nml["IS_dtR"])
+
+    # Only rebuild the Muskingum matrices if parameters are overridden
+    if any(key in AT_job for key in ("kpr_pqt", "xpr_pqt", "IS_dtR")):
+        AT_Mus = _make_Mus_tbl(
+            AT_net, AT_nml["kpr_pqt"], AT_nml["xpr_pqt"], IS_dtR
+        )
+    else:
+        AT_Mus = AT_net
+
+    ZM_ICN = AT_Mus["ZM_ICN"]
+    ZM_Qex = AT_Mus["ZM_Qex"]
+    ZM_Qou = AT_Mus["ZM_Qou"]
+    IV_riv_tot = AT_net["IV_riv_tot"]
+    IV_0bi_bas = AT_net["IV_0bi_bas"]
+    IS_riv_bas = len(IV_0bi_bas)
+
+    # -------------------------------------------------------------------------
+    # Array job: inflow and initial state given in the request
+    # -------------------------------------------------------------------------
+    if "ZM_Qex_avg" in AT_job:
+        ZM_Qex_avg = np.array(AT_job["ZM_Qex_avg"], dtype=np.float64)
+        if ZM_Qex_avg.ndim != 2 or ZM_Qex_avg.shape[1] != IS_riv_bas:
+            raise ValueError(
+                f"ZM_Qex_avg must have {IS_riv_bas} columns per row"
+            )
+
+        if "ZV_Qou_prv" in AT_job:
+            ZV_Qou_prv = np.array(AT_job["ZV_Qou_prv"], dtype=np.float64)
+        else:
+            ZV_Qou_prv = np.zeros(IS_riv_bas, dtype=np.float64)
+
+        IS_dtE = int(AT_job["IS_dtE"])
+        if IS_dtE % IS_dtR != 0:
+            raise ValueError("IS_dtE is not a multiple of IS_dtR")
+        IS_rat_Qex = IS_dtE // IS_dtR
+
+        ZM_Qou_avg = np.zeros_like(ZM_Qex_avg)
+
+        def store(
+            JS_tim_all: int, ZV_Qou_avg: npt.NDArray[np.float64]
+        ) -> None:
+            ZM_Qou_avg[JS_tim_all] = ZV_Qou_avg
+
+        ZV_Qou_now = _rout_tim(
+            ZM_Qex_avg,
+            None,
+            None,
+            0,
+            ZM_ICN,
+            ZM_Qex,
+            ZM_Qou,
+            1,
+            IS_rat_Qex,
+            0,
+            len(ZM_Qex_avg),
+            ZV_Qou_prv,
+            store,
+            BS_cnc=BS_cnc,
+        )
+        if BS_cnc.is_set():
+            return {"status": "cancelled"}
+
+        return {
+            "status": "done",
+            "ZM_Qou_avg": ZM_Qou_avg.tolist(),
+            "ZV_Qou_now": ZV_Qou_now.tolist(),
+        }
+
+    # -------------------------------------------------------------------------
+    # File job: same inputs and outputs as rapid2
+    # -------------------------------------------------------------------------
+    Q00_ncf = AT_nml["Q00_ncf"]
+    Qex_ncf = AT_nml["Qex_ncf"]
+    Qou_ncf = AT_nml["Qou_ncf"]
+    Qfi_ncf = AT_nml["Qfi_ncf"]
+
+    (
+        IV_riv_tmp,
+        ZV_lon_tot,
+        ZV_lat_tot,
+        IV_tim_all,
+        IM_tim_all,
+        AV_fil,
+    ) = read_fil_vec(
+        Qex_ncf, AT_nml.get("IS_tim_beg"), AT_nml.get("IS_tim_end")
+    )
+    if not np.array_equal(IV_riv_tot, IV_riv_tmp):
+        raise ValueError(f"River IDs in {Qex_ncf} differ from the domain")
+
+    IV_riv_tmp, _, _, IV_tim_tmp, _ = read_std_vec(Q00_ncf)
+    if not np.array_equal(IV_riv_tot, IV_riv_tmp):
+        raise ValueError(f"River IDs in {Q00_ncf} differ from the domain")
+    if IV_tim_tmp[0] != IV_tim_all[0]:
+        raise ValueError(
+            f"Time of {Q00_ncf} ({IV_tim_tmp[0]}) differs from the "
+            f"first time of {Qex_ncf} ({IV_tim_all[0]}) in the period"
+        )
+
+    IS_tim_all = len(IV_tim_all)
+    IS_dtE = IM_tim_all[0, 1] - IM_tim_all[0, 0]
+    if IS_dtE == 0:
+        raise ValueError("Values of time_bnds lead to IS_dtE = 0")
+    if IS_dtE % IS_dtR != 0:
+        raise ValueError("IS_dtE is not a multiple of IS_dtR")
+    IS_rat_Qex = IS_dtE // IS_dtR
+
+    # Backend and storage layout of outputs are those of the namelist
+    YS_bck = AT_nml.get("YS_bck", "netcdf")
+    Qou_sto = Qou_ncf
+    Qfi_sto = Qfi_ncf
+    if YS_bck != "netcdf":
+        Qou_sto = os.path.splitext(Qou_ncf)[0] + IT_ext_bck[YS_bck]
+        Qfi_sto = os.path.splitext(Qfi_ncf)[0] + IT_ext_bck[YS_bck]
+
+    AT_stg = make_stg_tbl(
+        IS_riv_bas,
+        **{
+            YS_arg: AT_nml[YS_arg]
+            for YS_arg in ("YS_cmp", "IS_lvl", "BS_shf", "IS_lsd", "IV_cnk")
+            if YS_arg in AT_nml
+        },
+    )
+    _prep_out(
+        YS_bck,
+        [(Qou_sto, 0, IS_tim_all)],
+        Qfi_sto,
+        IV_riv_tot,
+        ZV_lon_tot,
+        ZV_lat_tot,
+        IV_0bi_bas,
+        AT_stg,
+    )
+
+    e = netCDF4.Dataset(Q00_ncf, "r")
+    f = netCDF4.Dataset(AV_fil[0][0], "r")
+    g = _open_bck(YS_bck, Qou_sto)
+    h = _open_bck(YS_bck, Qfi_sto)
+
+    IM_slb_Qex, IV_0bi_slb, IS_blk_Qex, _ = _slb_Qex(
+        f.variables["Qext"], IV_0bi_bas, len(IV_riv_tot)
+    )
+    q = _QexFiles(AV_fil, IM_slb_Qex, IV_0bi_slb)
+
+    def write(JS_tim_all: int, ZV_Qou_avg: npt.NDArray[np.float64]) -> None:
+        g.variables["Qout"][JS_tim_all, :] = ZV_Qou_avg[:]
+        g.variables["time"][JS_tim_all] = IV_tim_all[JS_tim_all]
+        g.variables["time_bnds"][JS_tim_all, :] = IM_tim_all[JS_tim_all, :]
+
+    try:
+        ZV_Qou_now = _rout_tim(
+            q,
+            None,
+            None,
+            0,
+            ZM_ICN,
+            ZM_Qex,
+            ZM_Qou,
+            IS_blk_Qex,
+            IS_rat_Qex,
+            0,
+            IS_tim_all,
+            e.variables["Qout"][0, IV_0bi_bas],
+            write,
+            BS_cnc=BS_cnc,
+        )
+        if BS_cnc.is_set():
+            return {"status": "cancelled"}
+
+        _save_Qfi(
+            h,
+            f,
+            ZV_Qou_now,
+            IV_0bi_bas,
+            len(IV_riv_tot),
+            int(IM_tim_all[-1, 1]),
+        )
+        g.setncattr("title", f.getncattr("title"))
+        g.setncattr("institution", f.getncattr("institution"))
+
+    finally:
+        e.close()
+        f.close()
+        g.close()
+        h.close()
+        q.close()
+
+    return {"status": "done", "Qou_ncf": Qou_sto, "Qfi_ncf": Qfi_sto}
+
+
+# *****************************************************************************
+# Main
+# *****************************************************************************
+def main() -> None:
+    # -------------------------------------------------------------------------
+    # Initialize the argument parser and add valid arguments
+    # -------------------------------------------------------------------------
+    parser = argparse.ArgumentParser(
+        description=(
+            "Serve RAPID routing jobs over a local socket with networks and "
+            "routing matrices kept in memory."
+        ),
+        epilog=(
+            "examples:\n"
+            "  rapid2serve --namelist input/Sandbox/nml_Sandbox_TR.yml\n"
+            "  rapid2serve --namelist input/Sandbox/nml_Sandbox_TR.yml "
+            "--port 8642 --workers 4\n"
+            "  rapid2serve --client < jobs.jsonl\n"
+            "\n"
+            "protocol (one JSON object per line, one reply per request):\n"
+            '  {"id": "j1", "nml": "<namelist>", "Qex_ncf": "...", '
+            '"Qou_ncf": "...", "Qfi_ncf": "..."}\n'
+            '  {"id": "j2", "nml": "<namelist>", "IS_dtE": 10800, '
+            '"ZM_Qex_avg": [[...]], "ZV_Qou_prv": [...]}\n'
+            '  {"id": "j1", "cancel": true}\n'
+            "Jobs may override Q00_ncf, Qex_ncf, Qou_ncf, Qfi_ncf, kpr_pqt, "
+            "xpr_pqt, and IS_dtR, other keys are rejected. A cancel gets the "
+            "status cancelling if the id is queued or running on the same "
+            "connection, and unknown otherwise."
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+
+    parser.add_argument(
+        "--version", action="version", version=f"rapid2 {__version__}"
+    )
+
+    parser.add_argument(
+        "-nml",
+        "--namelist",
+        dest="nml",
+        metavar="NAMELIST",
+        type=str,
+        nargs="+",
+        help="specify the namelist file(s) of the networks to preload",
+    )
+
+    parser.add_argument(
+        "-hst",
+        "--host",
+        dest="hst",
+        metavar="HOST",
+        type=str,
+        default="127.0.0.1",
+        help="specify the host address to listen on (default: 127.0.0.1)",
+    )
+
+    parser.add_argument(
+        "-prt",
+        "--port",
+        dest="prt",
+        metavar="PORT",
+        type=int,
+        default=8642,
+        help="specify the port to listen on (default: 8642)",
+    )
+
+    parser.add_argument(
+        "-wrk",
+        "--workers",
+        dest="wrk",
+        metavar="WORKERS",
+        type=int,
+        default=1,
+        help="specify the number of routing worker processes (default: 1)",
+    )
+
+    parser.add_argument(
+        "-cli",
+        "--client",
+        dest="cli",
+        action="store_true",
+        help=(
+            "send the jobs read from standard input, one JSON object per "
+            "line, to the server at HOST:PORT and print its replies"
+        ),
+    )
+
+    # -------------------------------------------------------------------------
+    # Parse arguments and assign to variables
+    # -------------------------------------------------------------------------
+    args = parser.parse_args()
+
+    YV_nml = args.nml
+    YS_hst = args.hst
+    IS_prt = args.prt
+    IS_wrk = args.wrk
+    BS_cli = args.cli
+
+    if not BS_cli and YV_nml is None:
+        print(
+            "ERROR - --namelist is required unless --client is given",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+    if IS_wrk < 1:
+        print("ERROR - Number of workers must be 1 or more", file=sys.stderr)
+        sys.exit(1)
+
+    # -------------------------------------------------------------------------
+    # Client sending jobs and printing replies until the server closes
+    # -------------------------------------------------------------------------
+    def client() -> None:
+        with socket.create_connection((YS_hst, IS_prt)) as sck:
+            for YS_lin in sys.stdin:
+                if YS_lin.strip():
+                    sck.sendall(YS_lin.strip().encode() + b"\n")
+            sck.shutdown(socket.SHUT_WR)
+            with sck.makefile("r") as rep:
+                for YS_lin in rep:
+                    print(YS_lin, end="", flush=True)
+
+    # -------------------------------------------------------------------------
+    # Asynchronous server with a queue and a pool of worker processes
+    # -------------------------------------------------------------------------
+    # The netCDF library is not thread-safe, so jobs run in processes that
+    # inherit the preloaded networks, and are cancelled through a manager
+    async def serve() -> None:
+        loop = asyncio.get_running_loop()
+        manager = multiprocessing.Manager()
+        executor = ProcessPoolExecutor(
+            max_workers=IS_wrk, initializer=_init_wrk, initargs=(AT_net_all,)
+        )
+        queue: asyncio.Queue[
+            tuple[dict[str, Any], Any, asyncio.Future[Any]]
+        ] = asyncio.Queue()
+        # Cancel events of the queued and running jobs of all connections
+        BV_cnc_all: set[Any] = set()
+
+        async def work() -> None:
+            while True:
+                AT_job, BS_cnc, fut = await queue.get()
+                try:
+                    if BS_cnc.is_set():
+                        fut.set_result({"status": "cancelled"})
+                    else:
+                        fut.set_result(
+                            await loop.run_in_executor(
+                                executor,
+                                _run_job,
+                                AT_job.get("nml", YV_nml[0]),
+                                AT_job,
+                                BS_cnc,
+                            )
+                        )
+                except Exception as err:
+                    fut.set_result({"status": "error", "error": str(err)})
+                finally:
+                    queue.task_done()
+
+        def send(writer: asyncio.StreamWriter, AT_out: dict[str, Any]) -> None:
+            writer.write((json.dumps(AT_out) + "\n").encode())
+
+        async def reply(
+            writer: asyncio.StreamWriter,
+            AT_cnc: dict[str, Any],
+            YS_job: str,
+            fut: asyncio.Future[Any],
+        ) -> None:
+            AT_out = {"id": YS_job, **(await fut)}
+            BV_cnc_all.discard(AT_cnc.pop(YS_job))
+            send(writer, AT_out)
+            await writer.drain()
+
+        async def handle(
+            reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+        ) -> None:
+            # Ids of queued and running jobs are those of this connection
+            AT_cnc: dict[str, Any] = {}
+            tasks = []
+            while YS_lin := (await reader.readline()).decode().strip():
+                YS_job = None
+                try:
+                    AT_job = json.loads(YS_lin)
+                    if not isinstance(AT_job, dict):
+                        raise ValueError("Job is not a JSON object")
+                    if "id" not in AT_job:
+                        raise ValueError("Job has no id")
+                    YS_job = str(AT_job.pop("id"))
+                    YV_key = sorted(
+                        set(AT_job) - set(YV_job_key) - set(YV_job_nml)
+                    )
+                    if YV_key:
+                        raise ValueError(
+                            f"Unsupported keys {', '.join(YV_key)}"
+                        )
+                    if YS_job in AT_cnc and not AT_job.get("cancel"):
+                        raise ValueError(f"Job {YS_job} is already queued")
+                except ValueError as err:
+                    AT_out = {"status": "error", "error": f"bad job: {err}"}
+                    if YS_job is not None:
+                        AT_out = {"id": YS_job, **AT_out}
+                    send(writer, AT_out)
+                    continue
+
+                if AT_job.get("cancel"):
+                    if YS_job in AT_cnc:
+                        AT_cnc[YS_job].set()
+                        send(writer, {"id": YS_job, "status": "cancelling"})
+                    else:
+                        send(writer, {"id": YS_job, "status": "unknown"})
+                    continue
+
+                BS_cnc = manager.Event()
+                AT_cnc[YS_job] = BS_cnc
+                BV_cnc_all.add(BS_cnc)
+                fut = loop.create_future()
+                await queue.put((AT_job, BS_cnc, fut))
+                tasks.append(
+                    asyncio.create_task(reply(writer, AT_cnc, YS_job, fut))
+                )
+
+            await asyncio.gather(*tasks)
+            writer.close()
+
+        # Worker processes are started before listening, so that they do not
+        # inherit the sockets of connections and keep them open
+        await loop.run_in_executor(executor, os.getpid)
+        workers = [asyncio.create_task(work()) for _ in range(IS_wrk)]
+        # Array jobs can hold long lines of JSON, so raise the 64 KiB default
+        server = await asyncio.start_server(
+            handle, YS_hst, IS_prt, limit=2**30
+        )
+        print(f"Listening on {YS_hst}:{IS_prt} with {IS_wrk} worker(s)")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            for BS_cnc in BV_cnc_all:
+                BS_cnc.set()
+            executor.shutdown(cancel_futures=True)
+            manager.shutdown()
+
+    # -------------------------------------------------------------------------
+    # Execute main logic
+    # -------------------------------------------------------------------------
+    try:
+        if BS_cli:
+            client()
+            return
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Preload networks and routing matrices
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        for nml_yml in YV_nml:
+            print(f"Preloading network from namelist file: {nml_yml}")
+            AT_nml = read_nml_tbl(nml_yml)
+            for YS_key in YV_nml_uns:
+                if YS_key in AT_nml:
+                    raise ValueError(
+                        f"{YS_key} is not supported by rapid2serve"
+                    )
+            if AT_nml.get("YS_bck", "netcdf") not in IT_ext_bck:
+                raise ValueError(f"Unknown backend {AT_nml['YS_bck']}")
+
+            AT_net = _make_net_tbl(AT_nml)
+            AT_net.update(
+                _make_Mus_tbl(
+                    AT_net,
+                    AT_nml["kpr_pqt"],
+                    AT_nml["xpr_pqt"],
+                    AT_nml["IS_dtR"],
+                )
+            )
+            AT_net_all[nml_yml] = AT_net
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Serve jobs until interrupted
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Terminations are handled like interrupts, which stop the workers
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+        asyncio.run(serve())
+
+    except KeyboardInterrupt:
+        print("Done")
+
+    except (IOError, ValueError, KeyError) as e:
+        print(f"ERROR - {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+# *****************************************************************************
+# If executed as a script
+# *****************************************************************************
+if __name__ == "__main__":
+    main()
+
+
+# *****************************************************************************
+# End
+# *****************************************************************************
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+# *****************************************************************************
+# _rapid2source.py
+# *****************************************************************************
+
+# Author:
+# Cedric H. David, 2026-2026
+
+
+# *****************************************************************************
+# Import Python modules
+# *****************************************************************************
+import argparse
+import glob
+import os
+import sys
+
+import netCDF4
+import numpy as np
+from tqdm import tqdm
+
+from rapid2 import (
+    __version__,
+    make_0bi_tbl,
+    prep_Qat_ncf,
+    read_Mus_mat,
+    read_Net_mat,
+    read_nml_tbl,
+    read_reg_vec,
+    read_riv_vec,
+    read_std_vec,
+    updt_Mus_Qou,
+)
+
+
+# *****************************************************************************
+# Main
+# *****************************************************************************
+def main() -> None:
+
+    # -------------------------------------------------------------------------
+    # Initialize the argument parser and add valid arguments
+    # -------------------------------------------------------------------------
+    parser = argparse.ArgumentParser(
+        description=(
+            "Attribute the outflow at gauges to the regions where external "
+            "inflow entered, by routing one tracer per region in one run."
+        ),
+        epilog=(
+            "examples:\n"
+            "  rapid2source "
+            "--namelist input/Sandbox/nml_Sandbox_TR.yml "
+            "--regions input/Sandbox/reg_Sandbox.parquet "
+            "--observations input/Sandbox/obs_Sandbox.parquet "
+            "--attribution "
+            "output/Sandbox/Qat_Sandbox_19700101_19700110_TR.nc4\n"
+            "\n"
+            "The reg_pqt file has the riv and reg columns, with one integer "
+            "region label per\nriver ID in the order of con_pqt. The outflow "
+            "from the initial state is written\napart, in Qout_Q00."
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+
+    parser.add_argument(
+        "--version", action="version", version=f"rapid2 {__version__}"
+    )
+
+    parser.add_argument(
+        "-nml",
+        "--namelist",
+        dest="nml",
+        metavar="NAMELIST",
+        type=str,
+        required=True,
+        help="specify the namelist file",
+    )
+
+    parser.add_argument(
+        "-reg",
+        "--regions",
+        dest="reg",
+        metavar="REGIONS",
+        type=str,
+        required=True,
+        help="specify the input reg_pqt file containing region labels",
+    )
+
+    parser.add_argument(
+        "-obs",
+        "--observations",
+        dest="obs",
+        metavar="OBSERVATIONS",
+        type=str,
+        required=True,
+        help="specify the input obs_pqt file containing river IDs for gauges",
+    )
+
+    parser.add_argument(
+        "-Qat",
+        "--attribution",
+        dest="Qat",
+        metavar="ATTRIBUTION",
+        type=str,
+        required=True,
+        help="specify the output Qat_ncf file",
+    )
+
+    # -------------------------------------------------------------------------
+    # Parse arguments and assign to variables
+    # -------------------------------------------------------------------------
+    args = parser.parse_args()
+
+    nml_yml = args.nml
+    reg_pqt = args.reg
+    obs_pqt = args.obs
+    Qat_ncf = args.Qat
+
+    print(f"Namelist file: {nml_yml}")
+
+    # -------------------------------------------------------------------------
+    # Skip if file already exists
+    # -------------------------------------------------------------------------
+    if os.path.isfile(Qat_ncf):
+        print(f"WARNING - File already exists {Qat_ncf}. Skipping.")
+        sys.exit(0)
+
+    # -------------------------------------------------------------------------
+    # Execute main logic
+    # -------------------------------------------------------------------------
+    try:
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Read namelist into a dictionary and assign to local variables
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        AT_nml = read_nml_tbl(nml_yml)
+
+        Q00_ncf = AT_nml["Q00_ncf"]
+        Qex_ncf = AT_nml["Qex_ncf"]
+        # Consecutive files or patterns accepted by rapid2 are not supported
+        if not isinstance(Qex_ncf, str) or glob.has_magic(Qex_ncf):
+            raise ValueError("rapid2source requires a single file in Qex_ncf")
+
+        con_pqt = AT_nml["con_pqt"]
+        kpr_pqt = AT_nml["kpr_pqt"]
+        xpr_pqt = AT_nml["xpr_pqt"]
+
+        bas_pqt = AT_nml["bas_pqt"]
+
+        IS_dtR = AT_nml["IS_dtR"]
+
+        if "Qup_ncf" in AT_nml:
+            raise ValueError("Qup_ncf is not supported by rapid2source")
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # River network, model parameters, regions, and gauges
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        print("- Process river network, parameters, regions, and gauges")
+        IV_riv_tot, IV_riv_bas, IV_0bi_bas, ZM_Net = read_Net_mat(
+            con_pqt, bas_pqt
+        )
+        ZM_ICN, ZM_Qex, ZM_Qou = read_Mus_mat(
+            kpr_pqt, xpr_pqt, IV_riv_bas, IV_0bi_bas, ZM_Net, IS_dtR
+        )
+
+        IV_riv_tmp, IV_reg_bas = read_reg_vec(reg_pqt, IV_0bi_bas)
+        np.testing.assert_array_equal(IV_riv_bas, IV_riv_tmp)
+
+        # One column per region, and a last one for the initial state
+        IV_reg_uni, IV_col_bas = np.unique(IV_reg_bas, return_inverse=True)
+        IS_reg = len(IV_reg_uni)
+        print(f"  . Found {IS_reg} regions")
+
+        IV_riv_gau = read_riv_vec(obs_pqt)
+        _, _, IV_0bi_gau = make_0bi_tbl(IV_riv_bas, IV_riv_gau)
+        print(f"  . Found {len(IV_riv_gau)} gauges")
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # External inflow metadata and initial state
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        (
+            IV_riv_tmp,
+            ZV_lon_tot,
+            ZV_lat_tot,
+            IV_tim_all,
+            IM_tim_all,
+        ) = read_std_vec(Qex_ncf)
+        np.testing.assert_array_equal(IV_riv_tot, IV_riv_tmp)
+
+        if IM_tim_all is None:
+            raise ValueError(f"time_bnds is missing in {Qex_ncf}")
+
+        IS_tim_all = len(IV_tim_all)
+        IS_dtE = IM_tim_all[0, 1] - IM_tim_all[0, 0]
+
+        if IS_dtE == 0:
+            raise ValueError("Values of time_bnds lead to IS_dtE = 0")
+
+        if IS_dtE % IS_dtR == 0:
+            IS_rat_Qex = IS_dtE // IS_dtR
+        else:
+            raise ValueError("IS_dtE is not a multiple of IS_dtR")
+
+        IV_riv_tmp, _, _, IV_tim_tmp, _ = read_std_vec(Q00_ncf)
+        np.testing.assert_array_equal(IV_riv_tot, IV_riv_tmp)
+        np.testing.assert_equal(IV_tim_all[0], IV_tim_tmp[0])
+
+        IS_riv_bas = len(IV_riv_bas)
+        ZM_Qou_prv = np.zeros((IS_riv_bas, IS_reg + 1), dtype=np.float64)
+
+        e = netCDF4.Dataset(Q00_ncf, "r")
+        ZM_Qou_prv[:, IS_reg] = e.variables["Qout"][0, IV_0bi_bas].filled()
+        e.close()
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Create Qat file
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        IV_0bi_tmp = IV_0bi_bas[IV_0bi_gau]
+        prep_Qat_ncf(
+            IV_riv_gau,
+            ZV_lon_tot[IV_0bi_tmp],
+            ZV_lat_tot[IV_0bi_tmp],
+            IV_reg_uni.astype(np.int32),
+            Qat_ncf,
+        )
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Route all tracers at once
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        f = netCDF4.Dataset(Qex_ncf, "r")
+        a = netCDF4.Dataset(Qat_ncf, "a")
+
+        IV_riv_idx = np.arange(IS_riv_bas)
+        ZM_Qex_avg = np.zeros((IS_riv_bas, IS_reg + 1), dtype=np.float64)
+        for JS_tim_all in tqdm(range(IS_tim_all), desc="Computing discharge"):
+            ZV_Qex_avg = f.variables["Qext"][JS_tim_all][IV_0bi_bas]
+            ZM_Qex_avg[IV_riv_idx, IV_col_bas] = ZV_Qex_avg
+
+            ZM_Qou_avg, ZM_Qou_prv = updt_Mus_Qou(
+                ZM_ICN, ZM_Qex, ZM_Qou, IS_rat_Qex, ZM_Qou_prv, ZM_Qex_avg
+            )
+
+            a.variables["Qout"][JS_tim_all, :, :] = ZM_Qou_avg[
+                IV_0bi_gau, :IS_reg
+            ]
+            a.variables["Qout_Q00"][JS_tim_all, :] = ZM_Qou_avg[
+                IV_0bi_gau, IS_reg
+            ]
+            a.variables["time"][JS_tim_all] = IV_tim_all[JS_tim_all]
+            a.variables["time_bnds"][JS_tim_all, :] = IM_tim_all[JS_tim_all, :]
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Copy some global attributes
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        a.setncattr("title", f.getncattr("title"))
+        a.setncattr("institution", f.getncattr("institution"))
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Close files
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        f.close()
+        a.close()
+
+        print("Done")
+
+    except (IOError, ValueError, KeyError) as e:
+        print(f"ERROR - {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+# *****************************************************************************
+# If executed as a script
+# *****************************************************************************
+if __name__ == "__main__":
+    main()
+
+
+# *****************************************************************************
+# End
+# *****************************************************************************
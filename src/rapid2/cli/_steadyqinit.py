@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+# *****************************************************************************
+# _steadyqinit.py
+# *****************************************************************************
+
+# Author:
+# Cedric H. David, 2026-2026
+
+
+# *****************************************************************************
+# Import Python modules
+# *****************************************************************************
+import argparse
+import os
+import sys
+
+import netCDF4
+import numpy as np
+from tqdm import tqdm
+
+from rapid2 import (
+    __version__,
+    calc_Q00_vec,
+    make_slb_tbl,
+    prep_Qfi_ncf,
+    read_Net_mat,
+    read_slb_mat,
+    read_std_vec,
+)
+
+
+# *****************************************************************************
+# Main
+# *****************************************************************************
+def main() -> None:
+
+    # -------------------------------------------------------------------------
+    # Initialize the argument parser and add valid arguments
+    # -------------------------------------------------------------------------
+    parser = argparse.ArgumentParser(
+        description=(
+            "Create an initial discharge file with the steady state reached "
+            "under the average external inflow over a period."
+        ),
+        epilog=(
+            "examples:\n"
+            "  steadyqinit "
+            "--connectivity input/Sandbox/con_Sandbox.parquet "
+            "--basin input/Sandbox/bas_Sandbox_ascend.parquet "
+            "--external_inflow "
+            "input/Sandbox/Qex_Sandbox_19700101_19700110_TR.nc4 "
+            "--initial_outflow "
+            "input/Sandbox/Q00_Sandbox_19700101_19700110_ST.nc4\n"
+            "  steadyqinit "
+            "--connectivity input/Sandbox/con_Sandbox.parquet "
+            "--basin input/Sandbox/bas_Sandbox_ascend.parquet "
+            "--external_inflow "
+            "input/Sandbox/Qex_Sandbox_19700101_19700110_TR.nc4 "
+            "--initial_outflow "
+            "input/Sandbox/Q00_Sandbox_19700101_19700110_ST.nc4 "
+            "--start 0 --end 432000"
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+
+    parser.add_argument(
+        "--version", action="version", version=f"rapid2 {__version__}"
+    )
+
+    parser.add_argument(
+        "-con",
+        "--connectivity",
+        dest="con",
+        metavar="CONNECTIVITY",
+        type=str,
+        required=True,
+        help="specify the input con_pqt file",
+    )
+
+    parser.add_argument(
+        "-bas",
+        "--basin",
+        dest="bas",
+        metavar="BASIN",
+        type=str,
+        required=True,
+        help="specify the input bas_pqt file",
+    )
+
+    parser.add_argument(
+        "-Qex",
+        "--external_inflow",
+        dest="Qex",
+        metavar="EXTERNAL_INFLOW",
+        type=str,
+        required=True,
+        help="specify the input Qext file",
+    )
+
+    parser.add_argument(
+        "-Q00",
+        "--initial_outflow",
+        dest="Q00",
+        metavar="INITIAL_OUTFLOW",
+        type=str,
+        required=True,
+        help="specify the output Qinit file",
+    )
+
+    parser.add_argument(
+        "-beg",
+        "--start",
+        dest="beg",
+        metavar="START",
+        type=int,
+        default=None,
+        help="specify the start of the averaging period in epoch seconds",
+    )
+
+    parser.add_argument(
+        "-end",
+        "--end",
+        dest="end",
+        metavar="END",
+        type=int,
+        default=None,
+        help="specify the end of the averaging period in epoch seconds",
+    )
+
+    parser.add_argument(
+        "-blk",
+        "--block",
+        dest="blk",
+        metavar="BLOCK",
+        type=int,
+        default=100,
+        help="specify the number of time steps read at once (default: 100)",
+    )
+
+    # -------------------------------------------------------------------------
+    # Parse arguments and assign to variables
+    # -------------------------------------------------------------------------
+    args = parser.parse_args()
+
+    con_pqt = args.con
+    bas_pqt = args.bas
+    Qex_ncf = args.Qex
+    Q00_ncf = args.Q00
+    IS_tim_beg = args.beg
+    IS_tim_end = args.end
+    IS_blk = args.blk
+
+    print("Creating (from/to):")
+    print(f" - {Qex_ncf}")
+    print(f" - {Q00_ncf}")
+
+    # -------------------------------------------------------------------------
+    # Skip if file already exists
+    # -------------------------------------------------------------------------
+    if os.path.isfile(Q00_ncf):
+        print(f"WARNING - File already exists {Q00_ncf}. Skipping.")
+        sys.exit(0)
+
+    # -------------------------------------------------------------------------
+    # Execute main logic
+    # -------------------------------------------------------------------------
+    try:
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # River network
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        print("- Process river network")
+        IV_riv_tot, IV_riv_bas, IV_0bi_bas, ZM_Net = read_Net_mat(
+            con_pqt, bas_pqt
+        )
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # External inflows
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        print("- Process external inflows")
+        (
+            IV_riv_tmp,
+            ZV_lon_tot,
+            ZV_lat_tot,
+            IV_tim_all,
+            IM_tim_all,
+        ) = read_std_vec(Qex_ncf)
+
+        if not np.array_equal(IV_riv_tot, IV_riv_tmp):
+            raise ValueError(f"River IDs in {Qex_ncf} must match {con_pqt}")
+
+        if IM_tim_all is None:
+            raise ValueError(f"time_bnds is missing in {Qex_ncf}")
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Select the time steps fully within the averaging period
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        BV_tim_all = np.ones(len(IV_tim_all), dtype=bool)
+        if IS_tim_beg is not None:
+            BV_tim_all &= IM_tim_all[:, 0] >= IS_tim_beg
+        if IS_tim_end is not None:
+            BV_tim_all &= IM_tim_all[:, 1] <= IS_tim_end
+
+        IV_tim_tmp = np.flatnonzero(BV_tim_all)
+        if len(IV_tim_tmp) == 0:
+            raise ValueError("No time step within the averaging period")
+
+        JS_tim_beg = IV_tim_tmp[0]
+        JS_tim_end = IV_tim_tmp[-1] + 1
+        if JS_tim_end - JS_tim_beg != len(IV_tim_tmp):
+            raise ValueError("Time steps of the averaging period not sorted")
+
+        print(
+            f"  . Averaging {len(IV_tim_tmp)} time steps from "
+            f"{IM_tim_all[JS_tim_beg, 0]} to {IM_tim_all[JS_tim_end - 1, 1]}"
+        )
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Average external inflows, streamed in blocks of time steps
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        f = netCDF4.Dataset(Qex_ncf, "r")
+
+        # Filtered chunks are decompressed whole, others are read in part
+        IS_cnk_Qex = 1
+        if f.variables["Qext"].chunking() != "contiguous" and any(
+            f.variables["Qext"].filters().values()
+        ):
+            IS_cnk_Qex = int(f.variables["Qext"].chunking()[1])
+
+        IM_slb_Qex, IV_0bi_slb = make_slb_tbl(
+            IV_0bi_bas, len(IV_riv_tot), IS_cnk_Qex, IS_blk
+        )
+
+        ZV_Qex_avg = np.zeros(len(IV_riv_bas), dtype=np.float64)
+        for JS_tim_blk in tqdm(
+            range(JS_tim_beg, JS_tim_end, IS_blk),
+            desc="Averaging external inflow",
+        ):
+            JS_tim_tmp = min(JS_tim_blk + IS_blk, JS_tim_end)
+            ZM_Qex_blk = read_slb_mat(
+                f.variables["Qext"],
+                JS_tim_blk,
+                JS_tim_tmp,
+                IM_slb_Qex,
+                IV_0bi_slb,
+            )
+            ZV_Qex_avg += np.sum(ZM_Qex_blk, axis=0)
+
+        ZV_Qex_avg = ZV_Qex_avg / (JS_tim_end - JS_tim_beg)
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Compute steady state
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        print("- Compute steady state")
+        ZV_Q00_bas = calc_Q00_vec(ZM_Net, ZV_Qex_avg)
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Create Qinit file, valid at the start of the external inflow
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        prep_Qfi_ncf(IV_riv_tot, ZV_lon_tot, ZV_lat_tot, Q00_ncf)
+
+        e = netCDF4.Dataset(Q00_ncf, "a")
+
+        e.variables["time"][0] = IV_tim_all[0]
+        e.variables["Qout"][0, :] = 0
+        e.variables["Qout"][0, IV_0bi_bas] = ZV_Q00_bas[:]
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Copy some global attributes
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        e.setncattr("title", f.getncattr("title"))
+        e.setncattr("institution", f.getncattr("institution"))
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Close files
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        e.close()
+        f.close()
+
+        print("Done")
+
+    except (IOError, ValueError, KeyError) as e:
+        print(f"ERROR - {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+# *****************************************************************************
+# If executed as a script
+# *****************************************************************************
+if __name__ == "__main__":
+    main()
+
+
+# *****************************************************************************
+# End
+# *****************************************************************************
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# *****************************************************************************
+# _storetoncf.py
+# *****************************************************************************
+
+# Author:
+# Cedric H. David, 2026-2026
+
+
+# *****************************************************************************
+# Import Python modules
+# *****************************************************************************
+import argparse
+import os
+import sys
+from typing import Any
+
+import netCDF4
+import numpy as np
+from tqdm import tqdm
+
+from rapid2 import (
+    __version__,
+    make_stg_tbl,
+    prep_Qfi_ncf,
+    prep_Qou_ncf,
+    read_std_mmp,
+)
+
+
+# *****************************************************************************
+# Main
+# *****************************************************************************
+def main() -> None:
+
+    # -------------------------------------------------------------------------
+    # Initialize the argument parser and add valid arguments
+    # -------------------------------------------------------------------------
+    parser = argparse.ArgumentParser(
+        description=(
+            "Convert a memory-mapped or Zarr store of discharge written by "
+            "rapid2 --backend into a CF netCDF file."
+        ),
+        epilog=(
+            "examples:\n"
+            "  storetoncf "
+            "--store "
+            "output/Sandbox/Qou_Sandbox_19700101_19700110_TR.mmp "
+            "--output "
+            "output/Sandbox/Qou_Sandbox_19700101_19700110_TR.nc4\n"
+            "\n"
+            "Stores of float64 discharge are converted to Qfi files, others "
+            "to Qou files.\nOnly the time steps completed from the start are "
+            "converted."
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+
+    parser.add_argument(
+        "--version", action="version", version=f"rapid2 {__version__}"
+    )
+
+    parser.add_argument(
+        "-sto",
+        "--store",
+        dest="sto",
+        metavar="STORE",
+        type=str,
+        required=True,
+        help="specify the input .mmp or .zarr store",
+    )
+
+    parser.add_argument(
+        "-out",
+        "--output",
+        dest="out",
+        metavar="OUTPUT",
+        type=str,
+        required=True,
+        help="specify the output netCDF file",
+    )
+
+    parser.add_argument(
+        "-cmp",
+        "--compression",
+        dest="cmp",
+        choices=["zlib", "zstd", "none"],
+        default="zlib",
+        help="compress the variables of the output (default: zlib)",
+    )
+
+    # -------------------------------------------------------------------------
+    # Parse arguments and assign to variables
+    # -------------------------------------------------------------------------
+    args = parser.parse_args()
+
+    std_sto = args.sto
+    out_ncf = args.out
+    YS_cmp = args.cmp
+
+    print("Creating (from/to):")
+    print(f" - {std_sto}")
+    print(f" - {out_ncf}")
+
+    # -------------------------------------------------------------------------
+    # Skip if file already exists
+    # -------------------------------------------------------------------------
+    if os.path.isfile(out_ncf):
+        print(f"WARNING - File already exists {out_ncf}. Skipping.")
+        sys.exit(0)
+
+    # -------------------------------------------------------------------------
+    # Execute main logic
+    # -------------------------------------------------------------------------
+    try:
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Open store
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        AT_var: Any
+        if os.path.isfile(os.path.join(std_sto, "header.json")):
+            AT_var, AT_att = read_std_mmp(std_sto)
+        elif os.path.isfile(os.path.join(std_sto, "zarr.json")):
+            try:
+                import zarr
+            except ImportError as e:
+                raise ValueError(
+                    "The zarr package is required, e.g., "
+                    "pip install rapid2[zarr]"
+                ) from e
+            AT_var = zarr.open_group(std_sto, mode="r")
+            AT_att = dict(AT_var.attrs)
+        else:
+            raise IOError(f"Unable to find a store in {std_sto}")
+
+        IV_riv = AT_var["rivid"][:]
+        ZV_lon = AT_var["lon"][:]
+        ZV_lat = AT_var["lat"][:]
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Time steps completed from the start, time_bnds is written last
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        IS_fll = int(np.iinfo(np.int32).min + 1)
+        BS_Qfi = AT_var["Qout"].dtype == np.float64
+        if BS_Qfi:
+            BV_don = AT_var["time"][:] != IS_fll
+        else:
+            BV_don = AT_var["time_bnds"][:, 1] != IS_fll
+        IS_tim = int(np.argmin(BV_don)) if not BV_don.all() else len(BV_don)
+
+        print(f"Converting {IS_tim} of {len(BV_don)} time steps")
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Create netCDF file and copy variables in blocks of time steps
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        AT_stg = make_stg_tbl(len(IV_riv), YS_cmp=YS_cmp)
+
+        if BS_Qfi:
+            prep_Qfi_ncf(IV_riv, ZV_lon, ZV_lat, out_ncf, AT_stg)
+        else:
+            prep_Qou_ncf(IV_riv, ZV_lon, ZV_lat, out_ncf, AT_stg)
+
+        g = netCDF4.Dataset(out_ncf, "a")
+
+        IS_blk = max(1, 2**22 // max(len(IV_riv), 1))
+        for JS_tim_beg in tqdm(
+            range(0, IS_tim, IS_blk), desc="Copying discharge"
+        ):
+            JS_tim_end = min(JS_tim_beg + IS_blk, IS_tim)
+            g.variables["Qout"][JS_tim_beg:JS_tim_end, :] = AT_var["Qout"][
+                JS_tim_beg:JS_tim_end, :
+            ]
+            g.variables["time"][JS_tim_beg:JS_tim_end] = AT_var["time"][
+                JS_tim_beg:JS_tim_end
+            ]
+            if not BS_Qfi:
+                g.variables["time_bnds"][JS_tim_beg:JS_tim_end, :] = AT_var[
+                    "time_bnds"
+                ][JS_tim_beg:JS_tim_end, :]
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Copy some global attributes
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        g.setncattr("title", AT_att.get("title", ""))
+        g.setncattr("institution", AT_att.get("institution", ""))
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Close files
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        g.close()
+
+    except (IOError, ValueError, KeyError) as e:
+        print(f"ERROR - {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+# *****************************************************************************
+# If executed as a script
+# *****************************************************************************
+if __name__ == "__main__":
+    main()
+
+
+# *****************************************************************************
+# End
+# *****************************************************************************
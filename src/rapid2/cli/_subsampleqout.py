@@ -23,6 +23,7 @@ from rapid2 import (
     make_0bi_tbl,
     prep_Qou_ncf,
     read_riv_vec,
+    read_shd_ncf,
     read_std_vec,
 )
 
@@ -62,7 +63,7 @@ def main() -> None:
         metavar="OUTFLOW",
         type=str,
         required=True,
-        help="specify the input Qou_ncf file",
+        help="specify the input Qou_ncf file or manifest of shards",
     )
 
     parser.add_argument(
@@ -184,7 +185,7 @@ def main() -> None:
         # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
         print("- Sub-sample data")
 
-        g = netCDF4.Dataset(Qou_ncf, "r")
+        g = read_shd_ncf(Qou_ncf)
         m = netCDF4.Dataset(Qme_ncf, "a")
 
         for JS_tim_Qob in tqdm(range(IS_tim_Qob), desc="Averaging discharge"):
@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+# *****************************************************************************
+# _synthbasin.py
+# *****************************************************************************
+
+# Author:
+# Cedric H. David, 2026-2026
+
+
+# *****************************************************************************
+# Import Python modules
+# *****************************************************************************
+import argparse
+import os
+import sys
+
+import netCDF4
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from scipy.signal import lfilter
+from scipy.sparse import csc_matrix
+from tqdm import tqdm
+
+from rapid2 import (
+    __version__,
+    calc_Q00_vec,
+    make_dwn_vec,
+    prep_grp_pqt,
+    prep_Qex_ncf,
+    prep_Qfi_ncf,
+)
+
+
+# *****************************************************************************
+# Main
+# *****************************************************************************
+def main() -> None:
+    # -------------------------------------------------------------------------
+    # Initialize the argument parser and add valid arguments
+    # -------------------------------------------------------------------------
+    parser = argparse.ArgumentParser(
+        description=(
+            "Create a synthetic test case of any size: a random river tree "
+            "with parameters, coordinates, external inflow, initial outflow, "
+            "and namelist."
+        ),
+        epilog=(
+            "examples:\n"
+            "  synthbasin --reaches 1e6 --time_steps 2920 "
+            "--directory input/Synth --name Synth_1e6\n"
+            "\n"
+            "Each reach has BRANCHING upstream reaches, except with "
+            "probability CHAIN where it\nhas one and with probability "
+            "HEADWATER where it has none. External inflow\ncombines a "
+            "seasonal cycle, noise, and basin-wide storm pulses with "
+            "recession.\nThe initial outflow is the steady state of the mean "
+            "external inflow."
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+
+    parser.add_argument(
+        "--version", action="version", version=f"rapid2 {__version__}"
+    )
+
+    parser.add_argument(
+        "-riv",
+        "--reaches",
+        dest="riv",
+        metavar="REACHES",
+        type=lambda YS_riv: int(float(YS_riv)),
+        required=True,
+        help="specify the number of river reaches",
+    )
+
+    parser.add_argument(
+        "-brn",
+        "--branching",
+        dest="brn",
+        metavar="BRANCHING",
+        type=int,
+        default=2,
+        help=(
+            "specify the number of upstream reaches at confluences "
+            "(default: 2)"
+        ),
+    )
+
+    parser.add_argument(
+        "-chn",
+        "--chain",
+        dest="chn",
+        metavar="CHAIN",
+        type=float,
+        default=0.6,
+        help="specify the probability of one upstream reach (default: 0.6)",
+    )
+
+    parser.add_argument(
+        "-hdw",
+        "--headwater",
+        dest="hdw",
+        metavar="HEADWATER",
+        type=float,
+        default=0.1,
+        help="specify the probability of no upstream reach (default: 0.1)",
+    )
+
+    parser.add_argument(
+        "-tim",
+        "--time_steps",
+        dest="tim",
+        metavar="TIME_STEPS",
+        type=int,
+        default=80,
+        help=(
+            "specify the number of external inflow time steps (default: 80)"
+        ),
+    )
+
+    parser.add_argument(
+        "-dtE",
+        "--external_time_step",
+        dest="dtE",
+        metavar="EXTERNAL_TIME_STEP",
+        type=int,
+        default=10800,
+        help=(
+            "specify the external inflow time step in seconds (default: 10800)"
+        ),
+    )
+
+    parser.add_argument(
+        "-sed",
+        "--seed",
+        dest="sed",
+        metavar="SEED",
+        type=int,
+        default=0,
+        help="specify the seed of the random number generator (default: 0)",
+    )
+
+    parser.add_argument(
+        "-dir",
+        "--directory",
+        dest="dir",
+        metavar="DIRECTORY",
+        type=str,
+        required=True,
+        help="specify the output directory",
+    )
+
+    parser.add_argument(
+        "-nam",
+        "--name",
+        dest="nam",
+        metavar="NAME",
+        type=str,
+        required=True,
+        help="specify the name of the test case used in file names",
+    )
+
+    parser.add_argument(
+        "-grp",
+        "--row_group",
+        dest="grp",
+        metavar="ROWS",
+        type=int,
+        default=None,
+        help=(
+            "sort the parameter files by river ID in row groups of ROWS "
+            "reaches (default: unsorted, in the order of connectivity)"
+        ),
+    )
+
+    # -------------------------------------------------------------------------
+    # Parse arguments and assign to variables
+    # -------------------------------------------------------------------------
+    args = parser.parse_args()
+
+    IS_riv_tot = args.riv
+    IS_brn = args.brn
+    ZS_chn = args.chn
+    ZS_hdw = args.hdw
+    IS_tim_all = args.tim
+    IS_dtE = args.dtE
+    IS_sed = args.sed
+    YS_dir = args.dir
+    YS_nam = args.nam
+    IS_grp = args.grp
+
+    con_pqt = os.path.join(YS_dir, f"con_{YS_nam}.parquet")
+    bas_pqt = os.path.join(YS_dir, f"bas_{YS_nam}.parquet")
+    kpr_pqt = os.path.join(YS_dir, f"kpr_{YS_nam}.parquet")
+    xpr_pqt = os.path.join(YS_dir, f"xpr_{YS_nam}.parquet")
+    crd_pqt = os.path.join(YS_dir, f"crd_{YS_nam}.parquet")
+    Qex_ncf = os.path.join(YS_dir, f"Qex_{YS_nam}.nc4")
+    Q00_ncf = os.path.join(YS_dir, f"Q00_{YS_nam}.nc4")
+    nml_yml = os.path.join(YS_dir, f"nml_{YS_nam}.yml")
+    Qou_ncf = os.path.join(YS_dir, f"Qou_{YS_nam}.nc4")
+    Qfi_ncf = os.path.join(YS_dir, f"Qfi_{YS_nam}.nc4")
+
+    print("Creating (from/to):")
+    print(f" - {IS_riv_tot} reaches, {IS_tim_all} time steps, seed {IS_sed}")
+    print(f" - {nml_yml}")
+
+    # -------------------------------------------------------------------------
+    # Skip if file already exists
+    # -------------------------------------------------------------------------
+    if os.path.isfile(nml_yml):
+        print(f"WARNING - File already exists {nml_yml}. Skipping.")
+        sys.exit(0)
+
+    # -------------------------------------------------------------------------
+    # Execute main logic
+    # -------------------------------------------------------------------------
+    try:
+        if IS_dtE <= 0 or IS_dtE % 900 != 0:
+            raise ValueError("IS_dtE must be a positive multiple of 900")
+
+        os.makedirs(YS_dir, exist_ok=True)
+        rng = np.random.default_rng(IS_sed)
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # River network, parameters, and coordinates
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        print("- Create river network, parameters, and coordinates")
+        IV_riv_tot, IV_dwn_tot = make_dwn_vec(
+            IS_riv_tot, IS_brn, ZS_chn, ZS_hdw, IS_sed
+        )
+
+        # Reach lengths of about 5 km and a wave celerity of 1 m/s
+        ZV_kpr_tot = rng.lognormal(np.log(5000), 0.5, IS_riv_tot)
+        ZV_xpr_tot = rng.uniform(0.1, 0.4, IS_riv_tot)
+
+        # Reaches scattered over a one-degree square
+        ZV_lon_tot = rng.uniform(0, 1, IS_riv_tot)
+        ZV_lat_tot = rng.uniform(0, 1, IS_riv_tot)
+
+        AT_pqt = {
+            con_pqt: {"riv": IV_riv_tot, "dwn": IV_dwn_tot},
+            bas_pqt: {"riv": IV_riv_tot},
+            kpr_pqt: {"riv": IV_riv_tot, "kpr": ZV_kpr_tot},
+            xpr_pqt: {"riv": IV_riv_tot, "xpr": ZV_xpr_tot},
+            crd_pqt: {"riv": IV_riv_tot, "lon": ZV_lon_tot, "lat": ZV_lat_tot},
+        }
+        for YS_pqt, AT_col in AT_pqt.items():
+            if IS_grp is not None and YS_pqt in (kpr_pqt, xpr_pqt):
+                prep_grp_pqt(AT_col, YS_pqt, IS_grp)
+                continue
+            table = pa.table(AT_col)
+            schema = pa.schema(
+                [field.with_nullable(False) for field in table.schema]
+            )
+            table = table.cast(schema)
+            pq.write_table(table, YS_pqt)
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # External inflow, streamed in blocks of time steps
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Mean lateral inflow of about 1 m3/s, and seasonal phase of each reach
+        ZV_Qex_men = rng.lognormal(0, 0.5, IS_riv_tot)
+        ZV_phs_tot = rng.uniform(0, 0.1, IS_riv_tot)
+
+        # Basin-wide storms every 10 days on average, receding over 2 days
+        ZS_sto_prb = IS_dtE / (10 * 86400)
+        ZS_sto_dec = np.exp(-IS_dtE / (2 * 86400))
+
+        prep_Qex_ncf(IV_riv_tot, ZV_lon_tot, ZV_lat_tot, Qex_ncf)
+        f = netCDF4.Dataset(Qex_ncf, "a")
+
+        IV_tim_all = np.arange(IS_tim_all, dtype=np.int32) * np.int32(IS_dtE)
+        f.variables["time"][:] = IV_tim_all
+        f.variables["time_bnds"][:, 0] = IV_tim_all
+        f.variables["time_bnds"][:, 1] = IV_tim_all + np.int32(IS_dtE)
+
+        # Blocks of about 4 million values bound the memory footprint
+        IS_blk = max(1, min(IS_tim_all, 2**22 // IS_riv_tot))
+        ZM_sto_prv = np.zeros((1, IS_riv_tot), dtype=np.float64)
+        for JS_tim_beg in tqdm(
+            range(0, IS_tim_all, IS_blk), desc="Generating synthetic inflow"
+        ):
+            JS_tim_end = min(JS_tim_beg + IS_blk, IS_tim_all)
+            IS_tim_blk = JS_tim_end - JS_tim_beg
+
+            ZV_tim_blk = (IV_tim_all[JS_tim_beg:JS_tim_end] + IS_dtE / 2) / (
+                365.25 * 86400
+            )
+            ZM_sea_blk = 1 + 0.5 * np.sin(
+                2 * np.pi * (ZV_tim_blk[:, None] - ZV_phs_tot[None, :])
+            )
+            ZM_noi_blk = rng.lognormal(-0.02, 0.2, (IS_tim_blk, IS_riv_tot))
+
+            ZM_sto_blk = (rng.random((IS_tim_blk, 1)) < ZS_sto_prb) * (
+                rng.exponential(5, (IS_tim_blk, IS_riv_tot))
+            )
+            ZM_sto_blk, ZM_sto_prv = lfilter(
+                [1], [1, -ZS_sto_dec], ZM_sto_blk, axis=0, zi=ZM_sto_prv
+            )
+
+            f.variables["Qext"][JS_tim_beg:JS_tim_end, :] = ZV_Qex_men * (
+                ZM_sea_blk * ZM_noi_blk + ZM_sto_blk
+            )
+
+        f.title = f"Synthetic {YS_nam} dataset for RAPID2"
+        f.institution = (
+            "Jet Propulsion Laboratory, California Institute of Technology"
+        )
+        f.close()
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Initial outflow
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        print("- Compute steady state of mean external inflow")
+
+        # River IDs are one more than their index, upstream reaches first
+        IV_0bi_dwn = IV_dwn_tot[:-1] - 1
+        ZM_Net = csc_matrix(
+            (
+                np.ones(IS_riv_tot - 1, dtype=np.float64),
+                (IV_0bi_dwn, np.arange(IS_riv_tot - 1)),
+            ),
+            shape=(IS_riv_tot, IS_riv_tot),
+        )
+        ZV_Q00_tot = calc_Q00_vec(ZM_Net, ZV_Qex_men)
+
+        prep_Qfi_ncf(IV_riv_tot, ZV_lon_tot, ZV_lat_tot, Q00_ncf)
+        e = netCDF4.Dataset(Q00_ncf, "a")
+        e.variables["time"][0] = IV_tim_all[0]
+        e.variables["Qout"][0, :] = ZV_Q00_tot[:]
+        e.title = f"Synthetic {YS_nam} dataset for RAPID2"
+        e.institution = (
+            "Jet Propulsion Laboratory, California Institute of Technology"
+        )
+        e.close()
+
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        # Namelist
+        # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+        with open(nml_yml, "w") as yml:
+            yml.write(f"Q00_ncf: '{Q00_ncf}'\n")
+            yml.write(f"Qex_ncf: '{Qex_ncf}'\n")
+            yml.write(f"con_pqt: '{con_pqt}'\n")
+            yml.write(f"kpr_pqt: '{kpr_pqt}'\n")
+            yml.write(f"xpr_pqt: '{xpr_pqt}'\n")
+            yml.write(f"bas_pqt: '{bas_pqt}'\n")
+            yml.write("IS_dtR: 900\n")
+            yml.write(f"Qou_ncf: '{Qou_ncf}'\n")
+            yml.write(f"Qfi_ncf: '{Qfi_ncf}'\n")
+
+        print("Done")
+
+    except (IOError, ValueError, KeyError) as e:
+        print(f"ERROR - {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+# *****************************************************************************
+# If executed as a script
+# *****************************************************************************
+if __name__ == "__main__":
+    main()
+
+
+# *****************************************************************************
+# End
+# *****************************************************************************
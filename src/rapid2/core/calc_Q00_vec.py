@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# *****************************************************************************
+# calc_Q00_vec.py
+# *****************************************************************************
+
+# Author:
+# Cedric H. David, 2026-2026
+
+
+# *****************************************************************************
+# Import Python modules
+# *****************************************************************************
+import numpy as np
+import numpy.typing as npt
+from scipy.sparse import (
+    csc_matrix,
+    identity,
+)
+from scipy.sparse.linalg import spsolve_triangular
+
+
+# *****************************************************************************
+# Steady-state initial outflow
+# *****************************************************************************
+def calc_Q00_vec(
+    ZM_Net: csc_matrix,
+    ZV_Qex_avg: npt.NDArray[np.float64],
+) -> npt.NDArray[np.float64]:
+    """Calculate the steady-state outflow for a constant external inflow.
+
+    With a constant external inflow, the Muskingum method reaches a steady
+    state in which the outflow of each reach is the sum of all external
+    inflows upstream, i.e. (I - N) * Q = Qex. The basin being sorted from
+    upstream to downstream, this is a single sparse triangular solve.
+
+    Parameters
+    ----------
+    ZM_Net : scipy.sparse.spmatrix
+        The network matrix for the basin.
+    ZV_Qex_avg : ndarray[float64]
+        The temporal average of the external inflow for the basin.
+
+    Returns
+    -------
+    ZV_Q00_bas : ndarray[float64]
+        The steady-state outflow for each reach in the basin.
+
+    Examples
+    --------
+    >>> ZM_Net = csc_matrix(np.array([[0, 0, 0, 0, 0],\
+                                      [0, 0, 0, 0, 0],\
+                                      [1, 1, 0, 0, 0],\
+                                      [0, 0, 0, 0, 0],\
+                                      [0, 0, 1, 1, 0]], dtype=np.float64))
+    >>> ZV_Qex_avg = np.array([1.0, 2.0, 3.0, 4.0, 5.0])
+    >>> calc_Q00_vec(ZM_Net, ZV_Qex_avg)
+    array([ 1.,  2.,  6.,  4., 15.])
+    """
+
+    # -------------------------------------------------------------------------
+    # Identity minus network matrix, lower triangular for a sorted basin
+    # -------------------------------------------------------------------------
+    IS_riv_bas = ZM_Net.shape[0]
+    ZM_Idt = identity(IS_riv_bas, format="csc", dtype=np.float64)
+
+    ZM_ImN = ZM_Idt - ZM_Net
+
+    # -------------------------------------------------------------------------
+    # Solve for the steady state
+    # -------------------------------------------------------------------------
+    ZV_Q00_bas = spsolve_triangular(
+        ZM_ImN,
+        np.asarray(ZV_Qex_avg, dtype=np.float64),
+        lower=True,
+        unit_diagonal=True,
+    )
+
+    return ZV_Q00_bas
+
+
+# *****************************************************************************
+# End
+# *****************************************************************************
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# *****************************************************************************
+# calc_Qme_mat.py
+# *****************************************************************************
+
+# Author:
+# Cedric H. David, 2026-2026
+
+
+# *****************************************************************************
+# Import Python modules
+# *****************************************************************************
+import numpy as np
+import numpy.typing as npt
+from scipy.fft import (
+    irfft,
+    next_fast_len,
+    rfft,
+)
+
+
+# *****************************************************************************
+# Gauge outflow from impulse-response kernels
+# *****************************************************************************
+def calc_Qme_mat(
+    IV_0bi_ctb: npt.NDArray[np.int32],
+    IV_ptr_gau: npt.NDArray[np.int64],
+    ZM_Krn_Qex: npt.NDArray[np.float64],
+    ZM_Krn_Q00: npt.NDArray[np.float64],
+    ZM_Qex_bas: npt.NDArray[np.float64],
+    ZV_Q00_bas: npt.NDArray[np.float64],
+) -> npt.NDArray[np.float64]:
+    """Calculate the average outflow at gauges by convolution of kernels.
+
+    The external inflow of the reaches upstream of each gauge is convolved
+    with their kernels using real FFTs of a length fit for both, and the
+    free response of the initial outflow is added to the first time steps.
+
+    Parameters
+    ----------
+    IV_0bi_ctb : ndarray[int32]
+        The zero-based index in the basin of the reaches upstream of each
+        gauge, concatenated over gauges.
+    IV_ptr_gau : ndarray[int64]
+        The offset of the reaches of each gauge in IV_0bi_ctb.
+    ZM_Krn_Qex : ndarray[float64]
+        The kernel of external inflow (time lag x element of IV_0bi_ctb).
+    ZM_Krn_Q00 : ndarray[float64]
+        The kernel of initial outflow (time lag x element of IV_0bi_ctb).
+    ZM_Qex_bas : ndarray[float64]
+        The external inflow for the basin (time step x reach).
+    ZV_Q00_bas : ndarray[float64]
+        The initial outflow for the basin.
+
+    Returns
+    -------
+    ZM_Qme_avg : ndarray[float64]
+        The average outflow at gauges (time step x gauge).
+
+    Examples
+    --------
+    >>> IV_0bi_ctb = np.array([0, 1], dtype=np.int32)
+    >>> IV_ptr_gau = np.array([0, 2])
+    >>> ZM_Krn_Qex = np.array([[0.5, 0. ], [0.5, 1. ]])
+    >>> ZM_Krn_Q00 = np.array([[1. , 0. ], [0. , 0. ]])
+    >>> ZM_Qex_bas = np.array([[1., 2.], [0., 0.], [0., 0.]])
+    >>> ZV_Q00_bas = np.array([3., 0.])
+    >>> calc_Qme_mat(IV_0bi_ctb, IV_ptr_gau, ZM_Krn_Qex, ZM_Krn_Q00,\
+                     ZM_Qex_bas, ZV_Q00_bas).round(6)
+    array([[3.5],
+           [2.5],
+           [0. ]])
+    """
+
+    # -------------------------------------------------------------------------
+    # Transform the external inflow once for all gauges
+    # -------------------------------------------------------------------------
+    IS_tim_all = ZM_Qex_bas.shape[0]
+    IS_lag = ZM_Krn_Qex.shape[0]
+    IS_gau = len(IV_ptr_gau) - 1
+
+    IS_fft = next_fast_len(IS_tim_all + IS_lag - 1, real=True)
+    ZM_Qex_fft = rfft(ZM_Qex_bas, n=IS_fft, axis=0)
+
+    # -------------------------------------------------------------------------
+    # Convolve for each gauge
+    # -------------------------------------------------------------------------
+    IS_tim_fre = min(IS_lag, IS_tim_all)
+    ZM_Qme_avg = np.zeros((IS_tim_all, IS_gau), dtype=np.float64)
+    for JS_gau in range(IS_gau):
+        IS_beg = IV_ptr_gau[JS_gau]
+        IS_end = IV_ptr_gau[JS_gau + 1]
+        IV_0bi_tmp = IV_0bi_ctb[IS_beg:IS_end]
+
+        ZM_Krn_fft = rfft(ZM_Krn_Qex[:, IS_beg:IS_end], n=IS_fft, axis=0)
+        ZV_Qme_fft = np.sum(ZM_Krn_fft * ZM_Qex_fft[:, IV_0bi_tmp], axis=1)
+        ZM_Qme_avg[:, JS_gau] = irfft(ZV_Qme_fft, n=IS_fft)[:IS_tim_all]
+
+        ZV_Qme_fre = ZM_Krn_Q00[:, IS_beg:IS_end] @ ZV_Q00_bas[IV_0bi_tmp]
+        ZM_Qme_avg[:IS_tim_fre, JS_gau] += ZV_Qme_fre[:IS_tim_fre]
+
+    return ZM_Qme_avg
+
+
+# *****************************************************************************
+# End
+# *****************************************************************************
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# *****************************************************************************
+# calc_cyc_vec.py
+# *****************************************************************************
+
+# Author:
+# Cedric H. David, 2026-2026
+
+
+# *****************************************************************************
+# Import Python modules
+# *****************************************************************************
+import numpy as np
+import numpy.typing as npt
+from scipy.sparse import csc_matrix
+from scipy.sparse.linalg import (
+    LinearOperator,
+    gmres,
+)
+
+from rapid2.core.updt_Mus_Qou import updt_Mus_Qou
+
+
+# *****************************************************************************
+# Periodic (cyclostationary) initial outflow
+# *****************************************************************************
+def calc_cyc_vec(
+    ZM_ICN: csc_matrix,
+    ZM_Qex: csc_matrix,
+    ZM_Qou: csc_matrix,
+    IS_rat_cyc: int,
+    ZV_Qou_cyc: npt.NDArray[np.float64],
+    ZS_rtl: float = 1e-10,
+) -> npt.NDArray[np.float64]:
+    """Calculate the periodic outflow state for a repeating external inflow.
+
+    Muskingum routing being linear, one pass through a cycle of external
+    inflow maps an initial state Q0 to A * Q0 + b, where A is the routing
+    without external inflow and b is the state reached from Q0 = 0. The
+    periodic state solves (I - A) * Q0 = b, which is obtained here with the
+    GMRES Krylov method, each iteration applying A through one pass of
+    Muskingum routing without external inflow.
+
+    Parameters
+    ----------
+    ZM_ICN : scipy.sparse.spmatrix
+        The linear system matrix for the basin in matrix-based Muskingum.
+    ZM_Qex : scipy.sparse.spmatrix
+        The multiplicand matrix for ZV_Qex for the basin in right-hand side.
+    ZM_Qou : scipy.sparse.spmatrix
+        The multiplicand matrix for ZV_Qou for the basin in right-hand side.
+    IS_rat_cyc : int
+        The number of Muskingum routing timesteps in one cycle.
+    ZV_Qou_cyc : ndarray[float64]
+        The instantaneous discharge after one cycle started from zero.
+    ZS_rtl : float, optional
+        The relative tolerance of the GMRES method.
+
+    Returns
+    -------
+    ZV_Q00_bas : ndarray[float64]
+        The periodic instantaneous discharge at the start of the cycle.
+
+    Examples
+    --------
+    >>> ZM_ICN = csc_matrix(np.array([[1.  , 0.  , 0.  , 0.  , 0.  ],\
+                                      [0.  , 1.  , 0.  , 0.  , 0.  ],\
+                                      [0.25, 0.25, 1.  , 0.  , 0.  ],\
+                                      [0.  , 0.  , 0.  , 1.  , 0.  ],\
+                                      [0.  , 0.  , 0.25, 0.25, 1.  ]]))
+    >>> ZM_Qex = csc_matrix(np.array([[0.125, 0.   , 0.   , 0.   , 0.   ],\
+                                      [0.   , 0.125, 0.   , 0.   , 0.   ],\
+                                      [0.   , 0.   , 0.125, 0.   , 0.   ],\
+                                      [0.   , 0.   , 0.   , 0.125, 0.   ],\
+                                      [0.   , 0.   , 0.   , 0.   , 0.125]]))
+    >>> ZM_Qou = csc_matrix(np.array([[0.875, 0.   , 0.   , 0.   , 0.   ],\
+                                      [0.   , 0.875, 0.   , 0.   , 0.   ],\
+                                      [0.375, 0.375, 0.875, 0.   , 0.   ],\
+                                      [0.   , 0.   , 0.   , 0.875, 0.   ],\
+                                      [0.   , 0.   , 0.375, 0.375, 0.875]]))
+    >>> ZV_Qou_cyc = np.zeros(5)
+    >>> for ZV_Qex_avg in (np.ones(5), np.zeros(5)):
+    ...     _, ZV_Qou_cyc = updt_Mus_Qou(ZM_ICN, ZM_Qex, ZM_Qou, 4,\
+                                         ZV_Qou_cyc, ZV_Qex_avg)
+    >>> ZV_Q00_bas = calc_cyc_vec(ZM_ICN, ZM_Qex, ZM_Qou, 8, ZV_Qou_cyc)
+    >>> ZV_Q00_bas.round(6)
+    array([0.369555, 0.369555, 1.4415  , 0.369555, 2.431531])
+    >>> ZV_Qou_now = ZV_Q00_bas
+    >>> for ZV_Qex_avg in (np.ones(5), np.zeros(5)):
+    ...     _, ZV_Qou_now = updt_Mus_Qou(ZM_ICN, ZM_Qex, ZM_Qou, 4,\
+                                         ZV_Qou_now, ZV_Qex_avg)
+    >>> np.allclose(ZV_Qou_now, ZV_Q00_bas)
+    True
+    """
+
+    # -------------------------------------------------------------------------
+    # Operator applying (I - A) through one cycle without external inflow
+    # -------------------------------------------------------------------------
+    IS_riv_bas = ZM_ICN.shape[0]
+    ZV_Qex_zer = np.zeros(IS_riv_bas, dtype=np.float64)
+
+    def matvec(ZV_Qou_prv: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+        _, ZV_Qou_now = updt_Mus_Qou(
+            ZM_ICN, ZM_Qex, ZM_Qou, IS_rat_cyc, ZV_Qou_prv.ravel(), ZV_Qex_zer
+        )
+        return ZV_Qou_prv.ravel() - ZV_Qou_now
+
+    ZM_ImA = LinearOperator(
+        (IS_riv_bas, IS_riv_bas), matvec=matvec, dtype=np.float64
+    )
+
+    # -------------------------------------------------------------------------
+    # Solve, starting from the state after one cycle
+    # -------------------------------------------------------------------------
+    ZV_rhs = np.asarray(ZV_Qou_cyc, dtype=np.float64)
+    ZV_Q00_bas, IS_inf = gmres(ZM_ImA, ZV_rhs, x0=ZV_rhs, rtol=ZS_rtl, atol=0)
+
+    if IS_inf != 0:
+        raise ValueError(f"GMRES did not converge ({IS_inf} iterations)")
+
+    return np.asarray(ZV_Q00_bas, dtype=np.float64)
+
+
+# *****************************************************************************
+# End
+# *****************************************************************************
@@ -23,10 +23,13 @@ def chck_bas(
     IV_riv_tot: npt.NDArray[np.int32],
     IV_dwn_tot: npt.NDArray[np.int32],
     IT_0bi_tot: dict[np.int32, int],
+    IV_riv_ups: npt.NDArray[np.int32] | None = None,
 ) -> None:
     """Check topology.
 
     Check missing connections upstream and downstream as well as adequate sort.
+    Reaches routed in an upstream basin, whose outflow is given, are not
+    reported as missing.
 
     Parameters
     ----------
@@ -40,6 +43,8 @@ def chck_bas(
         The river IDs downstream of the river IDs in domain.
     IT_0bi_tot : dict[int32, int]
         The link from river ID to index in domain.
+    IV_riv_ups : ndarray[int32], optional
+        The river IDs routed in an upstream basin.
 
     Returns
     -------
@@ -76,6 +81,9 @@ def chck_bas(
                       np.int32(50): 3}
     >>> chck_bas(IV_riv_bas, IT_0bi_bas, IV_riv_tot, IV_dwn_tot, IT_0bi_tot)
     WARNING - connectivity: 10 is upstream of 30 but is not in basin file
+    >>> IV_riv_ups = np.array([10], dtype=np.int32)
+    >>> chck_bas(IV_riv_bas, IT_0bi_bas, IV_riv_tot, IV_dwn_tot, IT_0bi_tot,\
+                 IV_riv_ups)
     >>> IV_riv_bas = np.array([50, 40, 30, 20, 10], dtype=np.int32)
     >>> IT_0bi_bas = {np.int32(50): 0,\
                       np.int32(40): 1,\
@@ -89,6 +97,8 @@ def chck_bas(
     basin file
     """
 
+    AT_riv_ups = set() if IV_riv_ups is None else set(IV_riv_ups.tolist())
+
     # -------------------------------------------------------------------------
     # Check for missing connections upstream
     # -------------------------------------------------------------------------
@@ -96,7 +106,7 @@ def chck_bas(
     for JS_riv_tot in range(IS_riv_tot):
         IS_riv = IV_riv_tot[JS_riv_tot]
         IS_dwn = IV_dwn_tot[JS_riv_tot]
-        if IS_dwn != 0:
+        if IS_dwn != 0 and int(IS_riv) not in AT_riv_ups:
             if IS_dwn in IT_0bi_bas and IS_riv not in IT_0bi_bas:
                 print(
                     f"WARNING - connectivity: {IS_riv} "
@@ -109,7 +119,7 @@ def chck_bas(
     # -------------------------------------------------------------------------
     for IS_riv in IV_riv_bas:
         IS_dwn = IV_dwn_tot[IT_0bi_tot[IS_riv]]
-        if IS_dwn != 0:
+        if IS_dwn != 0 and int(IS_dwn) not in AT_riv_ups:
             if IS_dwn not in IT_0bi_bas:
                 print(
                     f"WARNING - connectivity: {IS_dwn} "
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# *****************************************************************************
+# make_Krn_mat.py
+# *****************************************************************************
+
+# Author:
+# Cedric H. David, 2026-2026
+
+
+# *****************************************************************************
+# Import Python modules
+# *****************************************************************************
+import numpy as np
+import numpy.typing as npt
+from scipy.sparse import block_diag, csc_matrix
+from scipy.sparse.csgraph import breadth_first_order
+from scipy.sparse.linalg import spsolve_triangular
+
+
+# *****************************************************************************
+# Impulse-response kernels at gauges
+# *****************************************************************************
+def make_Krn_mat(
+    ZM_ICN: csc_matrix,
+    ZM_Qex: csc_matrix,
+    ZM_Qou: csc_matrix,
+    IS_rat_Qex: int,
+    IV_0bi_gau: npt.NDArray[np.int32],
+    ZS_tol: float = 1e-9,
+    IS_lag_max: int = 10000,
+) -> tuple[
+    npt.NDArray[np.int32],
+    npt.NDArray[np.int64],
+    npt.NDArray[np.float64],
+    npt.NDArray[np.float64],
+]:
+    """Create the truncated impulse-response kernels of a set of gauges.
+
+    Muskingum routing being linear and time-invariant, the average outflow of
+    a gauge over external inflow time step n is the sum over its upstream
+    reaches j of the convolution of a kernel with the external inflow of j,
+    plus the free response of the initial state. Both kernels are obtained
+    for all gauges at once by routing the transposed system backward from
+    the gauges. The system of each gauge is restricted to its upstream
+    reaches, and those of all gauges are placed in one block-diagonal system,
+    solved with one triangular solve for each Muskingum routing timestep, so
+    that the backward state has one value per element of the kernels. Kernels
+    are truncated when the backward state falls below ZS_tol, which must
+    happen within IS_lag_max external inflow time steps.
+
+    Parameters
+    ----------
+    ZM_ICN : scipy.sparse.spmatrix
+        The linear system matrix for the basin in matrix-based Muskingum.
+    ZM_Qex : scipy.sparse.spmatrix
+        The multiplicand matrix for ZV_Qex for the basin in right-hand side.
+    ZM_Qou : scipy.sparse.spmatrix
+        The multiplicand matrix for ZV_Qou for the basin in right-hand side.
+    IS_rat_Qex : int
+        The number of Muskingum routing timesteps per external inflow step.
+    IV_0bi_gau : ndarray[int32]
+        The zero-based index of each gauge in the basin.
+    ZS_tol : float, optional
+        The truncation threshold relative to a unit impulse.
+    IS_lag_max : int, optional
+        The maximum number of external inflow time steps in the kernels.
+
+    Returns
+    -------
+    IV_0bi_ctb : ndarray[int32]
+        The zero-based index in the basin of the reaches upstream of each
+        gauge (including the gauge), concatenated over gauges.
+    IV_ptr_gau : ndarray[int64]
+        The offset of the reaches of each gauge in IV_0bi_ctb, with one more
+        element than gauges.
+    ZM_Krn_Qex : ndarray[float64]
+        The kernel of external inflow, with one row per time lag and one
+        column per element of IV_0bi_ctb.
+    ZM_Krn_Q00 : ndarray[float64]
+        The kernel of initial outflow, with the same shape as ZM_Krn_Qex.
+
+    Examples
+    --------
+    >>> ZM_ICN = csc_matrix(np.array([[1.  , 0.  , 0.  , 0.  , 0.  ],\
+                                      [0.  , 1.  , 0.  , 0.  , 0.  ],\
+                                      [0.25, 0.25, 1.  , 0.  , 0.  ],\
+                                      [0.  , 0.  , 0.  , 1.  , 0.  ],\
+                                      [0.  , 0.  , 0.25, 0.25, 1.  ]]))
+    >>> ZM_Qex = csc_matrix(np.array([[0.125, 0.   , 0.   , 0.   , 0.   ],\
+                                      [0.   , 0.125, 0.   , 0.   , 0.   ],\
+                                      [0.   , 0.   , 0.125, 0.   , 0.   ],\
+                                      [0.   , 0.   , 0.   , 0.125, 0.   ],\
+                                      [0.   , 0.   , 0.   , 0.   , 0.125]]))
+    >>> ZM_Qou = csc_matrix(np.array([[0.875, 0.   , 0.   , 0.   , 0.   ],\
+                                      [0.   , 0.875, 0.   , 0.   , 0.   ],\
+                                      [0.375, 0.375, 0.875, 0.   , 0.   ],\
+                                      [0.   , 0.   , 0.   , 0.875, 0.   ],\
+                                      [0.   , 0.   , 0.375, 0.375, 0.875]]))
+    >>> IV_0bi_gau = np.array([2, 4], dtype=np.int32)
+    >>> IV_0bi_ctb, IV_ptr_gau, ZM_Krn_Qex, ZM_Krn_Q00 = make_Krn_mat(\
+            ZM_ICN, ZM_Qex, ZM_Qou, 2, IV_0bi_gau)
+    >>> IV_0bi_ctb
+    array([0, 1, 2, 0, 1, 2, 3, 4], dtype=int32)
+    >>> IV_ptr_gau
+    array([0, 3, 8])
+    >>> ZM_Krn_Qex[:3, 2].round(6)
+    array([0.0625  , 0.219727, 0.168228])
+    >>> ZM_Krn_Q00[:3, 2].round(6)
+    array([0.9375  , 0.717773, 0.549545])
+    >>> make_Krn_mat(ZM_ICN, ZM_Qex, ZM_Qou, 2, IV_0bi_gau, IS_lag_max=3)
+    ... # doctest: +ELLIPSIS
+    Traceback (most recent call last):
+    ...
+    ValueError: Kernels did not fall below 1e-09 within 3 time steps, ...
+    """
+
+    # -------------------------------------------------------------------------
+    # Reaches upstream of each gauge
+    # -------------------------------------------------------------------------
+    IS_gau = len(IV_0bi_gau)
+
+    # The off-diagonal pattern of ZM_ICN is that of the network matrix
+    IV_0bi_ctb_list = []
+    IV_ptr_gau = np.zeros(IS_gau + 1, dtype=np.int64)
+    for JS_gau in range(IS_gau):
+        IV_0bi_tmp = breadth_first_order(
+            ZM_ICN,
+            IV_0bi_gau[JS_gau],
+            directed=True,
+            return_predecessors=False,
+        )
+        IV_0bi_ctb_list.append(np.sort(IV_0bi_tmp).astype(np.int32))
+        IV_ptr_gau[JS_gau + 1] = IV_ptr_gau[JS_gau] + len(IV_0bi_tmp)
+
+    IV_0bi_ctb = np.concatenate(IV_0bi_ctb_list).astype(np.int32)
+
+    # -------------------------------------------------------------------------
+    # Transposed system of each gauge, routed backward from a unit value
+    # -------------------------------------------------------------------------
+    # Sorted upstream reaches keep each block upper triangular
+    ZM_ICT = block_diag(
+        [
+            ZM_ICN[IV_0bi_tmp][:, IV_0bi_tmp].T
+            for IV_0bi_tmp in IV_0bi_ctb_list
+        ],
+        format="csr",
+    )
+    ZM_QeT = block_diag(
+        [
+            ZM_Qex[IV_0bi_tmp][:, IV_0bi_tmp].T
+            for IV_0bi_tmp in IV_0bi_ctb_list
+        ],
+        format="csr",
+    )
+    ZM_QoT = block_diag(
+        [
+            ZM_Qou[IV_0bi_tmp][:, IV_0bi_tmp].T
+            for IV_0bi_tmp in IV_0bi_ctb_list
+        ],
+        format="csr",
+    )
+
+    IS_ctb = len(IV_0bi_ctb)
+    ZV_bwd: npt.NDArray[np.float64] = np.zeros(IS_ctb, dtype=np.float64)
+    for JS_gau in range(IS_gau):
+        ZV_bwd[
+            IV_ptr_gau[JS_gau]
+            + np.searchsorted(IV_0bi_ctb_list[JS_gau], IV_0bi_gau[JS_gau])
+        ] = 1
+
+    # For an impulse of external inflow during step 0, the outflow at substep
+    # s is the sum of the backward responses over substeps s-r to s-1, so the
+    # average over step m weighs substeps of steps m-1 and m triangularly.
+    ZV_wup = np.arange(1, IS_rat_Qex + 1, dtype=np.float64)
+    ZV_wdn = np.arange(IS_rat_Qex - 1, -1, -1, dtype=np.float64)
+
+    ZM_Krn_Qex_list = []
+    ZM_Krn_Q00_list = []
+    ZV_Krn_wup_prv = np.zeros(IS_ctb, dtype=np.float64)
+    for _ in range(IS_lag_max):
+        ZV_Krn_wup = np.zeros(IS_ctb, dtype=np.float64)
+        ZV_Krn_wdn = np.zeros(IS_ctb, dtype=np.float64)
+        ZV_Krn_fre = np.zeros(IS_ctb, dtype=np.float64)
+
+        for JS_rat_Qex in range(IS_rat_Qex):
+            ZV_Krn_fre += ZV_bwd
+            ZV_tmp = spsolve_triangular(
+                ZM_ICT, ZV_bwd, lower=False, unit_diagonal=True
+            )
+            ZV_rsp = ZM_QeT @ ZV_tmp
+            ZV_Krn_wup += ZV_wup[JS_rat_Qex] * ZV_rsp
+            ZV_Krn_wdn += ZV_wdn[JS_rat_Qex] * ZV_rsp
+            ZV_bwd = ZM_QoT @ ZV_tmp
+
+        ZM_Krn_Qex_list.append((ZV_Krn_wup_prv + ZV_Krn_wdn) / IS_rat_Qex)
+        ZM_Krn_Q00_list.append(ZV_Krn_fre / IS_rat_Qex)
+        ZV_Krn_wup_prv = ZV_Krn_wup
+
+        if np.max(np.abs(ZV_bwd)) <= ZS_tol:
+            break
+    else:
+        raise ValueError(
+            f"Kernels did not fall below {ZS_tol} within {IS_lag_max} "
+            "time steps, with a remaining backward state of "
+            f"{np.max(np.abs(ZV_bwd)):.2e}"
+        )
+
+    # The last step of external inflow still contributes to the next average
+    ZM_Krn_Qex_list.append(ZV_Krn_wup_prv / IS_rat_Qex)
+    ZM_Krn_Q00_list.append(np.zeros(IS_ctb, dtype=np.float64))
+
+    ZM_Krn_Qex = np.array(ZM_Krn_Qex_list, dtype=np.float64)
+    ZM_Krn_Q00 = np.array(ZM_Krn_Q00_list, dtype=np.float64)
+
+    return IV_0bi_ctb, IV_ptr_gau, ZM_Krn_Qex, ZM_Krn_Q00
+
+
+# *****************************************************************************
+# End
+# *****************************************************************************
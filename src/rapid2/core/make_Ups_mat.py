@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# *****************************************************************************
+# make_Ups_mat.py
+# *****************************************************************************
+
+# Author:
+# Cedric H. David, 2026-2026
+
+
+# *****************************************************************************
+# Import Python modules
+# *****************************************************************************
+import numpy as np
+import numpy.typing as npt
+from scipy.sparse import csc_matrix
+
+
+# *****************************************************************************
+# Upstream boundary matrix function
+# *****************************************************************************
+def make_Ups_mat(
+    IV_riv_ups: npt.NDArray[np.int32],
+    IV_dwn_tot: npt.NDArray[np.int32],
+    IT_0bi_tot: dict[np.int32, int],
+    IT_0bi_bas: dict[np.int32, int],
+) -> csc_matrix:
+    """Create upstream boundary matrix.
+
+    Create a matrix mapping the outflows of an upstream basin to the reaches
+    of the simulated basin that they flow into. Only the outlets of the
+    upstream basin, i.e. the reaches whose downstream river ID is in the
+    simulated basin, have a non-zero column.
+
+    Parameters
+    ----------
+    IV_riv_ups : ndarray[int32]
+        The river IDs of the upstream basin.
+    IV_dwn_tot : ndarray[int32]
+        The river IDs downstream of the river IDs in domain.
+    IT_0bi_tot : dict[int32, int]
+        The link from river ID to index in domain.
+    IT_0bi_bas : dict[int32, int]
+        The link from river ID to index in basin.
+
+    Returns
+    -------
+    ZM_Ups : scipy.sparse.spmatrix
+        The upstream boundary matrix for the basin.
+
+    Examples
+    --------
+    >>> IV_riv_ups = np.array([10, 20, 30], dtype=np.int32)
+    >>> IV_dwn_tot = np.array([30, 30, 50, 50, 0], dtype=np.int32)
+    >>> IT_0bi_tot = {np.int32(10): 0,\
+                      np.int32(20): 1,\
+                      np.int32(30): 2,\
+                      np.int32(40): 3,\
+                      np.int32(50): 4}
+    >>> IT_0bi_bas = {np.int32(40): 0,\
+                      np.int32(50): 1}
+    >>> make_Ups_mat(IV_riv_ups, IV_dwn_tot, IT_0bi_tot, IT_0bi_bas).toarray()
+    array([[0., 0., 0.],
+           [0., 0., 1.]])
+    """
+
+    IS_riv_ups = len(IV_riv_ups)
+    IS_riv_bas = len(IT_0bi_bas)
+    IV_row = []
+    IV_col = []
+    ZV_val = []
+    for JS_riv_ups in range(IS_riv_ups):
+        IS_riv = IV_riv_ups[JS_riv_ups]
+        if IS_riv in IT_0bi_bas:
+            raise ValueError(
+                f"Upstream basin: {IS_riv} is also in the simulated basin"
+            )
+        IS_dwn = IV_dwn_tot[IT_0bi_tot[IS_riv]]
+        if IS_dwn != 0 and IS_dwn in IT_0bi_bas:
+            IV_row.append(IT_0bi_bas[IS_dwn])
+            IV_col.append(JS_riv_ups)
+            ZV_val.append(1.0)
+
+    ZM_Ups = csc_matrix(
+        (ZV_val, (IV_row, IV_col)),
+        shape=(IS_riv_bas, IS_riv_ups),
+        dtype=np.float64,
+    )
+
+    return ZM_Ups
+
+
+# *****************************************************************************
+# End
+# *****************************************************************************
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# *****************************************************************************
+# make_dwn_vec.py
+# *****************************************************************************
+
+# Author:
+# Cedric H. David, 2026-2026
+
+
+# *****************************************************************************
+# Import Python modules
+# *****************************************************************************
+import numpy as np
+import numpy.typing as npt
+
+
+# *****************************************************************************
+# Synthetic river network function
+# *****************************************************************************
+def make_dwn_vec(
+    IS_riv_tot: int,
+    IS_brn: int,
+    ZS_chn: float = 0.0,
+    ZS_hdw: float = 0.0,
+    IS_sed: int = 0,
+) -> tuple[npt.NDArray[np.int32], npt.NDArray[np.int32]]:
+    """Create the connectivity of a synthetic river tree.
+
+    Create a tree with a single outlet, grown level by level from the outlet.
+    Each reach has IS_brn upstream reaches, except with probability ZS_chn
+    where it has one (the chain continues) and with probability ZS_hdw where
+    it has none (a headwater). Without randomness, IS_brn = 1 gives a chain
+    of depth IS_riv_tot, and larger values give bushier trees of depth close
+    to log(IS_riv_tot) / log(IS_brn). Larger ZS_chn give deeper trees, and
+    larger ZS_hdw give headwaters spread over more depths. River IDs are 1 to
+    IS_riv_tot and are sorted from upstream to downstream.
+
+    Parameters
+    ----------
+    IS_riv_tot : int
+        The number of river reaches.
+    IS_brn : int
+        The number of upstream reaches at confluences.
+    ZS_chn : float, optional
+        The probability that a reach has a single upstream reach.
+    ZS_hdw : float, optional
+        The probability that a reach has no upstream reach.
+    IS_sed : int, optional
+        The seed of the random number generator.
+
+    Returns
+    -------
+    IV_riv_tot : ndarray[int32]
+        The river IDs of the domain.
+    IV_dwn_tot : ndarray[int32]
+        The downstream river IDs of the domain, 0 for the outlet.
+
+    Examples
+    --------
+    >>> make_dwn_vec(4, 1)
+    (array([1, 2, 3, 4], dtype=int32), array([2, 3, 4, 0], dtype=int32))
+    >>> make_dwn_vec(7, 2)
+    (array([1, 2, 3, 4, 5, 6, 7], dtype=int32),\
+ array([5, 5, 6, 6, 7, 7, 0], dtype=int32))
+    >>> IV_riv_tot, IV_dwn_tot = make_dwn_vec(1000, 2, 0.6, 0.1, 42)
+    >>> bool(np.all((IV_dwn_tot > IV_riv_tot) | (IV_dwn_tot == 0)))
+    True
+    >>> int(np.sum(IV_dwn_tot == 0))
+    1
+    """
+
+    if IS_riv_tot < 1 or IS_brn < 1:
+        raise ValueError("IS_riv_tot and IS_brn must be at least 1")
+
+    if min(ZS_chn, ZS_hdw) < 0 or ZS_chn + ZS_hdw > 1:
+        raise ValueError("ZS_chn and ZS_hdw must be probabilities")
+
+    # -------------------------------------------------------------------------
+    # Rank of the downstream reach of each rank from the outlet
+    # -------------------------------------------------------------------------
+    if ZS_chn == 0 and ZS_hdw == 0:
+        # Complete tree, filled in breadth-first order
+        IV_rnk_dwn = (np.arange(IS_riv_tot, dtype=np.int64) - 1) // IS_brn
+    else:
+        rng = np.random.default_rng(IS_sed)
+        IV_brn_opt = np.array([0, 1, IS_brn], dtype=np.int64)
+        ZV_brn_prb = np.array([ZS_hdw, ZS_chn, 1 - ZS_chn - ZS_hdw])
+
+        IV_rnk_dwn = np.zeros(IS_riv_tot, dtype=np.int64)
+        IV_rnk_tmp = np.zeros(1, dtype=np.int64)
+        IS_rnk = 1
+        while IS_rnk < IS_riv_tot:
+            IV_brn_tmp = IV_brn_opt[
+                rng.choice(3, size=len(IV_rnk_tmp), p=ZV_brn_prb)
+            ]
+            # The tree keeps growing until it has IS_riv_tot reaches
+            if IV_brn_tmp.sum() == 0:
+                IV_brn_tmp[0] = 1
+            IV_rnk_ups = np.repeat(IV_rnk_tmp, IV_brn_tmp)
+            IV_rnk_ups = IV_rnk_ups[: IS_riv_tot - IS_rnk]
+
+            IS_ups = len(IV_rnk_ups)
+            IV_rnk_dwn[IS_rnk : IS_rnk + IS_ups] = IV_rnk_ups
+            IV_rnk_tmp = np.arange(IS_rnk, IS_rnk + IS_ups, dtype=np.int64)
+            IS_rnk += IS_ups
+
+    # -------------------------------------------------------------------------
+    # River IDs decrease with the rank, so upstream reaches come first
+    # -------------------------------------------------------------------------
+    IV_riv_tot = np.arange(1, IS_riv_tot + 1, dtype=np.int32)
+    IV_dwn_tot = (IS_riv_tot - IV_rnk_dwn[::-1]).astype(np.int32)
+    IV_dwn_tot[-1] = 0
+
+    return IV_riv_tot, IV_dwn_tot
+
+
+# *****************************************************************************
+# End
+# *****************************************************************************
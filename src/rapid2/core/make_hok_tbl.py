@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# *****************************************************************************
+# make_hok_tbl.py
+# *****************************************************************************
+
+# Author:
+# Cedric H. David, 2026-2026
+
+
+# *****************************************************************************
+# Import Python modules
+# *****************************************************************************
+import importlib
+import importlib.metadata
+from typing import Any, Callable
+
+
+# *****************************************************************************
+# Hooks function
+# *****************************************************************************
+def make_hok_tbl(YV_hok: list[str]) -> dict[str, Callable[..., Any]]:
+    """Create a hash table of the hooks called after each routing time step.
+
+    Each hook is given either as "module:attribute", or as the name of an
+    entry point of the "rapid2.hooks" group declared by an installed package.
+    After each time step, a hook is called with the zero-based index of the
+    time step, its time bounds, and read-only views of the average and
+    instantaneous outflow of the basin:
+    hook(JS_tim_all, IV_tim_now, ZV_Qou_avg, ZV_Qou_now). Hooks that have a
+    close() method are closed after the last time step.
+
+    Parameters
+    ----------
+    YV_hok : list[str]
+        The hooks, as "module:attribute" or entry point names.
+
+    Returns
+    -------
+    AT_hok : dict[str, Callable]
+        The link from each element of YV_hok to its callable.
+
+    Examples
+    --------
+    >>> make_hok_tbl(["builtins:print"])
+    {'builtins:print': <built-in function print>}
+    >>> make_hok_tbl(["not_a_hook"])
+    Traceback (most recent call last):
+    ...
+    ValueError: No entry point not_a_hook in group rapid2.hooks
+    """
+
+    AT_hok: dict[str, Callable[..., Any]] = {}
+    for YS_hok in YV_hok:
+        if ":" in YS_hok:
+            YS_mod, _, YS_att = YS_hok.partition(":")
+            try:
+                hook = getattr(importlib.import_module(YS_mod), YS_att)
+            except (ImportError, AttributeError) as e:
+                raise ValueError(f"Unable to load hook {YS_hok}") from e
+        else:
+            AV_ept = importlib.metadata.entry_points(
+                group="rapid2.hooks", name=YS_hok
+            )
+            if not AV_ept:
+                raise ValueError(
+                    f"No entry point {YS_hok} in group rapid2.hooks"
+                )
+            hook = next(iter(AV_ept)).load()
+
+        if not callable(hook):
+            raise ValueError(f"Hook {YS_hok} is not callable")
+
+        AT_hok[YS_hok] = hook
+
+    return AT_hok
+
+
+# *****************************************************************************
+# End
+# *****************************************************************************
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# *****************************************************************************
+# make_slb_tbl.py
+# *****************************************************************************
+
+# Author:
+# Cedric H. David, 2026-2026
+
+
+# *****************************************************************************
+# Import Python modules
+# *****************************************************************************
+import numpy as np
+import numpy.typing as npt
+
+
+# *****************************************************************************
+# Hyperslab table function
+# *****************************************************************************
+def make_slb_tbl(
+    IV_0bi_bas: npt.NDArray[np.int32],
+    IS_riv_tot: int,
+    IS_cnk: int = 1,
+    IS_blk: int = 1,
+    IS_ovh: int = 65536,
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    """Create the hyperslabs of the domain to read for the reaches of a basin.
+
+    Group the indices in domain of the reaches of a basin into ranges along
+    the rivid dimension, so that a basin covering a small part of the domain
+    is read without reading full rows. Indices are first rounded to units of
+    IS_cnk reaches, which is 1 when partial chunks can be read and the chunk
+    size along rivid when whole chunks must be decompressed. Two neighboring
+    ranges are merged when the reaches between them cost less to read than
+    one more hyperslab, which costs as much as reading IS_ovh values of one
+    time step, or IS_ovh / IS_blk values when reading blocks of IS_blk time
+    steps. A dense basin hence ends up in one range, and no range extends
+    beyond the reaches of the basin by more than this threshold.
+
+    Parameters
+    ----------
+    IV_0bi_bas : ndarray[int32]
+        The index in domain for river IDs in basin.
+    IS_riv_tot : int
+        The number of river reaches in the domain.
+    IS_cnk : int, optional
+        The number of reaches read together along rivid.
+    IS_blk : int, optional
+        The number of time steps read at once.
+    IS_ovh : int, optional
+        The cost of one more hyperslab, in values of one time step.
+
+    Returns
+    -------
+    IM_slb : ndarray[int64]
+        The start and end (exclusive) index in domain of each hyperslab.
+    IV_0bi_slb : ndarray[int64]
+        The index in the hyperslabs, placed end to end, for river IDs in basin.
+
+    Examples
+    --------
+    >>> IV_0bi_bas = np.array([3, 1, 2, 900, 901, 40], dtype=np.int32)
+    >>> IM_slb, IV_0bi_slb = make_slb_tbl(IV_0bi_bas, 1000, IS_ovh=16)
+    >>> IM_slb
+    array([[  1,   4],
+           [ 40,  41],
+           [900, 902]])
+    >>> IV_0bi_slb
+    array([2, 0, 1, 4, 5, 3])
+    >>> IM_slb, IV_0bi_slb = make_slb_tbl(IV_0bi_bas, 1000, IS_ovh=64)
+    >>> IM_slb
+    array([[  1,  41],
+           [900, 902]])
+    >>> IM_slb, IV_0bi_slb = make_slb_tbl(IV_0bi_bas, 1000, 256, IS_ovh=256)
+    >>> IM_slb
+    array([[   0,  256],
+           [ 768, 1000]])
+    >>> IV_0bi_slb
+    array([  3,   1,   2, 388, 389,  40])
+    """
+
+    # -------------------------------------------------------------------------
+    # Units of IS_cnk reaches touched by the basin
+    # -------------------------------------------------------------------------
+    IV_unt = np.unique(np.asarray(IV_0bi_bas, dtype=np.int64) // IS_cnk)
+    if len(IV_unt) == 0:
+        return np.zeros((0, 2), dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    # -------------------------------------------------------------------------
+    # New hyperslab where skipped reaches cost more than one more hyperslab
+    # -------------------------------------------------------------------------
+    ZS_gap = IS_ovh / max(IS_blk, 1)
+    BV_new = (np.diff(IV_unt) - 1) * IS_cnk > ZS_gap
+
+    IV_beg = IV_unt[np.concatenate(([True], BV_new))] * IS_cnk
+    IV_end = np.minimum(
+        (IV_unt[np.concatenate((BV_new, [True]))] + 1) * IS_cnk, IS_riv_tot
+    )
+    IM_slb = np.column_stack((IV_beg, IV_end))
+
+    # -------------------------------------------------------------------------
+    # Index of each reach of the basin in the hyperslabs placed end to end
+    # -------------------------------------------------------------------------
+    IV_off = np.concatenate(([0], np.cumsum(IV_end - IV_beg)[:-1]))
+    IV_slb = np.searchsorted(IV_beg, IV_0bi_bas, side="right") - 1
+    IV_0bi_slb = IV_off[IV_slb] + IV_0bi_bas - IV_beg[IV_slb]
+
+    return IM_slb, IV_0bi_slb.astype(np.int64)
+
+
+# *****************************************************************************
+# End
+# *****************************************************************************
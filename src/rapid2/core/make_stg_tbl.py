@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# *****************************************************************************
+# make_stg_tbl.py
+# *****************************************************************************
+
+# Author:
+# Cedric H. David, 2026-2026
+
+
+# *****************************************************************************
+# Import Python modules
+# *****************************************************************************
+from typing import Any
+
+import netCDF4
+
+
+# *****************************************************************************
+# Storage layout function
+# *****************************************************************************
+def make_stg_tbl(
+    IS_riv: int,
+    YS_cmp: str = "zlib",
+    IS_lvl: int = 1,
+    BS_shf: bool = True,
+    IS_lsd: int | None = None,
+    IV_cnk: list[int] | None = None,
+) -> dict[str, dict[str, Any]]:
+    """Create a hash table of the storage layout of netCDF variables.
+
+    Create the keyword arguments of netCDF4 createVariable() for each variable
+    of discharge files, which set chunk shapes, compression, and quantization.
+    Unless given, the chunks of (time, rivid) variables span as many time
+    steps as possible (up to 256) while one row of chunks across all reaches
+    stays within 2**22 values, so that writing one time step at a time keeps
+    all the chunks being filled in the default 64 MiB chunk cache, and each
+    chunk holds about 2**16 values, so that reading the time series of one
+    reach decompresses little more than needed. Quantization to IS_lsd
+    decimal digits only applies to float32 discharge variables.
+
+    Parameters
+    ----------
+    IS_riv : int
+        The number of river reaches.
+    YS_cmp : str, optional
+        The compression, one of "zlib", "zstd", or "none".
+    IS_lvl : int, optional
+        The compression level.
+    BS_shf : bool, optional
+        Whether the bytes are shuffled before compression.
+    IS_lsd : int, optional
+        The number of decimal digits kept in discharge, none if not given.
+    IV_cnk : list[int], optional
+        The chunk shape of (time, rivid) variables, computed if not given.
+
+    Returns
+    -------
+    AT_stg : dict[str, dict[str, Any]]
+        The link from each variable name to its createVariable() arguments.
+
+    Examples
+    --------
+    >>> make_stg_tbl(100000, IS_lsd=2)["Qout"]
+    {'compression': 'zlib', 'complevel': 1, 'shuffle': True,\
+ 'chunksizes': (32, 2048), 'least_significant_digit': 2}
+    >>> make_stg_tbl(5)["Qout"]["chunksizes"]
+    (256, 5)
+    >>> make_stg_tbl(5)["rivid"]
+    {'compression': 'zlib', 'complevel': 1, 'shuffle': True}
+    >>> make_stg_tbl(5, YS_cmp="none")
+    {}
+    >>> make_stg_tbl(5, YS_cmp="none", IV_cnk=[10, 5])["Qout"]
+    {'chunksizes': (10, 5)}
+    >>> make_stg_tbl(5, YS_cmp="lzma")
+    Traceback (most recent call last):
+    ...
+    ValueError: Unknown compression lzma, expected zlib, zstd, or none
+    """
+
+    if YS_cmp not in ("zlib", "zstd", "none"):
+        raise ValueError(
+            f"Unknown compression {YS_cmp}, expected zlib, zstd, or none"
+        )
+
+    if YS_cmp == "zstd" and not netCDF4.__has_zstandard_support__:
+        raise ValueError("This netCDF library does not support zstd")
+
+    if IV_cnk is not None and (len(IV_cnk) != 2 or min(IV_cnk) < 1):
+        raise ValueError("IV_cnk must be two positive chunk sizes")
+
+    # -------------------------------------------------------------------------
+    # Uncompressed variables are contiguous unless chunks are given
+    # -------------------------------------------------------------------------
+    if YS_cmp == "none":
+        if IV_cnk is None:
+            return {}
+        AT_cmp: dict[str, Any] = {}
+    else:
+        AT_cmp = {
+            "compression": YS_cmp,
+            "complevel": IS_lvl,
+            "shuffle": BS_shf,
+        }
+
+    # -------------------------------------------------------------------------
+    # Chunk shape of (time, rivid) variables
+    # -------------------------------------------------------------------------
+    if IV_cnk is None:
+        IS_cnk_tim = min(256, max(1, 2**22 // IS_riv))
+        IS_cnk_tim = 2 ** (IS_cnk_tim.bit_length() - 1)
+        IS_cnk_riv = min(IS_riv, max(1, 2**16 // IS_cnk_tim))
+    else:
+        IS_cnk_tim, IS_cnk_riv = IV_cnk
+
+    # -------------------------------------------------------------------------
+    # Arguments of each variable
+    # -------------------------------------------------------------------------
+    AT_Qou = {**AT_cmp, "chunksizes": (IS_cnk_tim, IS_cnk_riv)}
+    AT_sta = dict(AT_cmp)
+    if IS_lsd is not None:
+        AT_Qou["least_significant_digit"] = IS_lsd
+        AT_sta["least_significant_digit"] = IS_lsd
+
+    AT_stg = {
+        "time": {**AT_cmp, "chunksizes": (1024,)},
+        "time_bnds": {**AT_cmp, "chunksizes": (1024, 2)},
+        "rivid": AT_cmp,
+        "lon": AT_cmp,
+        "lat": AT_cmp,
+        "Qout": AT_Qou,
+        "Qout_bia": AT_sta,
+        "Qout_var": AT_sta,
+        "Qout_cov": AT_sta,
+    }
+
+    return AT_stg
+
+
+# *****************************************************************************
+# End
+# *****************************************************************************
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# *****************************************************************************
+# prep_Qat_ncf.py
+# *****************************************************************************
+
+# Author:
+# Cedric H. David, 2026-2026
+
+
+# *****************************************************************************
+# Import Python modules
+# *****************************************************************************
+import netCDF4
+import numpy as np
+import numpy.typing as npt
+
+from rapid2.core.prep_skl_ncf import prep_skl_ncf
+
+
+# *****************************************************************************
+# Make attributed discharge (Qat) file
+# *****************************************************************************
+def prep_Qat_ncf(
+    IV_riv: npt.NDArray[np.int32],
+    ZV_lon: npt.NDArray[np.float64],
+    ZV_lat: npt.NDArray[np.float64],
+    IV_reg: npt.NDArray[np.int32],
+    Qat_ncf: str,
+) -> None:
+    """Create an attributed discharge file with basic metadata.
+
+    Create a file for the contribution of each region to the discharge of
+    each river ID, with populated values for river ID, longitude, latitude,
+    and region labels. The contribution of the initial state is kept apart,
+    so that the sum over regions plus the initial state is the discharge.
+
+    Parameters
+    ----------
+    IV_riv : ndarray[int32]
+        The river IDs to include in the file.
+    ZV_lon : ndarray[float64]
+        The longitudes related to river IDs.
+    ZV_lat : ndarray[float64]
+        The latitudes related to river IDs.
+    IV_reg : ndarray[int32]
+        The region labels.
+    Qat_ncf : str
+        Path to the attributed discharge file.
+
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    >>> IV_riv = np.array([30, 50], dtype=np.int32)
+    >>> ZV_lon = np.array([1.0, 0.5])
+    >>> ZV_lat = np.array([3.0, 1.0])
+    >>> IV_reg = np.array([1, 2, 3], dtype=np.int32)
+    >>> Qat_ncf = "./output/Sandbox/Qat_Sandbox_19700101_19700110_tst.nc4"
+    >>> prep_Qat_ncf(IV_riv, ZV_lon, ZV_lat, IV_reg, Qat_ncf)
+    >>> a = netCDF4.Dataset(Qat_ncf, "r")
+    >>> a.variables["region"][:].filled()
+    array([1, 2, 3], dtype=int32)
+    >>> a.variables["Qout"].dimensions
+    ('time', 'rivid', 'region')
+    >>> all(var in a.variables for var in ["Qout_Q00", "time_bnds"])
+    True
+    >>> import os
+    >>> os.remove(Qat_ncf)
+    """
+
+    # -------------------------------------------------------------------------
+    # Create skeleton file
+    # -------------------------------------------------------------------------
+    prep_skl_ncf(IV_riv, ZV_lon, ZV_lat, Qat_ncf)
+
+    # -------------------------------------------------------------------------
+    # Open file to make changes
+    # -------------------------------------------------------------------------
+    a = netCDF4.Dataset(Qat_ncf, "a")
+
+    # -------------------------------------------------------------------------
+    # Create dimensions
+    # -------------------------------------------------------------------------
+    a.createDimension("nv", 2)
+    a.createDimension("region", len(IV_reg))
+
+    # -------------------------------------------------------------------------
+    # Create variables
+    # -------------------------------------------------------------------------
+    ZS_fll = float(1e20)
+
+    region = a.createVariable("region", "int32", ("region",))
+    region.long_name = "label of each region contributing to outflow"
+    region.units = "1"
+
+    Qout = a.createVariable(
+        "Qout",
+        "float32",
+        (
+            "time",
+            "rivid",
+            "region",
+        ),
+        fill_value=ZS_fll,
+    )
+    Qout.long_name = (
+        "mean river water outflow downstream of each river reach "
+        "originating from external inflow in each region"
+    )
+    Qout.units = "m3 s-1"
+    Qout.coordinates = "lon lat"
+    Qout.grid_mapping = "crs"
+    Qout.cell_methods = "time: mean"
+
+    Qout_Q00 = a.createVariable(
+        "Qout_Q00",
+        "float32",
+        (
+            "time",
+            "rivid",
+        ),
+        fill_value=ZS_fll,
+    )
+    Qout_Q00.long_name = (
+        "mean river water outflow downstream of each river reach "
+        "originating from the initial outflow"
+    )
+    Qout_Q00.units = "m3 s-1"
+    Qout_Q00.coordinates = "lon lat"
+    Qout_Q00.grid_mapping = "crs"
+    Qout_Q00.cell_methods = "time: mean"
+
+    time_bnds = a.createVariable(
+        "time_bnds",
+        "int32",
+        (
+            "time",
+            "nv",
+        ),
+    )
+    time_bnds.long_name = "time bounds"
+
+    a.variables["time"].bounds = "time_bnds"
+
+    # -------------------------------------------------------------------------
+    # Populate variables
+    # -------------------------------------------------------------------------
+    region[:] = IV_reg[:]
+
+    # -------------------------------------------------------------------------
+    # Close file to allow populating all data
+    # -------------------------------------------------------------------------
+    a.close()
+
+
+# *****************************************************************************
+# End
+# *****************************************************************************
@@ -10,6 +10,8 @@
 # *****************************************************************************
 # Import Python modules
 # *****************************************************************************
+from typing import Any
+
 import netCDF4
 import numpy as np
 import numpy.typing as npt
@@ -25,6 +27,7 @@ def prep_Qfi_ncf(
     ZV_lon_tot: npt.NDArray[np.float64],
     ZV_lat_tot: npt.NDArray[np.float64],
     Qfi_ncf: str,
+    AT_stg: dict[str, dict[str, Any]] | None = None,
 ) -> None:
     """Create instantaneous discharge file populated with basic metadata.
 
@@ -41,6 +44,9 @@ def prep_Qfi_ncf(
         The latitudes related to river IDs of the domain.
     Qfi_ncf : str
         Path to the instantaneous discharge file.
+    AT_stg : dict[str, dict[str, Any]], optional
+        The storage layout of variables, as created by make_stg_tbl. The
+        single time step of discharge is one chunk and is not quantized.
 
     Returns
     -------
@@ -64,10 +70,18 @@ def prep_Qfi_ncf(
     >>> os.remove(Qfi_ncf)
     """
 
+    if AT_stg is None:
+        AT_stg = {}
+
+    AT_Qfi = dict(AT_stg.get("Qout", {}))
+    AT_Qfi.pop("least_significant_digit", None)
+    if "chunksizes" in AT_Qfi:
+        AT_Qfi["chunksizes"] = (1, len(IV_riv_tot))
+
     # -------------------------------------------------------------------------
     # Create skeleton file
     # -------------------------------------------------------------------------
-    prep_skl_ncf(IV_riv_tot, ZV_lon_tot, ZV_lat_tot, Qfi_ncf)
+    prep_skl_ncf(IV_riv_tot, ZV_lon_tot, ZV_lat_tot, Qfi_ncf, AT_stg)
 
     # -------------------------------------------------------------------------
     # Open file to make changes
@@ -87,6 +101,7 @@ def prep_Qfi_ncf(
             "rivid",
         ),
         fill_value=ZS_fll,
+        **AT_Qfi,
     )
     Qout.long_name = (
         "instantaneous river water outflow downstream of each river reach"
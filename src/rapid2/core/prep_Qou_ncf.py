@@ -10,6 +10,8 @@
 # *****************************************************************************
 # Import Python modules
 # *****************************************************************************
+from typing import Any
+
 import netCDF4
 import numpy as np
 import numpy.typing as npt
@@ -25,6 +27,7 @@ def prep_Qou_ncf(
     ZV_lon: npt.NDArray[np.float64],
     ZV_lat: npt.NDArray[np.float64],
     Qou_ncf: str,
+    AT_stg: dict[str, dict[str, Any]] | None = None,
 ) -> None:
     """Create a discharge output file with basic metadata.
 
@@ -41,6 +44,8 @@ def prep_Qou_ncf(
         The latitudes related to river IDs.
     Qou_ncf : str
         Path to the discharge output file.
+    AT_stg : dict[str, dict[str, Any]], optional
+        The storage layout of variables, as created by make_stg_tbl.
 
     Returns
     -------
@@ -70,10 +75,13 @@ def prep_Qou_ncf(
     >>> os.remove(Qou_ncf)
     """
 
+    if AT_stg is None:
+        AT_stg = {}
+
     # -------------------------------------------------------------------------
     # Create skeleton file
     # -------------------------------------------------------------------------
-    prep_skl_ncf(IV_riv, ZV_lon, ZV_lat, Qou_ncf)
+    prep_skl_ncf(IV_riv, ZV_lon, ZV_lat, Qou_ncf, AT_stg)
 
     # -------------------------------------------------------------------------
     # Open file to make changes
@@ -98,6 +106,7 @@ def prep_Qou_ncf(
             "rivid",
         ),
         fill_value=ZS_fll,
+        **AT_stg.get("Qout", {}),
     )
     Qout.long_name = "mean river water outflow downstream of each river reach"
     Qout.units = "m3 s-1"
@@ -112,13 +121,18 @@ def prep_Qou_ncf(
             "time",
             "nv",
         ),
+        **AT_stg.get("time_bnds", {}),
     )
     time_bnds.long_name = "time bounds"
 
     g.variables["time"].bounds = "time_bnds"
 
     Qout_bia = g.createVariable(
-        "Qout_bia", "float32", "rivid", fill_value=ZS_fll
+        "Qout_bia",
+        "float32",
+        "rivid",
+        fill_value=ZS_fll,
+        **AT_stg.get("Qout_bia", {}),
     )
     Qout_bia.long_name = (
         "mean river water outflow error downstream of each river reach"
@@ -131,7 +145,11 @@ def prep_Qou_ncf(
     Qout_bia.interval = "temporal resolution does not impact computation"
 
     Qout_var = g.createVariable(
-        "Qout_var", "float32", "rivid", fill_value=ZS_fll
+        "Qout_var",
+        "float32",
+        "rivid",
+        fill_value=ZS_fll,
+        **AT_stg.get("Qout_var", {}),
     )
     Qout_var.long_name = (
         "variance of river water outflow error downstream of each river reach"
@@ -144,7 +162,11 @@ def prep_Qou_ncf(
     Qout_var.interval = "typically same temporal resolution as observations"
 
     Qout_cov = g.createVariable(
-        "Qout_cov", "float32", "rivid", fill_value=ZS_fll
+        "Qout_cov",
+        "float32",
+        "rivid",
+        fill_value=ZS_fll,
+        **AT_stg.get("Qout_cov", {}),
     )
     Qout_cov.long_name = (
         "indicative covariance between river water outflow "
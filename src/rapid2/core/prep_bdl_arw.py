@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# *****************************************************************************
+# prep_bdl_arw.py
+# *****************************************************************************
+
+# Author:
+# Cedric H. David, 2026-2026
+
+
+# *****************************************************************************
+# Import Python modules
+# *****************************************************************************
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+
+# *****************************************************************************
+# Make network bundle file
+# *****************************************************************************
+def prep_bdl_arw(AT_col: dict[str, npt.NDArray[Any]], bdl_arw: str) -> None:
+    """Create a network bundle file from aligned columns.
+
+    Create an uncompressed Arrow IPC file with one column per array of
+    AT_col, all with one value per river ID of the domain in the order of the
+    riv column, e.g., riv and dwn from the connectivity file, kpr and xpr
+    from the parameter files, and bas, the index of each river ID in the
+    basin or -1. The columns are written in a single record batch so that
+    read_bdl_vec can memory-map them without copying.
+
+    Parameters
+    ----------
+    AT_col : dict[str, ndarray]
+        The link from column name to its values.
+    bdl_arw : str
+        Path to the network bundle file.
+
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    >>> IV_riv = np.array([10, 20, 30, 40, 50], dtype=np.int32)
+    >>> ZV_kpr = np.full(5, 9000.0)
+    >>> bdl_arw = "./output/Sandbox/bdl_tst.arrow"
+    >>> prep_bdl_arw({"riv": IV_riv, "kpr": ZV_kpr}, bdl_arw)
+    >>> ipc.open_file(bdl_arw).schema
+    riv: int32 not null
+    kpr: double not null
+    >>> prep_bdl_arw({"riv": IV_riv, "kpr": ZV_kpr[:4]}, bdl_arw)
+    Traceback (most recent call last):
+    ...
+    ValueError: Size of kpr differs from size of riv
+    >>> import os
+    >>> os.remove(bdl_arw)
+    """
+
+    if "riv" not in AT_col:
+        raise ValueError("No riv column in network bundle")
+
+    for YS_col, ZV_col in AT_col.items():
+        if len(ZV_col) != len(AT_col["riv"]):
+            raise ValueError(f"Size of {YS_col} differs from size of riv")
+
+    table = pa.table({YS_col: np.asarray(ZV) for YS_col, ZV in AT_col.items()})
+    schema = pa.schema([field.with_nullable(False) for field in table.schema])
+    table = table.cast(schema)
+
+    with pa.OSFile(bdl_arw, "wb") as sink:
+        with ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table, max_chunksize=max(table.num_rows, 1))
+
+
+# *****************************************************************************
+# End
+# *****************************************************************************
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# *****************************************************************************
+# prep_grp_pqt.py
+# *****************************************************************************
+
+# Author:
+# Cedric H. David, 2026-2026
+
+
+# *****************************************************************************
+# Import Python modules
+# *****************************************************************************
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+# *****************************************************************************
+# Make Parquet file sorted in row groups
+# *****************************************************************************
+def prep_grp_pqt(
+    AT_col: dict[str, npt.NDArray[Any]], grp_pqt: str, IS_grp: int = 65536
+) -> None:
+    """Create a Parquet file sorted by river ID, in row groups.
+
+    Create a Parquet file with one column per array of AT_col, e.g., riv and
+    kpr, with rows sorted by river ID and written in row groups of IS_grp
+    rows, each with the statistics of its range of river IDs. Reading the
+    river IDs of a basin with read_grp_vec then skips the row groups holding
+    none of them.
+
+    Parameters
+    ----------
+    AT_col : dict[str, ndarray]
+        The link from column name to its values, including riv.
+    grp_pqt : str
+        Path to the Parquet file.
+    IS_grp : int, optional
+        The number of rows of each row group.
+
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    >>> IV_riv = np.array([50, 40, 30, 20, 10], dtype=np.int32)
+    >>> ZV_kpr = np.array([5.0, 4.0, 3.0, 2.0, 1.0])
+    >>> grp_pqt = "./output/Sandbox/kpr_grp_tst.parquet"
+    >>> prep_grp_pqt({"riv": IV_riv, "kpr": ZV_kpr}, grp_pqt, 2)
+    >>> parquet = pq.ParquetFile(grp_pqt)
+    >>> parquet.metadata.num_row_groups
+    3
+    >>> stats = parquet.metadata.row_group(1).column(0).statistics
+    >>> stats.min, stats.max
+    (30, 40)
+    >>> import os
+    >>> os.remove(grp_pqt)
+    """
+
+    if "riv" not in AT_col:
+        raise ValueError(f"No riv column for {grp_pqt}")
+    if IS_grp < 1:
+        raise ValueError("The row group size must be at least 1")
+
+    IV_srt = np.argsort(AT_col["riv"], kind="stable")
+
+    table = pa.table(
+        {YS_col: np.asarray(ZV)[IV_srt] for YS_col, ZV in AT_col.items()}
+    )
+    schema = pa.schema([field.with_nullable(False) for field in table.schema])
+    table = table.cast(schema)
+
+    pq.write_table(
+        table, grp_pqt, row_group_size=IS_grp, write_statistics=True
+    )
+
+
+# *****************************************************************************
+# End
+# *****************************************************************************
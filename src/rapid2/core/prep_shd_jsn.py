@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# *****************************************************************************
+# prep_shd_jsn.py
+# *****************************************************************************
+
+# Author:
+# Cedric H. David, 2026-2026
+
+
+# *****************************************************************************
+# Import Python modules
+# *****************************************************************************
+import json
+import os
+
+
+# *****************************************************************************
+# Make manifest of shards
+# *****************************************************************************
+def prep_shd_jsn(
+    AV_shd: list[tuple[str, int, int, int]],
+    shd_jsn: str,
+) -> None:
+    """Create the manifest of RAPID-compatible netCDF files sharded in time.
+
+    Create a JSON file listing consecutive RAPID-compatible netCDF files that
+    together hold one output, e.g., one Qou file per year, with the number of
+    time steps and the epoch time bounds of each file. Paths are written
+    relative to the manifest, so that the manifest and its shards can be
+    moved or replicated together. The manifest is replaced at once, so that
+    readers never find it incomplete while a run is still adding shards.
+
+    Parameters
+    ----------
+    AV_shd : list[tuple[str, int, int, int]]
+        For each shard, in time order, its path, its number of time steps,
+        and the epoch time of the start of its first and the end of its last
+        time step.
+    shd_jsn : str
+        Path to the manifest.
+
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    >>> Qou_ncf = "./output/Sandbox/Qou_Sandbox_19700101_19700110_TR.nc4"
+    >>> shd_jsn = "./output/Sandbox/Qou_Sandbox_19700101_19700110_tst.json"
+    >>> prep_shd_jsn([(Qou_ncf, 80, 0, 864000)], shd_jsn)
+    >>> with open(shd_jsn) as jsn:
+    ...     AT_shd = json.load(jsn)
+    >>> AT_shd["format"]
+    'rapid2-shards'
+    >>> AT_shd["shards"]
+    [{'path': 'Qou_Sandbox_19700101_19700110_TR.nc4', 'time_steps': 80,\
+ 'time_start': 0, 'time_end': 864000}]
+    >>> os.remove(shd_jsn)
+    """
+
+    YS_dir = os.path.dirname(os.path.abspath(shd_jsn))
+
+    AT_shd = {
+        "format": "rapid2-shards",
+        "version": 1,
+        "shards": [
+            {
+                "path": os.path.relpath(os.path.abspath(YS_shd), YS_dir),
+                "time_steps": int(IS_tim),
+                "time_start": int(IS_tim_beg),
+                "time_end": int(IS_tim_end),
+            }
+            for YS_shd, IS_tim, IS_tim_beg, IS_tim_end in AV_shd
+        ],
+    }
+
+    tmp_jsn = f"{shd_jsn}.{os.getpid()}.tmp"
+    with open(tmp_jsn, "w") as jsn:
+        json.dump(AT_shd, jsn, indent=2)
+    os.replace(tmp_jsn, shd_jsn)
+
+
+# *****************************************************************************
+# End
+# *****************************************************************************
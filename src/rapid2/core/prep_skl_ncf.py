@@ -11,6 +11,7 @@
 # Import Python modules
 # *****************************************************************************
 from datetime import datetime, timezone
+from typing import Any
 
 import netCDF4
 import numpy as np
@@ -25,6 +26,7 @@ def prep_skl_ncf(
     ZV_lon: npt.NDArray[np.float64],
     ZV_lat: npt.NDArray[np.float64],
     skl_ncf: str,
+    AT_stg: dict[str, dict[str, Any]] | None = None,
 ) -> None:
     """Create skeleton netCDF file following CF conventions for RAPID.
 
@@ -42,6 +44,8 @@ def prep_skl_ncf(
         The latitudes related to river IDs.
     skl_ncf : str
         Path to the skeleton netCDF file.
+    AT_stg : dict[str, dict[str, Any]], optional
+        The storage layout of variables, as created by make_stg_tbl.
 
     Returns
     -------
@@ -65,6 +69,9 @@ def prep_skl_ncf(
     >>> os.remove(skl_ncf)
     """
 
+    if AT_stg is None:
+        AT_stg = {}
+
     # -------------------------------------------------------------------------
     # Get UTC date and time
     # -------------------------------------------------------------------------
@@ -84,25 +91,33 @@ def prep_skl_ncf(
     # -------------------------------------------------------------------------
     # Create variables
     # -------------------------------------------------------------------------
-    time = s.createVariable("time", "int32", ("time",))
+    time = s.createVariable(
+        "time", "int32", ("time",), **AT_stg.get("time", {})
+    )
     time.standard_name = "time"
     time.long_name = "time"
     time.units = "seconds since 1970-01-01 00:00:00 +00:00"
     time.axis = "T"
     time.calendar = "gregorian"
 
-    rivid = s.createVariable("rivid", "int32", ("rivid",))
+    rivid = s.createVariable(
+        "rivid", "int32", ("rivid",), **AT_stg.get("rivid", {})
+    )
     rivid.long_name = "unique identifier for each river reach"
     rivid.units = "1"
     rivid.cf_role = "timeseries_id"
 
-    lon = s.createVariable("lon", "float64", ("rivid",))
+    lon = s.createVariable(
+        "lon", "float64", ("rivid",), **AT_stg.get("lon", {})
+    )
     lon.standard_name = "longitude"
     lon.long_name = "longitude of a point related to each river reach"
     lon.units = "degrees_east"
     lon.axis = "X"
 
-    lat = s.createVariable("lat", "float64", ("rivid",))
+    lat = s.createVariable(
+        "lat", "float64", ("rivid",), **AT_stg.get("lat", {})
+    )
     lat.standard_name = "latitude"
     lat.long_name = "latitude of a point related to each river reach"
     lat.units = "degrees_north"
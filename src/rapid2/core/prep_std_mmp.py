@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# *****************************************************************************
+# prep_std_mmp.py
+# *****************************************************************************
+
+# Author:
+# Cedric H. David, 2026-2026
+
+
+# *****************************************************************************
+# Import Python modules
+# *****************************************************************************
+import json
+import os
+from datetime import datetime, timezone
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+
+# *****************************************************************************
+# Make memory-mapped store of discharge
+# *****************************************************************************
+def prep_std_mmp(
+    IV_riv: npt.NDArray[np.int32],
+    ZV_lon: npt.NDArray[np.float64],
+    ZV_lat: npt.NDArray[np.float64],
+    IS_tim: int,
+    std_mmp: str,
+    YS_dty: str = "float32",
+    YS_var: str = "Qout",
+    AT_att: dict[str, Any] | None = None,
+) -> None:
+    """Create a memory-mapped store of discharge with basic metadata.
+
+    Create a directory holding one raw binary file in C order per variable of
+    RAPID-compatible netCDF files (rivid, lon, lat, time, time_bnds, and
+    discharge, e.g., Qout or Qext) and a header.json file with their dtype,
+    shape, dimensions, fill value, and the global attributes. The river ID,
+    longitude, and latitude are populated, and time and time_bnds are filled,
+    so that a time step is complete once its time_bnds no longer hold the
+    fill value. All files have their final size, so they can be memory-mapped
+    by readers while a run is still writing them.
+
+    Parameters
+    ----------
+    IV_riv : ndarray[int32]
+        The river IDs to include in the store.
+    ZV_lon : ndarray[float64]
+        The longitudes related to river IDs.
+    ZV_lat : ndarray[float64]
+        The latitudes related to river IDs.
+    IS_tim : int
+        The number of time steps.
+    std_mmp : str
+        Path to the directory of the store.
+    YS_dty : str, optional
+        The dtype of discharge, float32 for Qou and float64 for Qfi.
+    YS_var : str, optional
+        The name of the discharge variable.
+    AT_att : dict[str, Any], optional
+        Global attributes added to those of RAPID-compatible files.
+
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    >>> IV_riv = np.array([10, 20, 30, 40, 50], dtype=np.int32)
+    >>> ZV_lon = np.array([0.5, 2.0, 1.0, 2.0, 0.5])
+    >>> ZV_lat = np.array([5.0, 4.5, 3.0, 2.5, 1.0])
+    >>> Qou_mmp = "./output/Sandbox/Qou_Sandbox_19700101_19700110_tst.mmp"
+    >>> prep_std_mmp(IV_riv, ZV_lon, ZV_lat, 3, Qou_mmp)
+    >>> sorted(os.listdir(Qou_mmp))
+    ['Qout.bin', 'header.json', 'lat.bin', 'lon.bin', 'rivid.bin',\
+ 'time.bin', 'time_bnds.bin']
+    >>> with open(os.path.join(Qou_mmp, "header.json")) as jsn:
+    ...     AT_hdr = json.load(jsn)
+    >>> AT_hdr["variables"]["Qout"]
+    {'dtype': 'float32', 'shape': [3, 5], 'dims': ['time', 'rivid'],\
+ '_FillValue': 1e+20}
+    >>> np.fromfile(os.path.join(Qou_mmp, "rivid.bin"), dtype=np.int32)
+    array([10, 20, 30, 40, 50], dtype=int32)
+    >>> import shutil
+    >>> shutil.rmtree(Qou_mmp)
+    """
+
+    IS_riv = len(IV_riv)
+    IS_fll = int(np.iinfo(np.int32).min + 1)
+    ZS_fll = float(1e20)
+
+    # -------------------------------------------------------------------------
+    # Variables, with the same names, dimensions, and fill values as netCDF
+    # -------------------------------------------------------------------------
+    AT_var: dict[str, dict[str, Any]] = {
+        "rivid": {"dtype": "int32", "shape": [IS_riv], "dims": ["rivid"]},
+        "lon": {"dtype": "float64", "shape": [IS_riv], "dims": ["rivid"]},
+        "lat": {"dtype": "float64", "shape": [IS_riv], "dims": ["rivid"]},
+        "time": {
+            "dtype": "int32",
+            "shape": [IS_tim],
+            "dims": ["time"],
+            "_FillValue": IS_fll,
+        },
+        "time_bnds": {
+            "dtype": "int32",
+            "shape": [IS_tim, 2],
+            "dims": ["time", "nv"],
+            "_FillValue": IS_fll,
+        },
+        YS_var: {
+            "dtype": YS_dty,
+            "shape": [IS_tim, IS_riv],
+            "dims": ["time", "rivid"],
+            "_FillValue": ZS_fll,
+        },
+    }
+
+    YS_dat = datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+    AT_att_all = {
+        "Conventions": "CF-1.6",
+        "title": "",
+        "institution": "",
+        "source": "RAPID2",
+        "history": "date created: " + YS_dat,
+        "references": "https://github.com/c-h-david/rapid2/",
+        "comment": "",
+        "featureType": "timeSeries",
+        **(AT_att or {}),
+    }
+    AT_hdr = {
+        "format": "rapid2-memmap",
+        "version": 1,
+        "variables": AT_var,
+        "attributes": AT_att_all,
+    }
+
+    # -------------------------------------------------------------------------
+    # Create files at their final size, discharge stays sparse until written
+    # -------------------------------------------------------------------------
+    os.makedirs(std_mmp, exist_ok=True)
+
+    hdr_jsn = os.path.join(std_mmp, "header.json")
+    if os.path.isfile(hdr_jsn):
+        os.remove(hdr_jsn)
+
+    for YS_key, AT in AT_var.items():
+        ZS_byt = np.dtype(AT["dtype"]).itemsize * int(np.prod(AT["shape"]))
+        with open(os.path.join(std_mmp, f"{YS_key}.bin"), "wb") as raw:
+            raw.truncate(ZS_byt)
+
+    IV_riv.astype(np.int32).tofile(os.path.join(std_mmp, "rivid.bin"))
+    ZV_lon.astype(np.float64).tofile(os.path.join(std_mmp, "lon.bin"))
+    ZV_lat.astype(np.float64).tofile(os.path.join(std_mmp, "lat.bin"))
+    np.full(IS_tim, IS_fll, dtype=np.int32).tofile(
+        os.path.join(std_mmp, "time.bin")
+    )
+    np.full((IS_tim, 2), IS_fll, dtype=np.int32).tofile(
+        os.path.join(std_mmp, "time_bnds.bin")
+    )
+
+    # -------------------------------------------------------------------------
+    # Header written last, so that a store with a header is complete
+    # -------------------------------------------------------------------------
+    with open(hdr_jsn, "w") as jsn:
+        json.dump(AT_hdr, jsn, indent=2)
+
+
+# *****************************************************************************
+# End
+# *****************************************************************************
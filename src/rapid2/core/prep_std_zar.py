@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# *****************************************************************************
+# prep_std_zar.py
+# *****************************************************************************
+
+# Author:
+# Cedric H. David, 2026-2026
+
+
+# *****************************************************************************
+# Import Python modules
+# *****************************************************************************
+from datetime import datetime, timezone
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+
+# *****************************************************************************
+# Make Zarr store of discharge
+# *****************************************************************************
+def prep_std_zar(
+    IV_riv: npt.NDArray[np.int32],
+    ZV_lon: npt.NDArray[np.float64],
+    ZV_lat: npt.NDArray[np.float64],
+    IS_tim: int,
+    std_zar: str,
+    YS_dty: str = "float32",
+    AT_stg: dict[str, dict[str, Any]] | None = None,
+) -> None:
+    """Create a chunked Zarr store of discharge with basic metadata.
+
+    Create a Zarr (version 3) group on local disk with the variables of
+    RAPID-compatible netCDF files (rivid, lon, lat, time, time_bnds, Qout),
+    their dimension names, and the global attributes. The river ID,
+    longitude, and latitude are populated, and time steps are complete once
+    their time_bnds no longer hold the fill value. The chunk shape and
+    compression of Qout follow AT_stg, with zlib or zstd applied by Blosc.
+    Requires the optional zarr package.
+
+    Parameters
+    ----------
+    IV_riv : ndarray[int32]
+        The river IDs to include in the store.
+    ZV_lon : ndarray[float64]
+        The longitudes related to river IDs.
+    ZV_lat : ndarray[float64]
+        The latitudes related to river IDs.
+    IS_tim : int
+        The number of time steps.
+    std_zar : str
+        Path to the directory of the store.
+    YS_dty : str, optional
+        The dtype of discharge, float32 for Qou and float64 for Qfi.
+    AT_stg : dict[str, dict[str, Any]], optional
+        The storage layout of variables, as created by make_stg_tbl.
+
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    >>> import zarr
+    >>> from rapid2 import make_stg_tbl
+    >>> IV_riv = np.array([10, 20, 30, 40, 50], dtype=np.int32)
+    >>> ZV_lon = np.array([0.5, 2.0, 1.0, 2.0, 0.5])
+    >>> ZV_lat = np.array([5.0, 4.5, 3.0, 2.5, 1.0])
+    >>> Qou_zar = "./output/Sandbox/Qou_Sandbox_19700101_19700110_tst.zarr"
+    >>> AT_stg = make_stg_tbl(5, IV_cnk=[2, 5])
+    >>> prep_std_zar(IV_riv, ZV_lon, ZV_lat, 3, Qou_zar, "float32", AT_stg)
+    >>> z = zarr.open_group(Qou_zar, mode="r")
+    >>> z["rivid"][:]
+    array([10, 20, 30, 40, 50], dtype=int32)
+    >>> z["Qout"].chunks
+    (2, 5)
+    >>> z["Qout"].metadata.dimension_names
+    ('time', 'rivid')
+    >>> z.attrs["source"]
+    'RAPID2'
+    >>> import shutil
+    >>> shutil.rmtree(Qou_zar)
+    """
+
+    try:
+        import zarr
+        from zarr.codecs import BloscCodec
+    except ImportError as e:
+        raise ValueError(
+            "The zarr package is required, e.g., pip install rapid2[zarr]"
+        ) from e
+
+    if AT_stg is None:
+        AT_stg = {}
+
+    IS_riv = len(IV_riv)
+    IS_fll = int(np.iinfo(np.int32).min + 1)
+    ZS_fll = float(1e20)
+
+    # -------------------------------------------------------------------------
+    # Chunk shape and compression of Qout
+    # -------------------------------------------------------------------------
+    AT_Qou = AT_stg.get("Qout", {})
+    IV_cnk = AT_Qou.get("chunksizes", (1, IS_riv))
+    IV_cnk = (min(IV_cnk[0], max(IS_tim, 1)), min(IV_cnk[1], IS_riv))
+
+    AV_cmp: list[Any] = []
+    if "compression" in AT_Qou:
+        AV_cmp.append(
+            BloscCodec(
+                cname=AT_Qou["compression"],
+                clevel=AT_Qou["complevel"],
+                shuffle="shuffle" if AT_Qou["shuffle"] else "noshuffle",
+            )
+        )
+
+    # -------------------------------------------------------------------------
+    # Create group and variables
+    # -------------------------------------------------------------------------
+    z = zarr.open_group(std_zar, mode="w")
+
+    rivid = z.create_array(
+        "rivid", shape=(IS_riv,), dtype="int32", dimension_names=["rivid"]
+    )
+    lon = z.create_array(
+        "lon", shape=(IS_riv,), dtype="float64", dimension_names=["rivid"]
+    )
+    lat = z.create_array(
+        "lat", shape=(IS_riv,), dtype="float64", dimension_names=["rivid"]
+    )
+    z.create_array(
+        "time",
+        shape=(IS_tim,),
+        dtype="int32",
+        fill_value=IS_fll,
+        dimension_names=["time"],
+    )
+    z.create_array(
+        "time_bnds",
+        shape=(IS_tim, 2),
+        dtype="int32",
+        fill_value=IS_fll,
+        dimension_names=["time", "nv"],
+    )
+    z.create_array(
+        "Qout",
+        shape=(IS_tim, IS_riv),
+        chunks=IV_cnk,
+        dtype=YS_dty,
+        fill_value=ZS_fll,
+        compressors=AV_cmp,
+        dimension_names=["time", "rivid"],
+    )
+
+    # -------------------------------------------------------------------------
+    # Populate variables
+    # -------------------------------------------------------------------------
+    rivid[:] = IV_riv[:]
+    lon[:] = ZV_lon[:]
+    lat[:] = ZV_lat[:]
+
+    # -------------------------------------------------------------------------
+    # Metadata in global attributes
+    # -------------------------------------------------------------------------
+    YS_dat = datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+    z.attrs.update(
+        {
+            "Conventions": "CF-1.6",
+            "title": "",
+            "institution": "",
+            "source": "RAPID2",
+            "history": "date created: " + YS_dat,
+            "references": "https://github.com/c-h-david/rapid2/",
+            "comment": "",
+            "featureType": "timeSeries",
+        }
+    )
+
+
+# *****************************************************************************
+# End
+# *****************************************************************************
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# *****************************************************************************
+# read_Mus_mat.py
+# *****************************************************************************
+
+# Author:
+# Cedric H. David, 2026-2026
+
+
+# *****************************************************************************
+# Import Python modules
+# *****************************************************************************
+import numpy as np
+import numpy.typing as npt
+from scipy.sparse import csc_matrix
+
+from rapid2.core.make_CCC_mat import make_CCC_mat
+from rapid2.core.make_Mus_mat import make_Mus_mat
+from rapid2.core.read_kpr_vec import read_kpr_vec
+from rapid2.core.read_xpr_vec import read_xpr_vec
+
+
+# *****************************************************************************
+# Muskingum parameters function
+# *****************************************************************************
+def read_Mus_mat(
+    kpr_pqt: str,
+    xpr_pqt: str,
+    IV_riv_bas: npt.NDArray[np.int32],
+    IV_0bi_bas: npt.NDArray[np.int32],
+    ZM_Net: csc_matrix,
+    IS_dtR: int,
+) -> tuple[csc_matrix, csc_matrix, csc_matrix]:
+    """Read Muskingum parameters.
+
+    Create the three matrices used in the matrix-based Muskingum method from
+    the k and x parameter files of a basin.
+
+    Parameters
+    ----------
+    kpr_pqt : str
+        Path to the k parameter file, or to a network bundle file.
+    xpr_pqt : str
+        Path to the x parameter file, or to a network bundle file.
+    IV_riv_bas : ndarray[int32]
+        The river IDs of the basin.
+    IV_0bi_bas : ndarray[int32]
+        The index in domain for river IDs in basin.
+    ZM_Net : scipy.sparse.spmatrix
+        The network matrix for the basin.
+    IS_dtR : int
+        The routing time step of Muskingum method.
+
+    Returns
+    -------
+    ZM_ICN : scipy.sparse.spmatrix
+        The linear system matrix for the basin in matrix-based Muskingum.
+    ZM_Qex : scipy.sparse.spmatrix
+        The multiplicand matrix for ZV_Qex for the basin in right-hand side.
+    ZM_Qou : scipy.sparse.spmatrix
+        The multiplicand matrix for ZV_Qou for the basin in right-hand side.
+
+    Examples
+    --------
+    >>> kpr_pqt = "./input/Sandbox/kpr_Sandbox.parquet"
+    >>> xpr_pqt = "./input/Sandbox/xpr_Sandbox.parquet"
+    >>> IV_riv_bas = np.array([10, 20, 30, 40, 50], dtype=np.int32)
+    >>> IV_0bi_bas = np.array([0, 1, 2, 3, 4], dtype=np.int32)
+    >>> ZM_Net = csc_matrix(np.array([[0, 0, 0, 0, 0],\
+                                      [0, 0, 0, 0, 0],\
+                                      [1, 1, 0, 0, 0],\
+                                      [0, 0, 0, 0, 0],\
+                                      [0, 0, 1, 1, 0]]))
+    >>> ZM_ICN, ZM_Qex, ZM_Qou = read_Mus_mat(kpr_pqt, xpr_pqt, IV_riv_bas,\
+                                              IV_0bi_bas, ZM_Net, 900)
+    >>> ZM_ICN.toarray()
+    array([[1.  , 0.  , 0.  , 0.  , 0.  ],
+           [0.  , 1.  , 0.  , 0.  , 0.  ],
+           [0.25, 0.25, 1.  , 0.  , 0.  ],
+           [0.  , 0.  , 0.  , 1.  , 0.  ],
+           [0.  , 0.  , 0.25, 0.25, 1.  ]])
+    """
+
+    IV_riv_tmp, ZV_kpr_bas = read_kpr_vec(kpr_pqt, IV_0bi_bas, IV_riv_bas)
+    if not np.array_equal(IV_riv_bas, IV_riv_tmp):
+        raise ValueError(
+            f"River IDs in {kpr_pqt} do not match those of the basin"
+        )
+
+    IV_riv_tmp, ZV_xpr_bas = read_xpr_vec(xpr_pqt, IV_0bi_bas, IV_riv_bas)
+    if not np.array_equal(IV_riv_bas, IV_riv_tmp):
+        raise ValueError(
+            f"River IDs in {xpr_pqt} do not match those of the basin"
+        )
+
+    ZM_C1p, ZM_C2p, ZM_C3p = make_CCC_mat(
+        ZV_kpr_bas, ZV_xpr_bas, np.int32(IS_dtR)
+    )
+    ZM_ICN, ZM_Qex, ZM_Qou = make_Mus_mat(ZM_Net, ZM_C1p, ZM_C2p, ZM_C3p)
+
+    return ZM_ICN, ZM_Qex, ZM_Qou
+
+
+# *****************************************************************************
+# End
+# *****************************************************************************
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# *****************************************************************************
+# read_Net_mat.py
+# *****************************************************************************
+
+# Author:
+# Cedric H. David, 2026-2026
+
+
+# *****************************************************************************
+# Import Python modules
+# *****************************************************************************
+import numpy as np
+import numpy.typing as npt
+from scipy.sparse import csc_matrix
+
+from rapid2.core.chck_bas import chck_bas
+from rapid2.core.make_0bi_tbl import make_0bi_tbl
+from rapid2.core.make_Net_mat import make_Net_mat
+from rapid2.core.read_con_vec import read_con_vec
+from rapid2.core.read_riv_vec import read_riv_vec
+
+
+# *****************************************************************************
+# River network function
+# *****************************************************************************
+def read_Net_mat(
+    con_pqt: str,
+    bas_pqt: str,
+) -> tuple[
+    npt.NDArray[np.int32],
+    npt.NDArray[np.int32],
+    npt.NDArray[np.int32],
+    csc_matrix,
+]:
+    """Read river network.
+
+    Create the network matrix of a basin from the connectivity and basin
+    files, after checking the basin topology. The triangular solve of the
+    matrix-based Muskingum method relies on the upstream to downstream sort
+    of the basin that is checked here.
+
+    Parameters
+    ----------
+    con_pqt : str
+        Path to the connectivity file, or to a network bundle file.
+    bas_pqt : str
+        Path to the basin file, or to a network bundle file.
+
+    Returns
+    -------
+    IV_riv_tot : ndarray[int32]
+        The river IDs of the domain.
+    IV_riv_bas : ndarray[int32]
+        The river IDs of the basin.
+    IV_0bi_bas : ndarray[int32]
+        The index in domain for river IDs in basin.
+    ZM_Net : scipy.sparse.spmatrix
+        The network matrix for the basin.
+
+    Examples
+    --------
+    >>> con_pqt = "./input/Sandbox/con_Sandbox.parquet"
+    >>> bas_pqt = "./input/Sandbox/bas_Sandbox_ascend.parquet"
+    >>> IV_riv_tot, IV_riv_bas, IV_0bi_bas, ZM_Net = read_Net_mat(con_pqt,\
+                                                                  bas_pqt)
+    >>> IV_0bi_bas
+    array([0, 1, 2, 3, 4], dtype=int32)
+    >>> ZM_Net.toarray()
+    array([[0, 0, 0, 0, 0],
+           [0, 0, 0, 0, 0],
+           [1, 1, 0, 0, 0],
+           [0, 0, 0, 0, 0],
+           [0, 0, 1, 1, 0]])
+    """
+
+    IV_riv_tot, IV_dwn_tot = read_con_vec(con_pqt)
+    IV_riv_bas = read_riv_vec(bas_pqt)
+
+    IT_0bi_tot, IT_0bi_bas, IV_0bi_bas = make_0bi_tbl(IV_riv_tot, IV_riv_bas)
+    ZM_Net = make_Net_mat(IV_dwn_tot, IT_0bi_tot, IV_riv_bas, IT_0bi_bas)
+
+    chck_bas(IV_riv_bas, IT_0bi_bas, IV_riv_tot, IV_dwn_tot, IT_0bi_tot)
+
+    return IV_riv_tot, IV_riv_bas, IV_0bi_bas, ZM_Net
+
+
+# *****************************************************************************
+# End
+# *****************************************************************************
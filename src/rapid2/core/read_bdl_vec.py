@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# *****************************************************************************
+# read_bdl_vec.py
+# *****************************************************************************
+
+# Author:
+# Cedric H. David, 2026-2026
+
+
+# *****************************************************************************
+# Import Python modules
+# *****************************************************************************
+from typing import Any
+
+import numpy.typing as npt
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+
+# *****************************************************************************
+# Network bundle reader
+# *****************************************************************************
+def read_bdl_vec(bdl_arw: str, YV_col: list[str]) -> list[npt.NDArray[Any]]:
+    """Map columns of a network bundle file.
+
+    Map columns of the Arrow IPC file made by prep_bdl_arw, holding the
+    aligned columns of the connectivity, basin, parameter, coordinate, and
+    coupling files of a river network. The file is memory-mapped and columns
+    are returned without copying them, as read-only arrays.
+
+    Parameters
+    ----------
+    bdl_arw : str
+        Path to the network bundle file.
+    YV_col : list[str]
+        The names of the columns, e.g., riv, dwn, bas, kpr, or xpr.
+
+    Returns
+    -------
+    ZV_col : list[ndarray]
+        The values of each column, in the order of YV_col.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from rapid2 import prep_bdl_arw
+    >>> IV_riv = np.array([10, 20, 30, 40, 50], dtype=np.int32)
+    >>> IV_dwn = np.array([30, 30, 50, 50, 0], dtype=np.int32)
+    >>> bdl_arw = "./output/Sandbox/bdl_tst.arrow"
+    >>> prep_bdl_arw({"riv": IV_riv, "dwn": IV_dwn}, bdl_arw)
+    >>> IV_riv_tot, IV_dwn_tot = read_bdl_vec(bdl_arw, ["riv", "dwn"])
+    >>> IV_dwn_tot
+    array([30, 30, 50, 50,  0], dtype=int32)
+    >>> IV_dwn_tot.flags.writeable
+    False
+    >>> read_bdl_vec(bdl_arw, ["kpr"])
+    Traceback (most recent call last):
+    ...
+    ValueError: kpr column does not exist in ./output/Sandbox/bdl_tst.arrow
+    >>> import os
+    >>> os.remove(bdl_arw)
+    """
+
+    # -------------------------------------------------------------------------
+    # Map Arrow IPC file
+    # -------------------------------------------------------------------------
+    try:
+        table = ipc.open_file(pa.memory_map(bdl_arw, "r")).read_all()
+    except IOError as e:
+        raise IOError(f"Unable to open {bdl_arw}") from e
+
+    # -------------------------------------------------------------------------
+    # Columns held in one chunk are viewed, others are copied
+    # -------------------------------------------------------------------------
+    ZV_col = []
+    for YS_col in YV_col:
+        if YS_col not in table.column_names:
+            raise ValueError(f"{YS_col} column does not exist in {bdl_arw}")
+        column = table.column(YS_col)
+        if column.num_chunks == 1:
+            ZV_col.append(column.chunk(0).to_numpy())
+        else:
+            ZV_col.append(column.to_numpy())
+
+    return ZV_col
+
+
+# *****************************************************************************
+# End
+# *****************************************************************************
@@ -14,6 +14,8 @@ import numpy as np
 import numpy.typing as npt
 import pyarrow.parquet as pq
 
+from rapid2.core.read_bdl_vec import read_bdl_vec
+
 
 # *****************************************************************************
 # Connectivity function
@@ -30,7 +32,8 @@ def read_con_vec(
     con_pqt : str
         Path to the connectivity file: a Parquet file with two
         integer columns, riv (the river ID) and dwn (its downstream
-        river ID, 0 for an outlet with no downstream reach).
+        river ID, 0 for an outlet with no downstream reach), or a network
+        bundle file with these columns.
 
     Returns
     -------
@@ -47,6 +50,16 @@ def read_con_vec(
      array([30, 30, 50, 50,  0], dtype=int32))
     """
 
+    # -------------------------------------------------------------------------
+    # Map network bundle, its columns are not copied
+    # -------------------------------------------------------------------------
+    if con_pqt.endswith(".arrow"):
+        IV_riv_tot, IV_dwn_tot = read_bdl_vec(con_pqt, ["riv", "dwn"])
+        return (
+            IV_riv_tot.astype(np.int32, copy=False),
+            IV_dwn_tot.astype(np.int32, copy=False),
+        )
+
     # -------------------------------------------------------------------------
     # Read Parquet and populate arrays
     # -------------------------------------------------------------------------
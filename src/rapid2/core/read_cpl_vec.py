@@ -14,6 +14,8 @@ import numpy as np
 import numpy.typing as npt
 import pyarrow.parquet as pq
 
+from rapid2.core.read_bdl_vec import read_bdl_vec
+
 
 # *****************************************************************************
 # Connectivity function
@@ -33,7 +35,7 @@ def read_cpl_vec(
     Parameters
     ----------
     cpl_pqt : str
-        Path to the coupling file.
+        Path to the coupling file, or to a network bundle file.
 
     Returns
     -------
@@ -56,6 +58,20 @@ def read_cpl_vec(
      array([2, 2, 2, 1, 1], dtype=int32))
     """
 
+    # -------------------------------------------------------------------------
+    # Map network bundle, its columns are not copied
+    # -------------------------------------------------------------------------
+    if cpl_pqt.endswith(".arrow"):
+        IV_riv_tot, ZV_skm_tot, IV_1bi_tot, IV_1bj_tot = read_bdl_vec(
+            cpl_pqt, ["riv", "skm", "1bi", "1bj"]
+        )
+        return (
+            IV_riv_tot.astype(np.int32, copy=False),
+            ZV_skm_tot.astype(np.float64, copy=False),
+            IV_1bi_tot.astype(np.int32, copy=False),
+            IV_1bj_tot.astype(np.int32, copy=False),
+        )
+
     # -------------------------------------------------------------------------
     # Read Parquet and populate arrays
     # -------------------------------------------------------------------------
@@ -14,6 +14,8 @@ import numpy as np
 import numpy.typing as npt
 import pyarrow.parquet as pq
 
+from rapid2.core.read_bdl_vec import read_bdl_vec
+
 
 # *****************************************************************************
 # Connectivity function
@@ -30,7 +32,7 @@ def read_crd_vec(
     Parameters
     ----------
     crd_pqt : str
-        Path to the coordinate file.
+        Path to the coordinate file, or to a network bundle file.
 
     Returns
     -------
@@ -50,6 +52,19 @@ def read_crd_vec(
      array([8.2 , 8.2 , 5.12, 4.3 , 2.04]))
     """
 
+    # -------------------------------------------------------------------------
+    # Map network bundle, its columns are not copied
+    # -------------------------------------------------------------------------
+    if crd_pqt.endswith(".arrow"):
+        IV_riv_tot, ZV_lon_tot, ZV_lat_tot = read_bdl_vec(
+            crd_pqt, ["riv", "lon", "lat"]
+        )
+        return (
+            IV_riv_tot.astype(np.int32, copy=False),
+            ZV_lon_tot.astype(np.float64, copy=False),
+            ZV_lat_tot.astype(np.float64, copy=False),
+        )
+
     # -------------------------------------------------------------------------
     # Read Parquet and populate arrays
     # -------------------------------------------------------------------------
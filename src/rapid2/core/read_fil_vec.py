@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# *****************************************************************************
+# read_fil_vec.py
+# *****************************************************************************
+
+# Author:
+# Cedric H. David, 2026-2026
+
+
+# *****************************************************************************
+# Import Python modules
+# *****************************************************************************
+import glob
+
+import numpy as np
+import numpy.typing as npt
+
+from rapid2.core.read_std_vec import read_std_vec
+
+
+# *****************************************************************************
+# Metadata of consecutive files
+# *****************************************************************************
+def read_fil_vec(
+    std_ncf: str | list[str],
+    IS_tim_beg: int | None = None,
+    IS_tim_end: int | None = None,
+) -> tuple[
+    npt.NDArray[np.int32],
+    npt.NDArray[np.float64],
+    npt.NDArray[np.float64],
+    npt.NDArray[np.int32],
+    npt.NDArray[np.int32],
+    list[tuple[str, int, int, int]],
+]:
+    """Get core metadata from consecutive RAPID-compatible netCDF files.
+
+    Get standard metadata (river IDs, coordinates, time) from one or more
+    RAPID-compatible netCDF files given as paths or glob patterns, e.g., one
+    file of external inflow per month. The files are sorted in time and must
+    share their river IDs and time step, and each must start where the
+    previous one ends. The time steps of all files are placed end to end and
+    only those fully between IS_tim_beg and IS_tim_end are kept.
+
+    Parameters
+    ----------
+    std_ncf : str or list[str]
+        Path or glob pattern to the RAPID netCDF files, or a list of them.
+    IS_tim_beg : int, optional
+        The epoch time before which time steps are ignored.
+    IS_tim_end : int, optional
+        The epoch time after which time steps are ignored.
+
+    Returns
+    -------
+    IV_riv_tot : ndarray[int32]
+        The river IDs of the RAPID netCDF files.
+    ZV_lon_tot : ndarray[float64]
+        The longitudes of river IDs in the RAPID netCDF files.
+    ZV_lat_tot : ndarray[float64]
+        The latitudes of river IDs in the RAPID netCDF files.
+    IV_tim_all : ndarray[int32]
+        The epoch time values kept.
+    IM_tim_all : ndarray[int32]
+        The epoch time bounds paired values kept.
+    AV_fil : list[tuple[str, int, int, int]]
+        For each file with time steps kept, its path, the indices of its
+        first and after its last time step among those kept, and the index
+        in the file of its first time step kept.
+
+    Examples
+    --------
+    >>> std_ncf = './input/Sandbox/Qex_Sandbox_*_TR.nc4'
+    >>> (IV_riv_tot, ZV_lon_tot, ZV_lat_tot,\
+         IV_tim_all, IM_tim_all, AV_fil) = read_fil_vec(std_ncf)
+    >>> IV_riv_tot
+    array([10, 20, 30, 40, 50], dtype=int32)
+    >>> AV_fil
+    [('./input/Sandbox/Qex_Sandbox_19700101_19700110_TR.nc4', 0, 80, 0)]
+    >>> (IV_riv_tot, ZV_lon_tot, ZV_lat_tot,\
+         IV_tim_all, IM_tim_all, AV_fil) = read_fil_vec(std_ncf, 86400)
+    >>> IM_tim_all[0]
+    array([86400, 97200], dtype=int32)
+    >>> AV_fil
+    [('./input/Sandbox/Qex_Sandbox_19700101_19700110_TR.nc4', 0, 72, 8)]
+    """
+
+    # -------------------------------------------------------------------------
+    # Files matching the paths or patterns, in the order given
+    # -------------------------------------------------------------------------
+    YV_pat = [std_ncf] if isinstance(std_ncf, str) else list(std_ncf)
+
+    YV_fil: list[str] = []
+    for YS_pat in YV_pat:
+        YV_glb = (
+            sorted(glob.glob(YS_pat)) if glob.has_magic(YS_pat) else [YS_pat]
+        )
+        if not YV_glb:
+            raise IOError(f"No file matches {YS_pat}")
+        YV_fil += [YS_fil for YS_fil in YV_glb if YS_fil not in YV_fil]
+
+    # -------------------------------------------------------------------------
+    # Metadata of each file, sorted in time
+    # -------------------------------------------------------------------------
+    AV_std = []
+    for YS_fil in YV_fil:
+        IV_riv_tmp, ZV_lon_tmp, ZV_lat_tmp, IV_tim_tmp, IM_tim_tmp = (
+            read_std_vec(YS_fil)
+        )
+        if IM_tim_tmp is None:
+            raise ValueError(f"time_bnds is missing in {YS_fil}")
+        AV_std.append(
+            (
+                YS_fil,
+                IV_riv_tmp,
+                ZV_lon_tmp,
+                ZV_lat_tmp,
+                IV_tim_tmp,
+                IM_tim_tmp,
+            )
+        )
+
+    AV_std.sort(key=lambda AV: int(AV[5][0, 0]))
+
+    # -------------------------------------------------------------------------
+    # Check river IDs, time step, and continuity between consecutive files
+    # -------------------------------------------------------------------------
+    YS_fil, IV_riv_tot, ZV_lon_tot, ZV_lat_tot, _, IM_tim_prv = AV_std[0]
+    IS_dtE = IM_tim_prv[0, 1] - IM_tim_prv[0, 0]
+
+    for YS_now, IV_riv_tmp, _, _, _, IM_tim_now in AV_std[1:]:
+        if not np.array_equal(IV_riv_tot, IV_riv_tmp):
+            raise ValueError(f"River IDs in {YS_now} differ from {YS_fil}")
+        if IM_tim_now[0, 1] - IM_tim_now[0, 0] != IS_dtE:
+            raise ValueError(f"Time step of {YS_now} differs from {YS_fil}")
+        if IM_tim_prv[-1, 1] != IM_tim_now[0, 0]:
+            raise ValueError(
+                f"Last time_bnds end in {YS_fil} ({IM_tim_prv[-1, 1]}) "
+                f"differs from first time_bnds start in {YS_now} "
+                f"({IM_tim_now[0, 0]})"
+            )
+        YS_fil, IM_tim_prv = YS_now, IM_tim_now
+
+    IV_tim_all = np.concatenate([AV[4] for AV in AV_std])
+    IM_tim_all = np.concatenate([AV[5] for AV in AV_std])
+
+    # -------------------------------------------------------------------------
+    # Select the time steps fully within the period
+    # -------------------------------------------------------------------------
+    BV_tim_all = np.ones(len(IV_tim_all), dtype=bool)
+    if IS_tim_beg is not None:
+        BV_tim_all &= IM_tim_all[:, 0] >= IS_tim_beg
+    if IS_tim_end is not None:
+        BV_tim_all &= IM_tim_all[:, 1] <= IS_tim_end
+
+    IV_tim_win = np.flatnonzero(BV_tim_all)
+    if len(IV_tim_win) == 0:
+        raise ValueError(f"No time step of {std_ncf} within the period")
+
+    JS_tim_beg = int(IV_tim_win[0])
+    JS_tim_end = int(IV_tim_win[-1]) + 1
+
+    # -------------------------------------------------------------------------
+    # Time steps kept in each file
+    # -------------------------------------------------------------------------
+    AV_fil = []
+    JS_fil_beg = 0
+    for YS_fil, _, _, _, IV_tim_tmp, _ in AV_std:
+        JS_fil_end = JS_fil_beg + len(IV_tim_tmp)
+        JS_beg = max(JS_fil_beg, JS_tim_beg)
+        JS_end = min(JS_fil_end, JS_tim_end)
+        if JS_beg < JS_end:
+            AV_fil.append(
+                (
+                    YS_fil,
+                    JS_beg - JS_tim_beg,
+                    JS_end - JS_tim_beg,
+                    JS_beg - JS_fil_beg,
+                )
+            )
+        JS_fil_beg = JS_fil_end
+
+    return (
+        IV_riv_tot,
+        ZV_lon_tot,
+        ZV_lat_tot,
+        IV_tim_all[JS_tim_beg:JS_tim_end],
+        IM_tim_all[JS_tim_beg:JS_tim_end],
+        AV_fil,
+    )
+
+
+# *****************************************************************************
+# End
+# *****************************************************************************
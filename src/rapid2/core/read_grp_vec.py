@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# *****************************************************************************
+# read_grp_vec.py
+# *****************************************************************************
+
+# Author:
+# Cedric H. David, 2026-2026
+
+
+# *****************************************************************************
+# Import Python modules
+# *****************************************************************************
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+import pyarrow.parquet as pq
+
+
+# *****************************************************************************
+# Row group reader
+# *****************************************************************************
+def read_grp_vec(
+    grp_pqt: str, YS_col: str, IV_riv_bas: npt.NDArray[np.int32]
+) -> tuple[npt.NDArray[np.int32], npt.NDArray[Any]]:
+    """Read one column of a Parquet file for the river IDs of a basin.
+
+    Read the riv column and the column YS_col of a Parquet file, e.g., a
+    parameter file, only from the row groups whose range of river IDs, as
+    given by their statistics, holds a river ID of the basin. The values are
+    then placed in basin order, by river ID, regardless of the order of the
+    file. Files sorted by river ID in row groups, as written by prep_grp_pqt,
+    hence have most of their row groups skipped for a small basin. River IDs
+    of the basin missing in the file are left out of the outputs.
+
+    Parameters
+    ----------
+    grp_pqt : str
+        Path to the Parquet file.
+    YS_col : str
+        The name of the column read along with riv.
+    IV_riv_bas : ndarray[int32]
+        The river IDs of the basin.
+
+    Returns
+    -------
+    IV_riv_bas : ndarray[int32]
+        The river IDs of the basin found in the file, in basin order.
+    ZV_col_bas : ndarray
+        The values of the column for these river IDs.
+
+    Examples
+    --------
+    >>> kpr_pqt = "./input/Sandbox/kpr_Sandbox.parquet"
+    >>> IV_riv_bas = np.array([50, 30, 10], dtype=np.int32)
+    >>> read_grp_vec(kpr_pqt, "kpr", IV_riv_bas)
+    (array([50, 30, 10], dtype=int32), array([9000., 9000., 9000.]))
+    >>> from rapid2 import prep_grp_pqt
+    >>> IV_riv = np.array([50, 40, 30, 20, 10], dtype=np.int32)
+    >>> ZV_kpr = np.array([5.0, 4.0, 3.0, 2.0, 1.0])
+    >>> grp_pqt = "./output/Sandbox/kpr_grp_tst.parquet"
+    >>> prep_grp_pqt({"riv": IV_riv, "kpr": ZV_kpr}, grp_pqt, 2)
+    >>> read_grp_vec(grp_pqt, "kpr", np.array([40, 20], dtype=np.int32))
+    (array([40, 20], dtype=int32), array([4., 2.]))
+    >>> import os
+    >>> os.remove(grp_pqt)
+    """
+
+    # -------------------------------------------------------------------------
+    # Row groups whose range of river IDs holds a river ID of the basin
+    # -------------------------------------------------------------------------
+    try:
+        parquet = pq.ParquetFile(grp_pqt)
+    except IOError as e:
+        raise IOError(f"Unable to open {grp_pqt}") from e
+
+    JS_riv = parquet.schema_arrow.get_field_index("riv")
+    if JS_riv < 0:
+        raise ValueError(f"riv column does not exist in {grp_pqt}")
+
+    IV_riv_srt = np.unique(IV_riv_bas)
+
+    IV_grp = []
+    for JS_grp in range(parquet.metadata.num_row_groups):
+        stats = parquet.metadata.row_group(JS_grp).column(JS_riv).statistics
+        # Row groups without statistics are always read
+        IS_riv_min = None if stats is None else stats.min
+        IS_riv_max = None if stats is None else stats.max
+        if IS_riv_min is None or IS_riv_max is None:
+            IV_grp.append(JS_grp)
+            continue
+        JS_pos = np.searchsorted(IV_riv_srt, IS_riv_min)
+        if JS_pos < len(IV_riv_srt) and IV_riv_srt[JS_pos] <= IS_riv_max:
+            IV_grp.append(JS_grp)
+
+    table = parquet.read_row_groups(IV_grp, columns=["riv", YS_col])
+
+    # -------------------------------------------------------------------------
+    # Place values in basin order, by river ID
+    # -------------------------------------------------------------------------
+    IV_riv_grp = table.column("riv").to_numpy().astype(np.int32)
+    ZV_col_grp = table.column(YS_col).to_numpy()
+
+    IV_srt = np.argsort(IV_riv_grp, kind="stable")
+    IV_pos = np.searchsorted(IV_riv_grp[IV_srt], IV_riv_bas)
+    BV_fnd = IV_pos < len(IV_srt)
+    BV_fnd[BV_fnd] = IV_riv_grp[IV_srt[IV_pos[BV_fnd]]] == IV_riv_bas[BV_fnd]
+    IV_row = IV_srt[IV_pos[BV_fnd]]
+
+    return IV_riv_grp[IV_row], ZV_col_grp[IV_row]
+
+
+# *****************************************************************************
+# End
+# *****************************************************************************
@@ -14,23 +14,35 @@ import numpy as np
 import numpy.typing as npt
 import pyarrow.parquet as pq
 
+from rapid2.core.read_bdl_vec import read_bdl_vec
+from rapid2.core.read_grp_vec import read_grp_vec
+
 
 # *****************************************************************************
 # Muskingum k function
 # *****************************************************************************
 def read_kpr_vec(
-    kpr_pqt: str, IV_0bi_bas: npt.NDArray[np.int32]
+    kpr_pqt: str,
+    IV_0bi_bas: npt.NDArray[np.int32],
+    IV_riv_bas: npt.NDArray[np.int32] | None = None,
 ) -> tuple[npt.NDArray[np.int32], npt.NDArray[np.float64]]:
     """Read k parameter file.
 
     Create arrays for river IDs and parameters k in the basin.
 
+    The rows of the file are those of the domain, in the order of the
+    connectivity file, unless IV_riv_bas is given. The values are then read
+    by river ID with read_grp_vec, which skips the row groups holding no
+    river ID of the basin, e.g., in a file sorted by river ID.
+
     Parameters
     ----------
     kpr_pqt : str
-        Path to the k parameter file.
+        Path to the k parameter file, or to a network bundle file.
     IV_0bi_bas : ndarray[int32]
         The index in domain for river IDs in basin.
+    IV_riv_bas : ndarray[int32], optional
+        The river IDs of the basin, read by river ID if given.
 
     Returns
     -------
@@ -46,8 +58,27 @@ def read_kpr_vec(
     >>> read_kpr_vec(kpr_pqt, IV_0bi_bas)  # doctest: +NORMALIZE_WHITESPACE
     (array([10, 20, 30, 40, 50], dtype=int32),\
      array([9000., 9000., 9000., 9000., 9000.]))
+    >>> IV_riv_bas = np.array([50, 30], dtype=np.int32)
+    >>> read_kpr_vec(kpr_pqt, IV_0bi_bas[[4, 2]], IV_riv_bas)
+    (array([50, 30], dtype=int32), array([9000., 9000.]))
     """
 
+    # -------------------------------------------------------------------------
+    # Map network bundle, its columns are not copied
+    # -------------------------------------------------------------------------
+    if kpr_pqt.endswith(".arrow"):
+        IV_riv_tot, ZV_kpr_tot = read_bdl_vec(kpr_pqt, ["riv", "kpr"])
+        return IV_riv_tot[IV_0bi_bas].astype(np.int32), ZV_kpr_tot[
+            IV_0bi_bas
+        ].astype(np.float64)
+
+    # -------------------------------------------------------------------------
+    # Read Parquet by river ID, only from row groups holding the basin
+    # -------------------------------------------------------------------------
+    if IV_riv_bas is not None:
+        IV_riv_tmp, ZV_kpr_tmp = read_grp_vec(kpr_pqt, "kpr", IV_riv_bas)
+        return IV_riv_tmp, ZV_kpr_tmp.astype(np.float64)
+
     # -------------------------------------------------------------------------
     # Read Parquet and populate array
     # -------------------------------------------------------------------------
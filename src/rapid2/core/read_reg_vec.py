@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# *****************************************************************************
+# read_reg_vec.py
+# *****************************************************************************
+
+# Author:
+# Cedric H. David, 2026-2026
+
+
+# *****************************************************************************
+# Import Python modules
+# *****************************************************************************
+import numpy as np
+import numpy.typing as npt
+import pyarrow.parquet as pq
+
+
+# *****************************************************************************
+# Region label function
+# *****************************************************************************
+def read_reg_vec(
+    reg_pqt: str, IV_0bi_bas: npt.NDArray[np.int32]
+) -> tuple[npt.NDArray[np.int32], npt.NDArray[np.int32]]:
+    """Read region file.
+
+    Create arrays for river IDs and region labels in the basin. The region
+    file has one row per river ID of the domain, in the connectivity order,
+    with an integer label (e.g., subbasin or land cover class) for each.
+
+    Parameters
+    ----------
+    reg_pqt : str
+        Path to the region file.
+    IV_0bi_bas : ndarray[int32]
+        The index in domain for river IDs in basin.
+
+    Returns
+    -------
+    IV_riv_bas : ndarray[int32]
+        The river IDs of the basin from the region file.
+    IV_reg_bas : ndarray[int32]
+        The region labels in the basin.
+
+    Examples
+    --------
+    >>> import pyarrow as pa
+    >>> reg_pqt = "./input/Sandbox/reg_Sandbox_tst.parquet"
+    >>> pq.write_table(pa.table({"riv": pa.array([10, 20, 30, 40, 50]),\
+                                 "reg": pa.array([1, 2, 1, 3, 3])}), reg_pqt)
+    >>> IV_0bi_bas = np.array([0, 1, 2, 3, 4], dtype=np.int32)
+    >>> read_reg_vec(reg_pqt, IV_0bi_bas)  # doctest: +NORMALIZE_WHITESPACE
+    (array([10, 20, 30, 40, 50], dtype=int32),\
+     array([1, 2, 1, 3, 3], dtype=int32))
+    >>> import os
+    >>> os.remove(reg_pqt)
+    """
+
+    # -------------------------------------------------------------------------
+    # Read Parquet and populate array
+    # -------------------------------------------------------------------------
+    try:
+        table = pq.read_table(reg_pqt, columns=["riv", "reg"])
+
+        IV_riv_tot = table.column("riv").to_numpy().astype(np.int32)
+        IV_reg_tot = table.column("reg").to_numpy().astype(np.int32)
+
+        IV_riv_bas = IV_riv_tot[IV_0bi_bas]
+        IV_reg_bas = IV_reg_tot[IV_0bi_bas]
+
+    except IOError as e:
+        raise IOError(f"Unable to open {reg_pqt}") from e
+
+    return IV_riv_bas, IV_reg_bas
+
+
+# *****************************************************************************
+# End
+# *****************************************************************************
@@ -14,6 +14,8 @@ import numpy as np
 import numpy.typing as npt
 import pyarrow.parquet as pq
 
+from rapid2.core.read_bdl_vec import read_bdl_vec
+
 
 # *****************************************************************************
 # Basin function
@@ -26,7 +28,8 @@ def read_riv_vec(riv_pqt: str) -> npt.NDArray[np.int32]:
     Parameters
     ----------
     riv_pqt : str
-        Path to the parquet file containing river IDs (e.g., bas_pqt, obs_pqt).
+        Path to the parquet file containing river IDs (e.g., bas_pqt, obs_pqt),
+        or to a network bundle file for its basin.
 
     Returns
     -------
@@ -40,6 +43,15 @@ def read_riv_vec(riv_pqt: str) -> npt.NDArray[np.int32]:
     array([10, 20, 30, 40, 50], dtype=int32)
     """
 
+    # -------------------------------------------------------------------------
+    # Map network bundle, the basin is ordered by the bas column
+    # -------------------------------------------------------------------------
+    if riv_pqt.endswith(".arrow"):
+        IV_riv_tot, IV_bas_tot = read_bdl_vec(riv_pqt, ["riv", "bas"])
+        IV_0bi_bas = np.flatnonzero(IV_bas_tot >= 0)
+        IV_0bi_bas = IV_0bi_bas[np.argsort(IV_bas_tot[IV_0bi_bas])]
+        return IV_riv_tot[IV_0bi_bas].astype(np.int32)
+
     # -------------------------------------------------------------------------
     # Read Parquet and populate array
     # -------------------------------------------------------------------------
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# *****************************************************************************
+# read_shd_ncf.py
+# *****************************************************************************
+
+# Author:
+# Cedric H. David, 2026-2026
+
+
+# *****************************************************************************
+# Import Python modules
+# *****************************************************************************
+import json
+import os
+from types import SimpleNamespace
+from typing import Any
+
+import netCDF4
+import numpy as np
+
+
+# *****************************************************************************
+# Variable spread across shards
+# *****************************************************************************
+class _ShdVariable:
+    """Read a variable whose first dimension is time across shards.
+
+    The time index of a selection runs over the time steps of all shards
+    placed end to end, and each shard is only read for its own time steps.
+    """
+
+    def __init__(self, ZV_var: list[Any], IV_off: Any) -> None:
+        self.ZV_var = ZV_var
+        self.IV_off = IV_off
+        self.dimensions = ZV_var[0].dimensions
+        self.dtype = ZV_var[0].dtype
+        self.shape = (int(IV_off[-1]), *ZV_var[0].shape[1:])
+
+    def __len__(self) -> int:
+        return int(self.shape[0])
+
+    def __getitem__(self, key: Any) -> Any:
+        AV_key = key if isinstance(key, tuple) else (key,)
+        IV_tim = np.arange(self.shape[0])[AV_key[0]]
+
+        if np.ndim(IV_tim) == 0:
+            JS_shd = (
+                int(np.searchsorted(self.IV_off, IV_tim, side="right")) - 1
+            )
+            return self.ZV_var[JS_shd][
+                (int(IV_tim - self.IV_off[JS_shd]), *AV_key[1:])
+            ]
+
+        ZV_prt = []
+        IV_pos = []
+        for JS_shd, ZV_var in enumerate(self.ZV_var):
+            IV_pos_shd = np.flatnonzero(
+                (IV_tim >= self.IV_off[JS_shd])
+                & (IV_tim < self.IV_off[JS_shd + 1])
+            )
+            if len(IV_pos_shd) == 0:
+                continue
+            IV_tim_shd = IV_tim[IV_pos_shd] - self.IV_off[JS_shd]
+            if np.array_equal(
+                IV_tim_shd, np.arange(IV_tim_shd[0], IV_tim_shd[-1] + 1)
+            ):
+                AS_tim: Any = slice(
+                    int(IV_tim_shd[0]), int(IV_tim_shd[-1]) + 1
+                )
+            else:
+                AS_tim = IV_tim_shd
+            ZV_prt.append(np.ma.asarray(ZV_var[(AS_tim, *AV_key[1:])]))
+            IV_pos.append(IV_pos_shd)
+
+        if not ZV_prt:
+            return self.ZV_var[0][(slice(0, 0), *AV_key[1:])]
+
+        ZV_all = np.ma.masked_array(
+            np.concatenate([np.ma.getdata(ZV) for ZV in ZV_prt]),
+            mask=np.concatenate([np.ma.getmaskarray(ZV) for ZV in ZV_prt]),
+        )
+        return ZV_all[np.argsort(np.concatenate(IV_pos), kind="stable")]
+
+
+# *****************************************************************************
+# Sharded file reader
+# *****************************************************************************
+def read_shd_ncf(std_ncf: str) -> Any:
+    """Open a RAPID-compatible netCDF file, or the manifest of its shards.
+
+    Open a RAPID-compatible netCDF file for reading, or, when given the JSON
+    manifest made by prep_shd_jsn, open all its shards as one file. The time
+    steps of the shards are placed end to end for variables whose first
+    dimension is time, e.g., Qout, time, and time_bnds, while the other
+    variables, the dimensions, and the global attributes are those of the
+    first shard. The shards must share their river IDs and each must start
+    where the previous one ends.
+
+    Parameters
+    ----------
+    std_ncf : str
+        Path to the RAPID netCDF file, or to the manifest of its shards.
+
+    Returns
+    -------
+    s : Dataset
+        The netCDF Dataset, or an object offering its variables, dimensions,
+        getncattr(), ncattrs(), and close() for reading shards.
+
+    Examples
+    --------
+    >>> from rapid2 import prep_shd_jsn
+    >>> Qou_ncf = "./output/Sandbox/Qou_Sandbox_19700101_19700110_TR.nc4"
+    >>> shd_jsn = "./output/Sandbox/Qou_Sandbox_19700101_19700110_tst.json"
+    >>> prep_shd_jsn([(Qou_ncf, 80, 0, 864000)], shd_jsn)
+    >>> s = read_shd_ncf(shd_jsn)
+    >>> len(s.dimensions["time"])
+    80
+    >>> s.variables["time_bnds"][79].tolist()
+    [853200, 864000]
+    >>> g = netCDF4.Dataset(Qou_ncf, "r")
+    >>> np.array_equal(
+    ...     s.variables["Qout"][8:16, 2], g.variables["Qout"][8:16, 2]
+    ... )
+    True
+    >>> g.close()
+    >>> s.close()
+    >>> os.remove(shd_jsn)
+    """
+
+    if not std_ncf.endswith(".json"):
+        return netCDF4.Dataset(std_ncf, "r")
+
+    # -------------------------------------------------------------------------
+    # Read manifest
+    # -------------------------------------------------------------------------
+    try:
+        with open(std_ncf) as jsn:
+            AT_shd = json.load(jsn)
+    except IOError as e:
+        raise IOError(f"Unable to open {std_ncf}") from e
+
+    if AT_shd.get("format") != "rapid2-shards":
+        raise ValueError(f"{std_ncf} is not a rapid2-shards manifest")
+    if not AT_shd["shards"]:
+        raise ValueError(f"No shard listed in {std_ncf}")
+
+    YS_dir = os.path.dirname(os.path.abspath(std_ncf))
+
+    AV_man = AT_shd["shards"]
+    for JS_shd in range(1, len(AV_man)):
+        AT_prv, AT_now = AV_man[JS_shd - 1], AV_man[JS_shd]
+        if AT_prv["time_end"] != AT_now["time_start"]:
+            raise ValueError(
+                f"Shard {AT_now['path']} does not start where "
+                f"{AT_prv['path']} ends in {std_ncf}"
+            )
+
+    # -------------------------------------------------------------------------
+    # Open shards and check their river IDs and number of time steps
+    # -------------------------------------------------------------------------
+    AV_shd = [
+        netCDF4.Dataset(os.path.join(YS_dir, AT["path"]), "r") for AT in AV_man
+    ]
+    s = AV_shd[0]
+
+    try:
+        for AT, t in zip(AV_man, AV_shd, strict=True):
+            if not np.array_equal(
+                t.variables["rivid"][:], s.variables["rivid"][:]
+            ):
+                raise ValueError(
+                    f"River IDs in {AT['path']} differ in {std_ncf}"
+                )
+            if len(t.dimensions["time"]) != AT["time_steps"]:
+                raise ValueError(
+                    f"Size of time in {AT['path']} differs from {std_ncf}"
+                )
+    except ValueError:
+        for t in AV_shd:
+            t.close()
+        raise
+
+    IV_off = np.concatenate(
+        ([0], np.cumsum([AT["time_steps"] for AT in AV_man]))
+    )
+
+    # -------------------------------------------------------------------------
+    # Variables with time first are spread across shards
+    # -------------------------------------------------------------------------
+    AT_var = {
+        YS_var: (
+            _ShdVariable([t.variables[YS_var] for t in AV_shd], IV_off)
+            if ZV_var.dimensions[:1] == ("time",)
+            else ZV_var
+        )
+        for YS_var, ZV_var in s.variables.items()
+    }
+    AT_dim = {
+        YS_dim: range(int(IV_off[-1])) if YS_dim == "time" else dim
+        for YS_dim, dim in s.dimensions.items()
+    }
+
+    def close() -> None:
+        for t in AV_shd:
+            t.close()
+
+    return SimpleNamespace(
+        variables=AT_var,
+        dimensions=AT_dim,
+        getncattr=s.getncattr,
+        ncattrs=s.ncattrs,
+        close=close,
+    )
+
+
+# *****************************************************************************
+# End
+# *****************************************************************************
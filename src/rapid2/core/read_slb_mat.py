@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# *****************************************************************************
+# read_slb_mat.py
+# *****************************************************************************
+
+# Author:
+# Cedric H. David, 2026-2026
+
+
+# *****************************************************************************
+# Import Python modules
+# *****************************************************************************
+from typing import Any
+
+import netCDF4
+import numpy as np
+import numpy.typing as npt
+
+
+# *****************************************************************************
+# Hyperslab reader
+# *****************************************************************************
+def read_slb_mat(
+    ZM_var: "netCDF4.Variable[Any]",
+    JS_tim_beg: int,
+    JS_tim_end: int,
+    IM_slb: npt.NDArray[np.int64],
+    IV_0bi_slb: npt.NDArray[np.int64],
+) -> npt.NDArray[np.float32]:
+    """Read a block of time steps of a basin from its hyperslabs.
+
+    Read time steps JS_tim_beg to JS_tim_end (exclusive) of a (time, rivid)
+    variable of a RAPID-compatible netCDF file, e.g., Qext, with one
+    hyperslab per range of IM_slb, and place the reaches in basin order.
+    Masked values are returned as their fill value, as used by sparse
+    matrix products.
+
+    Parameters
+    ----------
+    ZM_var : Variable
+        The netCDF variable, with dimensions time and rivid.
+    JS_tim_beg : int
+        The index of the first time step.
+    JS_tim_end : int
+        The index after the last time step.
+    IM_slb : ndarray[int64]
+        The start and end (exclusive) index in domain of each hyperslab.
+    IV_0bi_slb : ndarray[int64]
+        The index in the hyperslabs, placed end to end, for river IDs in basin.
+
+    Returns
+    -------
+    ZM_var_bas : ndarray[float32]
+        The values of the basin, with one row per time step.
+
+    Examples
+    --------
+    >>> from rapid2 import make_slb_tbl
+    >>> Qex_ncf = "./input/Sandbox/Qex_Sandbox_19700101_19700110_TR.nc4"
+    >>> f = netCDF4.Dataset(Qex_ncf, "r")
+    >>> IV_0bi_bas = np.array([4, 3, 0], dtype=np.int32)
+    >>> IM_slb, IV_0bi_slb = make_slb_tbl(IV_0bi_bas, 5, IS_ovh=0)
+    >>> IM_slb
+    array([[0, 1],
+           [3, 5]])
+    >>> ZM_Qex_blk = read_slb_mat(
+    ...     f.variables["Qext"], 0, 2, IM_slb, IV_0bi_slb
+    ... )
+    >>> np.array_equal(ZM_Qex_blk, f.variables["Qext"][0:2, [4, 3, 0]])
+    True
+    >>> f.close()
+    """
+
+    ZM_var_slb: npt.NDArray[np.float32] = np.concatenate(
+        [
+            np.ma.getdata(ZM_var[JS_tim_beg:JS_tim_end, JS_riv_beg:JS_riv_end])
+            for JS_riv_beg, JS_riv_end in IM_slb
+        ],
+        axis=1,
+    )
+
+    return ZM_var_slb[:, IV_0bi_slb]
+
+
+# *****************************************************************************
+# End
+# *****************************************************************************
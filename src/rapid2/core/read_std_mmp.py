@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# *****************************************************************************
+# read_std_mmp.py
+# *****************************************************************************
+
+# Author:
+# Cedric H. David, 2026-2026
+
+
+# *****************************************************************************
+# Import Python modules
+# *****************************************************************************
+import json
+import os
+from typing import Any, Literal
+
+import numpy as np
+
+
+# *****************************************************************************
+# Memory-mapped store reader
+# *****************************************************************************
+def read_std_mmp(
+    std_mmp: str, YS_mod: Literal["r", "r+"] = "r"
+) -> tuple[dict[str, np.memmap[Any, Any]], dict[str, Any]]:
+    """Map the variables of a memory-mapped store of discharge.
+
+    Map each variable of a store created by prep_std_mmp without copying it,
+    and return the global attributes of the store. Time steps that are not
+    written yet have time_bnds equal to the fill value, which allows reading
+    a store while a run is still writing it.
+
+    Parameters
+    ----------
+    std_mmp : str
+        Path to the directory of the store.
+    YS_mod : str, optional
+        The mode of the maps, "r" for reading or "r+" for writing.
+
+    Returns
+    -------
+    AT_var : dict[str, memmap]
+        The link from each variable name to its map.
+    AT_att : dict[str, Any]
+        The global attributes of the store.
+
+    Examples
+    --------
+    >>> from rapid2 import prep_std_mmp
+    >>> IV_riv = np.array([10, 20, 30, 40, 50], dtype=np.int32)
+    >>> ZV_lon = np.array([0.5, 2.0, 1.0, 2.0, 0.5])
+    >>> ZV_lat = np.array([5.0, 4.5, 3.0, 2.5, 1.0])
+    >>> Qou_mmp = "./output/Sandbox/Qou_Sandbox_19700101_19700110_tst.mmp"
+    >>> prep_std_mmp(IV_riv, ZV_lon, ZV_lat, 3, Qou_mmp)
+    >>> AT_var, AT_att = read_std_mmp(Qou_mmp, "r+")
+    >>> AT_var["Qout"][0, :] = [1, 2, 3, 4, 5]
+    >>> AT_var["Qout"].flush()
+    >>> AT_var, AT_att = read_std_mmp(Qou_mmp)
+    >>> AT_var["Qout"][0]
+    memmap([1., 2., 3., 4., 5.], dtype=float32)
+    >>> AT_var["time_bnds"].shape
+    (3, 2)
+    >>> AT_att["source"]
+    'RAPID2'
+    >>> import shutil
+    >>> shutil.rmtree(Qou_mmp)
+    """
+
+    hdr_jsn = os.path.join(std_mmp, "header.json")
+    try:
+        with open(hdr_jsn) as jsn:
+            AT_hdr = json.load(jsn)
+    except IOError as e:
+        raise IOError(f"Unable to open {hdr_jsn}") from e
+
+    if AT_hdr.get("format") != "rapid2-memmap":
+        raise ValueError(f"{std_mmp} is not a rapid2-memmap store")
+
+    AT_var = {
+        YS_var: np.memmap(
+            os.path.join(std_mmp, f"{YS_var}.bin"),
+            dtype=AT["dtype"],
+            mode=YS_mod,
+            shape=tuple(AT["shape"]),
+        )
+        for YS_var, AT in AT_hdr["variables"].items()
+    }
+
+    return AT_var, AT_hdr["attributes"]
+
+
+# *****************************************************************************
+# End
+# *****************************************************************************
@@ -10,18 +10,61 @@
 # *****************************************************************************
 # Import Python modules
 # *****************************************************************************
-from typing import Optional
+import hashlib
+import os
+import zipfile
+from typing import Any, Optional
 
-import netCDF4
 import numpy as np
 import numpy.typing as npt
 
+from rapid2.core.read_shd_ncf import read_shd_ncf
+
+
+# *****************************************************************************
+# Cache of metadata
+# *****************************************************************************
+def _cch_npz(std_ncf: str) -> str | None:
+    """Return the path of the metadata cache of std_ncf, or None if disabled.
+
+    Caches are kept in RAPID2_CACHE_DIR, and are disabled when it is unset
+    or empty.
+    """
+    cch_dir = os.environ.get("RAPID2_CACHE_DIR")
+    if not cch_dir:
+        return None
+    YS_hsh = hashlib.sha256(os.path.abspath(std_ncf).encode()).hexdigest()
+    return os.path.join(cch_dir, f"std_{YS_hsh[:32]}.npz")
+
+
+def _prn_cch(cch_dir: str) -> None:
+    """Remove the metadata caches of files that no longer exist.
+
+    Caches that cannot be read are removed as well, and caches being
+    written by another process are left alone.
+    """
+    for YS_nam in os.listdir(cch_dir):
+        if not (YS_nam.startswith("std_") and YS_nam.endswith(".npz")):
+            continue
+        cch_npz = os.path.join(cch_dir, YS_nam)
+        try:
+            with np.load(cch_npz) as AT_cch:
+                BS_prn = not os.path.exists(str(AT_cch["YS_pth"]))
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            BS_prn = True
+        if BS_prn:
+            try:
+                os.remove(cch_npz)
+            except OSError:
+                pass
+
 
 # *****************************************************************************
 # Metadata of external inflow
 # *****************************************************************************
 def read_std_vec(
     std_ncf: str,
+    BS_cch: bool = True,
 ) -> tuple[
     npt.NDArray[np.int32],
     npt.NDArray[np.float64],
@@ -32,12 +75,21 @@ def read_std_vec(
     """Get core metadata from a RAPID-compatible netCDF file.
 
     Get standard metadata (river IDs, coordinates, time) from a
-    RAPID-compatible netCDF file.
+    RAPID-compatible netCDF file, or from the manifest of its shards in time,
+    opened by read_shd_ncf.
+
+    When the RAPID2_CACHE_DIR environment variable names a directory, the
+    metadata of a netCDF file is kept there in a .npz cache, and read from
+    there while the path, size, modification time, and inode of the file are
+    unchanged. Caches of files that no longer exist are removed whenever a
+    cache is written. Setting BS_cch to False bypasses the cache.
 
     Parameters
     ----------
     std_ncf : str
-        Path to the RAPID netCDF file.
+        Path to the RAPID netCDF file, or to the manifest of its shards.
+    BS_cch : bool, optional
+        Whether the metadata cache is used, if enabled by RAPID2_CACHE_DIR.
 
     Returns
     -------
@@ -87,9 +139,48 @@ def read_std_vec(
            702000, 712800, 723600, 734400, 745200, 756000, 766800, 777600,
            788400, 799200, 810000, 820800, 831600, 842400, 853200, 864000],
           dtype=int32)
+    >>> os.environ["RAPID2_CACHE_DIR"] = "./output/Sandbox/cch_tst"
+    >>> IV_tim_all_cch = read_std_vec(std_ncf)[3]
+    >>> len(os.listdir("./output/Sandbox/cch_tst"))
+    1
+    >>> IV_tim_all_cch = read_std_vec(std_ncf)[3]
+    >>> np.array_equal(IV_tim_all, IV_tim_all_cch)
+    True
+    >>> import shutil
+    >>> shutil.rmtree(os.environ.pop("RAPID2_CACHE_DIR"))
     """
 
-    s = netCDF4.Dataset(std_ncf, "r")
+    # -------------------------------------------------------------------------
+    # Cached metadata, used if made from this version of the file
+    # -------------------------------------------------------------------------
+    YS_pth = os.path.abspath(std_ncf)
+    cch_npz = None
+    if BS_cch and not std_ncf.endswith(".json"):
+        cch_npz = _cch_npz(std_ncf)
+
+    if cch_npz is not None:
+        AT_sta = os.stat(std_ncf)
+        IV_sta = np.array(
+            [AT_sta.st_size, AT_sta.st_mtime_ns, AT_sta.st_ino], dtype=np.int64
+        )
+        try:
+            with np.load(cch_npz) as AT_cch:
+                if str(AT_cch["YS_pth"]) == YS_pth and np.array_equal(
+                    AT_cch["IV_sta"], IV_sta
+                ):
+                    return (
+                        AT_cch["IV_riv"],
+                        AT_cch["ZV_lon"],
+                        AT_cch["ZV_lat"],
+                        AT_cch["IV_tim_all"],
+                        AT_cch["IM_tim_all"]
+                        if "IM_tim_all" in AT_cch
+                        else None,
+                    )
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            pass
+
+    s = read_shd_ncf(std_ncf)
 
     # -------------------------------------------------------------------------
     # Check dimensions exist
@@ -138,6 +229,32 @@ def read_std_vec(
     else:
         IM_tim_all = None
 
+    s.close()
+
+    # -------------------------------------------------------------------------
+    # Update cache, a cache that cannot be written is only skipped
+    # -------------------------------------------------------------------------
+    if cch_npz is not None:
+        AT_arr: dict[str, Any] = {
+            "YS_pth": np.array(YS_pth),
+            "IV_sta": IV_sta,
+            "IV_riv": IV_riv,
+            "ZV_lon": ZV_lon,
+            "ZV_lat": ZV_lat,
+            "IV_tim_all": IV_tim_all,
+        }
+        if IM_tim_all is not None:
+            AT_arr["IM_tim_all"] = IM_tim_all
+        try:
+            os.makedirs(os.path.dirname(cch_npz), exist_ok=True)
+            tmp_npz = f"{cch_npz}.{os.getpid()}.tmp"
+            with open(tmp_npz, "wb") as npz:
+                np.savez(npz, **AT_arr)
+            os.replace(tmp_npz, cch_npz)
+            _prn_cch(os.path.dirname(cch_npz))
+        except OSError:
+            pass
+
     return IV_riv, ZV_lon, ZV_lat, IV_tim_all, IM_tim_all
 
 
@@ -36,6 +36,9 @@ def updt_Mus_Qou(
     average values of discharge and the final values of discharge after
     Muskingum timesteps.
 
+    Discharge and lateral inflow may also be given with one column per
+    right-hand side (e.g. per source of inflow), all routed at once.
+
     Parameters
     ----------
     ZM_ICN : scipy.sparse.spmatrix
@@ -94,12 +97,19 @@ def updt_Mus_Qou(
     array([1.     , 1.     , 1.125  , 1.     , 1.09375])
     >>> ZV_Qou_now
     array([1.      , 1.      , 1.46875 , 1.      , 1.390625])
+    >>> ZV_Qou_prv = np.zeros((5, 2))
+    >>> ZV_Qex_avg = np.array([[1, 0], [0, 1], [1, 0], [0, 1], [1, 0]])
+    >>> ZV_Qou_avg, ZV_Qou_now = updt_Mus_Qou(ZM_ICN, ZM_Qex, ZM_Qou, \
+                                              IS_rat_Qex, ZV_Qou_prv, \
+                                              ZV_Qex_avg)
+    >>> ZV_Qou_avg.sum(axis=1)
+    array([0.0625   , 0.0625   , 0.03125  , 0.0625   , 0.0390625])
     """
 
     # Isolate the active iterating state to preserve the initial boundary
     ZV_Qou = ZV_Qou_prv
 
-    ZV_Qou_avg = np.zeros(len(ZV_Qou_prv))
+    ZV_Qou_avg = np.zeros(np.shape(ZV_Qou_prv))
     ZV_rh1 = ZM_Qex @ ZV_Qex_avg
 
     for _ in range(IS_rat_Qex):